@@ -4,15 +4,253 @@ All files in this repository are licensed under the Apache License, Version
 _______________________________________________________________________________
 
 Модуль содержит класс работы с методами логирования программы AppLogger.
+
+Логирование настраивается один раз при первой записи в лог: файлы лога
+открываются один раз и остаются открытыми, записи передаются через очередь
+(logging.handlers.QueueHandler) фоновому потоку (QueueListener), который
+записывает их в файлы. Поэтому вызов AppLogger в интерфейсе (поток Tk) не
+ожидает записи на диск. Объем файла лога для ротации отслеживается
+счетчиком записанных байт, без обращений к файловой системе.
+
+Ротация выполняется переименованием файла лога (время не зависит от
+объема файла), для каждого лога хранится заданное количество поколений.
+Поколения сжимаются gzip в фоновом потоке (один поток на файл лога,
+поколения передаются ему через очередь):
+log/calculation/calc_log.20261018-120000-000000.log.gz.
+
+Модуль содержит классы:
+- AppLogger - запись информации в лог программы;
+- LogFile - файл лога с ротацией по объему и сжатием поколений;
+- LogRouter - распределение записей очереди по файлам лога.
 """
 
-import logging
+import _thread
+import atexit
 import os
-import shutil
-
+import sys
 
+from lazy_import import lazy_import
 from path_getting import PathName
 
+# Модули загружаются при первой записи в лог
+datetime = lazy_import('datetime')
+gzip = lazy_import('gzip')
+logging = lazy_import('logging')
+logging_handlers = lazy_import('logging.handlers')
+queue = lazy_import('queue')
+shutil = lazy_import('shutil')
+threading = lazy_import('threading')
+
+
+class LogFile:
+    """
+    Класс файла лога. Файл открывается при первой записи и остается
+    открытым, объем файла отслеживается счетчиком записанных байт. При
+    достижении заданного объема выполняется ротация: файл лога
+    переименовывается в поколение с отметкой времени, создается новый
+    файл. Поколение передается через очередь потоку сжатия файла лога
+    (один поток на файл, поколения сжимаются по очереди), после сжатия
+    старые сжатые поколения сверх заданного количества удаляются.
+
+    Содержит методы: open, handle, rotate, get_generations,
+    start_compression, run_compression, compress, close.
+
+    Пример использования:
+    log_file = LogFile('log\\app_log.log', 1_000_000, 5, formatter)
+    log_file.handle(record)
+    """
+    def __init__(self, path: str, max_bytes: int, generations: int,
+                 formatter) -> None:
+        """
+        Инициализация файла лога.
+        :param path: Относительный путь к файлу лога
+        :param max_bytes: Объем файла лога, при котором происходит ротация
+        :param generations: Количество хранимых поколений лога
+        :param formatter: Формат записей (logging.Formatter)
+        """
+        self.path = PathName.resource_path(path)
+        # Начало имени поколений: calc_log.20261018-120000-000000.log.gz
+        self.prefix = f'{os.path.basename(self.path)[:-len(".log")]}.'
+        self.max_bytes = max_bytes
+        self.generations = generations
+        self.formatter = formatter
+        self.stream = None
+        self.size = 0
+        self.opened = False
+        # Очередь поколений для сжатия (создается с потоком сжатия)
+        self.compression_queue = None
+        # Дополнительные байты перевода строки в текстовом режиме Windows
+        self.newline_bytes = 1 if os.name == 'nt' else 0
+
+    def open(self) -> None:
+        """
+        Метод открытия файла лога (запись в конец файла) и получения его
+        текущего объема. Несжатые поколения (программа завершилась во
+        время сжатия) сжимаются в фоне.
+        """
+        self.stream = open(self.path, 'a', encoding='utf-8')
+        self.size = self.stream.tell()
+        if not self.opened:
+            self.opened = True
+            pending = [path for path in self.get_generations()
+                       if path.endswith('.log')]
+            if pending:
+                self.start_compression(pending)
+
+    def handle(self, record) -> None:
+        """
+        Метод записи в файл (поток QueueListener). Ошибка записи выводится
+        в sys.stderr и не прерывает работу программы.
+        :param record: Запись лога (logging.LogRecord)
+        """
+        try:
+            if self.stream is None:
+                self.open()
+            if self.size >= self.max_bytes:
+                self.rotate()
+            text = f'{self.formatter.format(record)}\n'
+            self.stream.write(text)
+            self.stream.flush()
+            self.size += (len(text.encode('utf-8')) +
+                          text.count('\n') * self.newline_bytes)
+        except Exception as e:
+            print(f'Ошибка записи в лог {self.path}: {e}', file=sys.stderr)
+
+    def rotate(self) -> None:
+        """
+        Метод ротации файла лога: файл переименовывается в новое поколение
+        (os.replace). Если файл открыт другим экземпляром программы
+        (Windows не переименовывает такой файл), содержимое копируется в
+        поколение, а файл очищается. При ошибке запись продолжается в
+        текущий файл, следующая попытка - после записи очередных max_bytes
+        байт.
+        """
+        generation = os.path.join(
+            os.path.dirname(self.path),
+            f'{self.prefix}'
+            f'{datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")}.log')
+        self.stream.close()
+        try:
+            try:
+                os.replace(self.path, generation)
+            except PermissionError:
+                shutil.copyfile(self.path, generation)
+                open(self.path, 'w', encoding='utf-8').close()
+        except OSError as e:
+            self.open()
+            self.size = 0
+            self.stream.write(f'Ошибка ротации лога. Вызвано исключение: '
+                              f'{e}\n')
+            return
+        self.open()
+        self.start_compression([generation])
+
+    def get_generations(self) -> list:
+        """
+        Метод получения поколений лога (сжатых и ожидающих сжатия).
+        :return: Список путей к поколениям от старого к новому.
+        """
+        folder = os.path.dirname(self.path)
+        return [os.path.join(folder, name)
+                for name in sorted(os.listdir(folder))
+                if name.startswith(self.prefix) and
+                name.endswith(('.log', '.log.gz')) and
+                name != os.path.basename(self.path)]
+
+    def start_compression(self, paths: list) -> None:
+        """
+        Метод передачи поколений потоку сжатия. Поток создается при
+        первом сжатии и ожидает следующие поколения.
+        :param paths: Пути к несжатым поколениям
+        """
+        if self.compression_queue is None:
+            self.compression_queue = queue.SimpleQueue()
+            threading.Thread(target=self.run_compression,
+                             name='LogCompression', daemon=True).start()
+        self.compression_queue.put(paths)
+
+    def run_compression(self) -> None:
+        """
+        Метод потока сжатия: поколения из очереди сжимаются по очереди.
+        """
+        while True:
+            self.compress(self.compression_queue.get())
+
+    def compress(self, paths: list) -> None:
+        """
+        Метод сжатия поколений gzip (поток сжатия) и удаления сжатых
+        поколений сверх заданного количества. Несжатые поколения не
+        удаляются: их сжимает этот поток или другой экземпляр программы.
+        :param paths: Пути к несжатым поколениям
+        """
+        try:
+            for path in paths:
+                temp_path = f'{path}.gz.{os.getpid()}.tmp'
+                try:
+                    with open(path, 'rb') as source_file:
+                        with gzip.open(temp_path, 'wb') as gzip_file:
+                            shutil.copyfileobj(source_file, gzip_file)
+                    os.replace(temp_path, f'{path}.gz')
+                    os.remove(path)
+                except FileNotFoundError:
+                    # Поколение сжато другим экземпляром программы
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+            compressed = [path for path in self.get_generations()
+                          if path.endswith('.gz')]
+            for path in compressed[:-self.generations]:
+                os.remove(path)
+        except OSError as e:
+            AppLogger(
+                'LogFile.compress',
+                'error',
+                f'Ошибка сжатия поколений лога {self.path}. Вызвано '
+                f'исключение: {e}'
+            )
+
+    def close(self) -> None:
+        """
+        Метод закрытия файла лога.
+        """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+class LogRouter:
+    """
+    Класс распределения записей очереди лога по файлам (обработчик
+    QueueListener): запись передается файлу по ключу record.log_file.
+    Запись с атрибутом flush_event - метка AppLogger.flush: все записи до
+    нее уже записаны в файлы.
+
+    Содержит методы: handle, close.
+    """
+    def __init__(self, files: dict) -> None:
+        """
+        Инициализация распределения записей.
+        :param files: Словарь "Ключ - файл лога (LogFile)"
+        """
+        self.files = files
+
+    def handle(self, record) -> None:
+        """
+        Метод передачи записи файлу лога.
+        :param record: Запись лога (logging.LogRecord)
+        """
+        flush_event = getattr(record, 'flush_event', None)
+        if flush_event is not None:
+            flush_event.set()
+        else:
+            self.files[record.log_file].handle(record)
+
+    def close(self) -> None:
+        """
+        Метод закрытия всех файлов лога.
+        """
+        for log_file in self.files.values():
+            log_file.close()
+
 
 class AppLogger:
     """
@@ -23,12 +261,41 @@ class AppLogger:
     было удобно читать пользователем программы. Автоматизированная проверка
     лога отсутствует за ненадобностью.
 
-    Класс содержит методы logger, manual_rotation_log.
+    Запись в файлы выполняет фоновый поток (очередь QueueHandler /
+    QueueListener), настроенный при первой записи в лог процесса.
+    Объем файла для ротации и количество хранимых сжатых поколений
+    каждого лога задаются в log_files.
+
+    Класс содержит методы write, setup, flush, stop.
 
     Пример использования:
     AppLogger('method_name', 'error', 'Записываемая информация по ошибке',
     info=True)
+    AppLogger.flush()  # Ожидание записи в файлы (перед чтением лога)
     """
+    # Формат записи лога
+    log_format = "%(asctime)s | %(name)s | <%(levelname)s> | %(message)s"
+
+    # Файлы лога: ключ -> (относительный путь, объем для ротации, байт;
+    # количество поколений). Поколение сжимается примерно в 10 раз: 30
+    # поколений лога расчетов занимают около 3 Мб
+    log_files = {
+        'app': ('log\\app_log.log', 1_000_000, 10),
+        'calc': ('log\\calculation\\calc_log.log', 800_000, 30),
+        'bmp': ('log\\calculation\\bmp_calc_log.log', 500_000, 5),
+        'warnings': ('log\\warnings\\warnings_log.log', 1_000_000, 5),
+        'errors': ('log\\errors\\errors_log.log', 1_000_000, 5),
+    }
+
+    # Очередь, фоновый поток и файлы лога процесса (настраиваются методом
+    # setup). Блокировка создается модулем _thread: модуль threading
+    # импортируется долго
+    _queue_handler = None
+    _listener = None
+    _router = None
+    _pid = None
+    _lock = _thread.allocate_lock()
+
     def __init__(self, name: str, level: str, message: str, info: bool =
                  False, *args, **kwargs) -> None:
         """
@@ -54,175 +321,96 @@ class AppLogger:
         for _ in args:
             pass
 
-        # Настройка формата для лога
-        self.formatter = logging.Formatter(
-            "%(asctime)s | %(name)s | <%(levelname)s> | %(message)s"
-        )
-
         # Непосредственно запись информации в лог
         match level.lower():
-            case 'calc':  # Запись результатов расчета стоимостей / времени
+            case 'calc' | 'bmp':  # Запись результатов расчета / параметров
+                # считанного .bmp файла
                 # Формирование результатов расчетов для записи
                 results = '\n'
                 for _, v in kwargs.items():
                     results += f'{v}\n'
 
-                # Ротация лога, если это необходимо
-                self.manual_rotation_log(
-                    'log\\app_log.log',
-                    'log\\app_log_backup.log'
-                )
-                self.manual_rotation_log(
-                    'log\\calculation\\calc_log.log',
-                    'log\\calculation\\calc_log_backup.log',
-                    bytes_size=800_000
-                )
-
-                # Запись в лог
-                self.logger('log\\app_log.log').info(f'{message}')
-                self.logger('log\\calculation\\calc_log.log').info(
-                    f'{message}:{results}')
-            case 'bmp':  # Запись параметров считанного .bmp файла
-                # Формирование параметров изображения для записи
-                results = '\n'
-                for _, v in kwargs.items():
-                    results += f'{v}\n'
-
-                # Ротация лога, если это необходимо
-                self.manual_rotation_log(
-                    'log\\app_log.log',
-                    'log\\app_log_backup.log'
-                )
-                self.manual_rotation_log(
-                    'log\\calculation\\bmp_calc_log.log',
-                    'log\\calculation\\bmp_calc_log_backup.log',
-                    bytes_size=500_000
-                )
-
                 # Запись в лог
-                self.logger('log\\app_log.log').info(f'{message}')
-                self.logger('log\\calculation\\bmp_calc_log.log').info(
-                    f'{message}:{results}')
+                self.write('app', 'info', message)
+                self.write(level.lower(), 'info', f'{message}:{results}')
             case 'info':  # Логирование информации
-                # Ротация лога, если это необходимо
-                self.manual_rotation_log(
-                    'log\\app_log.log',
-                    'log\\app_log_backup.log'
-                )
-                # Запись в лог
-                self.logger('log\\app_log.log').info(f'{message}')
+                self.write('app', 'info', message)
             case 'warning':  # Логирование предупреждений
-                # Ротация лога, если это необходимо
-                self.manual_rotation_log(
-                    'log\\app_log.log',
-                    'log\\app_log_backup.log'
-                )
-                self.manual_rotation_log(
-                    'log\\warnings\\warnings_log.log',
-                    'log\\warnings\\warnings_log_backup.log'
-                )
-
-                # Запись в лог
-                self.logger('log\\app_log.log').warning(f'{message}')
-                self.logger(
-                    'log\\warnings\\warnings_log.log').warning(
-                    f'{message}', exc_info=info)
+                self.write('app', 'warning', message)
+                self.write('warnings', 'warning', message, info)
             case 'error':  # Логирование ошибок
-                # Ротация лога, если это необходимо
-                self.manual_rotation_log(
-                    'log\\app_log.log',
-                    'log\\app_log_backup.log'
-                )
-                self.manual_rotation_log(
-                    'log\\errors\\errors_log.log',
-                    'log\\errors\\errors_log_backup.log'
-                )
-
-                # Запись в лог
-                self.logger('log\\app_log.log').error(f'{message}')
-                self.logger(
-                    'log\\errors\\errors_log.log').error(
-                    f'{message}', exc_info=info)
+                self.write('app', 'error', message)
+                self.write('errors', 'error', message, info)
             case _:  # Логирование любой дополнительной информации
-                # Ротация лога, если это необходимо
-                self.manual_rotation_log(
-                    'log\\app_log.log',
-                    'log\\app_log_backup.log'
-                )
-                # Запись в лог
-                self.logger('log\\app_log.log').info(f'{level}:  {message}')
+                self.write('app', 'info', f'{level}:  {message}')
 
-    def logger(self, path: str) -> logging.Logger:
+    def write(self, log_file: str, level: str, message: str,
+              info: bool = False) -> None:
         """
-        Метод создает и возвращает настроенный пользователем лог.
-        :param path: Путь к файлу лога
-        :return: Лог (в назначенном пути), в который передается сообщение.
+        Метод передачи записи в очередь лога (после остановки фонового
+        потока при завершении программы - запись в файл сразу).
+        :param log_file: Ключ файла лога (log_files)
+        :param level: Уровень записи (info, warning, error)
+        :param message: Текстовое сообщение записи
+        :param info: Запись подробной информации о текущем исключении
         """
-        # Создание лога и установка минимального уровня для логирования
-        logger = logging.getLogger(self.name)
-        logger.setLevel(logging.DEBUG)
-
-        # Проверяем присутствует ли уже обработчик (если да - делаем очистку)
-        if logger.hasHandlers():
-            logger.handlers.clear()
+        if self._pid != os.getpid():
+            self.setup()
+        record = logging.LogRecord(
+            self.name, logging.getLevelName(level.upper()), '', 0, message,
+            None, sys.exc_info() if info else None)
+        record.log_file = log_file
+        if self._listener is not None:
+            self._queue_handler.handle(record)
+        else:
+            self._router.handle(self._queue_handler.prepare(record))
 
-        # Не передаем записи журнала обработчикам (исключение дублирования)
-        logger.propagate = False
-
-        # Создание обработчика
-        handler = logging.FileHandler(
-            PathName.resource_path(path),
-            encoding='utf-8')
-
-        # Добавление формата к обработчику
-        handler.setFormatter(self.formatter)
-
-        # Добавление обработчика к логу
-        logger.addHandler(handler)
-
-        return logger
+    @classmethod
+    def setup(cls) -> None:
+        """
+        Метод настройки логирования процесса: файлы лога, очередь и фоновый
+        поток записи. Выполняется один раз (повторно - в дочернем процессе,
+        созданном копированием родительского).
+        """
+        with cls._lock:
+            if cls._pid == os.getpid():
+                return
+            formatter = logging.Formatter(cls.log_format)
+            cls._router = LogRouter({
+                key: LogFile(path, max_bytes, generations, formatter)
+                for key, (path, max_bytes, generations)
+                in cls.log_files.items()})
+            log_queue = queue.SimpleQueue()
+            cls._queue_handler = logging_handlers.QueueHandler(log_queue)
+            cls._listener = logging_handlers.QueueListener(log_queue,
+                                                           cls._router)
+            cls._listener.start()
+            if cls._pid is None:
+                atexit.register(cls.stop)
+            cls._pid = os.getpid()
 
-    def manual_rotation_log(self,
-                            path_log_file: str,
-                            backup_log_file: str,
-                            bytes_size: int = 1_000_000) -> None:
+    @classmethod
+    def flush(cls, timeout: float = 1.0) -> None:
+        """
+        Метод ожидания записи в файлы всех переданных в очередь записей
+        (например, перед открытием лога расчетов).
+        :param timeout: Наибольшее время ожидания, с
         """
-        Ручная ротация лога. Т.к. при использовании стандартного метода
-        ротации лога по объему файла выходит ошибка: PermissionError:
-        [WinError 32] Процесс не может получить доступ к файлу, так как
-        этот файл занят другим процессом: <Путь к файлу лога> ->
-        <Путь к backup файлу лога>.
+        if cls._listener is None or cls._pid != os.getpid():
+            return
+        flush_event = threading.Event()
+        cls._queue_handler.queue.put_nowait(
+            logging.makeLogRecord({'flush_event': flush_event}))
+        flush_event.wait(timeout)
 
-        :param path_log_file: Путь к файлу лога;
-        :param backup_log_file: Путь к backup файлу лога;
-        :param bytes_size: Объем файла лога, при котором происходит ротация
-        (по-умолчанию 1.0 Мб).
+    @classmethod
+    def stop(cls) -> None:
         """
-        try:
-            # Если объем файла больше заданного, то делаем ротацию
-            if (os.path.exists(PathName.resource_path(path_log_file)) and
-                    os.path.getsize(PathName.resource_path(path_log_file))
-                    >= bytes_size):
-                # Копируем данные в backup файл
-                with open(
-                        PathName.resource_path(path_log_file),
-                        'r',
-                        encoding='utf-8') as source_file:
-                    with open(
-                            PathName.resource_path(backup_log_file),
-                            'w',
-                            encoding='utf-8') as backup_file:
-                        shutil.copyfileobj(source_file, backup_file)
-                # Очищаем данные из основного файла
-                with open(
-                        PathName.resource_path(path_log_file),
-                        'w',
-                        encoding='utf-8') as source_file:
-                    source_file.write('')
-        except Exception as e:
-            error_info = f'Ошибка ротации лога. Вызвано исключение: {e}'
-            # Запись в лог
-            self.logger('log\\app_log.log').error(error_info)
-            self.logger(
-                'log\\errors\\errors_log.log').error(
-                f'{error_info}', exc_info=True)
+        Метод остановки фонового потока при завершении программы (записи
+        из очереди записываются в файлы). Последующие записи выполняются
+        сразу.
+        """
+        with cls._lock:
+            listener, cls._listener = cls._listener, None
+        if listener is not None and cls._pid == os.getpid():
+            listener.stop()
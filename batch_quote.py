@@ -0,0 +1,274 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует пакетный расчет стоимости заказов из файла (режим
+командной строки, без графического интерфейса). Файл заказов в формате CSV
+или JSONL читается построчно, результаты записываются построчно в файл того
+же (или указанного) формата, поэтому размер файла не ограничен памятью.
+Большие файлы рассчитываются пулом процессов.
+
+Тип расчета задается полем type каждого заказа:
+- personal - вкладка "Частные лица" (поля класса pricing.PersonalOrder);
+- sheet - вкладка "Листовой материал" (поля класса pricing.SheetOrder);
+- industrial - вкладка "Промышленный расчет": стоимость от времени работы
+(поле minutes) и/или время гравировки (поля width, height, dpi, speed,
+passes, black_pixels).
+
+Пример использования (из папки программы):
+python batch_quote.py orders.csv results.csv
+python batch_quote.py orders.jsonl results.jsonl --workers 4
+
+Модуль содержит функции:
+- get_engines - получение механизмов расчета текущего процесса;
+- quote_order - расчет одного заказа;
+- quote_chunk - расчет группы заказов (задача пула процессов);
+- read_orders - построчное чтение файла заказов;
+- write_results - расчет и построчная запись результатов;
+- main - точка входа командной строки.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from app_logger import AppLogger
+from pricing import (IndustrialEngine, PersonalOrder, PricingConfig,
+                     PricingEngine, SheetMaterialEngine, SheetOrder,
+                     parse_number, parse_order, round_cost)
+from settings_configuration import ConfigSnapshot, SettingsFileError
+from shared_settings import shared_settings
+
+
+# Столбцы файла результатов в формате CSV
+RESULT_COLUMNS = (
+    'id', 'type', 'status', 'error', 'cost', 'total', 'design_cost',
+    'per_sheet', 'sheets', 'cost_price_item', 'cost_price', 'time_minimum',
+    'time_text', 'time_imagine'
+)
+
+# Количество заказов в одной задаче пула процессов
+CHUNK_SIZE = 500
+
+# Размер файла, начиная с которого используется пул процессов, байт
+POOL_THRESHOLD = 1_000_000
+
+# Поле строки заказов с ошибкой чтения строки файла (строка не JSON)
+READ_ERROR = '__error__'
+
+# Механизмы расчета процесса (создаются при первом обращении)
+_engines = None
+
+
+def get_engines() -> tuple:
+    """
+    Функция получения механизмов расчета текущего процесса. Файлы
+    конфигурации читаются один раз на процесс.
+    :return: Кортеж (PricingEngine, SheetMaterialEngine, IndustrialEngine).
+    """
+    global _engines
+    if _engines is None:
+        # Процессы пула читают локальную копию общей папки без сверки
+        shared_settings.setup(sync=False)
+        snapshot = ConfigSnapshot.get_snapshot()
+        _engines = (
+            PricingEngine(PricingConfig.from_snapshot(snapshot)),
+            SheetMaterialEngine(),
+            IndustrialEngine(snapshot.one_hour_of_work)
+        )
+    return _engines
+
+
+def quote_order(row: dict) -> dict:
+    """
+    Функция расчета одного заказа. Ошибки данных заказа не прерывают
+    пакетный расчет, а записываются в поле error результата.
+    :param row: Строка файла заказов (поле -> значение)
+    :return: Результат расчета (поле -> значение).
+    """
+    pricing, sheet, industrial = get_engines()
+    result = {'id': row.get('id', ''), 'type': row.get('type', ''),
+              'status': 'ok', 'error': ''}
+    if READ_ERROR in row:
+        result['status'] = 'error'
+        result['error'] = row[READ_ERROR]
+        return result
+    try:
+        match str(row.get('type', '')).strip().lower():
+            case 'personal':
+                breakdown = pricing.price(parse_order(row, PersonalOrder))
+                result.update(
+                    cost=round_cost(breakdown.cost),
+                    total=breakdown.get_total(round_cost),
+                    design_cost=breakdown.design_cost
+                )
+            case 'sheet':
+                quote = sheet.price(parse_order(row, SheetOrder))
+                result.update(
+                    cost=quote.cost, total=quote.total,
+                    design_cost=quote.design_cost,
+                    per_sheet=quote.per_sheet, sheets=quote.sheets,
+                    cost_price_item=round(quote.cost_price_item, 2),
+                    cost_price=round(quote.cost_price, 2)
+                )
+            case 'industrial':
+                if row.get('minutes') not in (None, ''):
+                    result['cost'] = round_cost(
+                        industrial.get_cost(parse_number(row['minutes'])))
+                if row.get('width') not in (None, ''):
+                    times = industrial.get_time(
+                        parse_number(row['width']),
+                        parse_number(row['height']),
+                        parse_number(row['dpi']),
+                        parse_number(row['speed']),
+                        parse_number(row.get('passes') or 1),
+                        parse_number(row.get('black_pixels') or 0))
+                    result.update(zip(
+                        ('time_minimum', 'time_text', 'time_imagine'),
+                        (round(x, 2) for x in times)))
+            case other:
+                raise ValueError(f'неизвестный тип расчета "{other}"')
+    except (ValueError, TypeError, KeyError, IndexError, OverflowError,
+            ZeroDivisionError, SettingsFileError) as e:
+        result['status'] = 'error'
+        result['error'] = f'{type(e).__name__}: {e}'
+    return result
+
+
+def quote_chunk(rows: list) -> list:
+    """
+    Функция расчета группы заказов (задача пула процессов).
+    :param rows: Список строк файла заказов
+    :return: Список результатов расчета в том же порядке.
+    """
+    return [quote_order(row) for row in rows]
+
+
+def read_orders(file, file_format: str):
+    """
+    Генератор построчного чтения файла заказов. Строка JSONL, которая не
+    является объектом JSON, не прерывает расчет: для нее возвращается
+    строка с полем READ_ERROR (результат с ошибкой).
+    :param file: Открытый файл заказов
+    :param file_format: Формат файла ('csv' или 'jsonl')
+    :return: Строки файла заказов (поле -> значение).
+    """
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield {READ_ERROR: f'строка {number}: {type(e).__name__}: {e}'}
+            continue
+        if not isinstance(row, dict):
+            yield {READ_ERROR: f'строка {number}: ожидается объект JSON'}
+            continue
+        yield row
+
+
+def write_results(orders, file, file_format: str, workers: int = 1) -> int:
+    """
+    Функция расчета заказов и построчной записи результатов. При
+    workers > 1 заказы рассчитываются группами в пуле процессов, порядок
+    результатов совпадает с порядком заказов, а количество одновременно
+    обрабатываемых групп ограничено (файл не читается в память целиком).
+    :param orders: Итератор строк файла заказов
+    :param file: Открытый файл результатов
+    :param file_format: Формат файла результатов ('csv' или 'jsonl')
+    :param workers: Количество процессов
+    :return: Количество рассчитанных заказов.
+    """
+    if file_format == 'csv':
+        writer = csv.DictWriter(file, RESULT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        def write(result):
+            file.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+    count = 0
+    if workers <= 1:
+        for row in orders:
+            write(quote_order(row))
+            count += 1
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            chunk = list(islice(orders, CHUNK_SIZE))
+            if chunk:
+                pending.append(pool.submit(quote_chunk, chunk))
+            # Запись готовых групп по порядку, ограничение очереди задач
+            while pending and (not chunk or len(pending) > workers * 2 or
+                               pending[0].done()):
+                for result in pending.popleft().result():
+                    write(result)
+                    count += 1
+            if not chunk:
+                return count
+
+
+def main(argv: list | None = None) -> int:
+    """
+    Точка входа командной строки.
+    :param argv: Аргументы командной строки (по умолчанию - sys.argv)
+    :return: Код завершения (0 - успешно).
+    """
+    parser = argparse.ArgumentParser(
+        description='Пакетный расчет стоимости заказов из файла CSV/JSONL.')
+    parser.add_argument('orders', help='Файл заказов (.csv или .jsonl)')
+    parser.add_argument('results', help='Файл результатов (.csv или .jsonl)')
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help='Количество процессов (по умолчанию - по размеру файла)')
+    args = parser.parse_args(argv)
+
+    def get_format(path):
+        return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+    workers = args.workers
+    if workers is None:
+        workers = (os.cpu_count() or 1
+                   if os.path.getsize(args.orders) >= POOL_THRESHOLD else 1)
+
+    shared_settings.setup()
+    try:
+        get_engines()  # Проверка файлов конфигурации до начала расчета
+        with (open(args.orders, 'r', encoding='utf-8-sig',
+                   newline='') as orders_file,
+              open(args.results, 'w', encoding='utf-8',
+                   newline='') as results_file):
+            count = write_results(
+                read_orders(orders_file, get_format(args.orders)),
+                results_file, get_format(args.results), workers)
+    except (OSError, SettingsFileError) as e:
+        AppLogger(
+            'batch_quote.main',
+            'error',
+            f'Пакетный расчет файла {args.orders} прерван: {e}',
+            info=True
+        )
+        print(f'Ошибка: {e}', file=sys.stderr)
+        return 1
+
+    AppLogger(
+        'batch_quote.main',
+        'info',
+        f'Пакетный расчет файла {args.orders}: рассчитано заказов - {count}.'
+    )
+    print(f'Рассчитано заказов: {count}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,11 +6,17 @@ _______________________________________________________________________________
 
 - RatioArea - реализация линейной и квадратичной зависимости для расчета
 коэффициента увеличения стоимости в зависимости от размеров гравировки;
+- PiecewiseRatio - кусочно-линейная зависимость коэффициента увеличения
+стоимости от площади гравировки по произвольному набору узловых точек;
+- MonotoneSpline - монотонный кубический сплайн (PCHIP) для сглаженной
+интерполяции значений по узловым точкам;
 - DeepEngraving - работа с параметрами глубокой гравировки.
 """
 
+from bisect import bisect_right
+
 from app_logger import AppLogger
-from settings_configuration import DepthSet
+from settings_configuration import ConfigSnapshot
 
 
 class RatioArea:
@@ -98,6 +104,174 @@ class RatioArea:
             )
 
 
+class PiecewiseRatio:
+    """
+    Класс реализует кусочно-линейную зависимость коэффициента увеличения
+    стоимости от площади гравировки. Зависимость задается произвольным
+    количеством узловых точек (площадь, коэффициент) для каждого типа лазера
+    в разделе GRADATION файла settings.ini:
+        area_solid = 4900: 1, 40000: 1.5
+        area_gas = 15000: 1, 100000: 1.4, 272000: 7
+    Левее первой и правее последней точки коэффициент равен крайнему
+    значению. Если ключ для типа лазера не задан, используются зависимости
+    RatioArea по значениям ключа area. Узловые точки читаются снимком
+    настроек (ConfigSnapshot.area_points), зависимость создается в
+    PricingConfig.from_snapshot.
+
+    Наклоны участков рассчитываются один раз при создании экземпляра,
+    поэтому вычисление коэффициента сводится к двоичному поиску участка и
+    одному умножению.
+
+    Содержит метод: get_ratio.
+
+    Пример использования:
+    points = snapshot.area_points['gas']
+    if points:
+        ratio = PiecewiseRatio(points).get_ratio(current_area)
+    """
+    def __init__(self, points: list | tuple) -> None:
+        """
+        Подготовка узловых точек и наклонов участков.
+        :param points: Узловые точки (площадь, коэффициент) в порядке
+        возрастания площади.
+        """
+        if not points:
+            raise ValueError('Узловые точки зависимости не заданы.')
+        self.areas = [float(x[0]) for x in points]
+        self.ratios = [float(x[1]) for x in points]
+        if any(self.areas[i + 1] <= self.areas[i]
+               for i in range(len(self.areas) - 1)):
+            raise ValueError('Площади узловых точек должны строго '
+                             'возрастать.')
+        self.slopes = [
+            (self.ratios[i + 1] - self.ratios[i]) /
+            (self.areas[i + 1] - self.areas[i])
+            for i in range(len(self.areas) - 1)
+        ]
+
+    def get_ratio(self, area: int | float) -> float:
+        """
+        Метод вычисления коэффициента для одной площади.
+        :param area: Площадь гравировки
+        :return: Коэффициент доплаты
+        """
+        if area <= self.areas[0]:
+            return self.ratios[0]
+        if area >= self.areas[-1]:
+            return self.ratios[-1]
+        index = bisect_right(self.areas, area) - 1
+        return self.ratios[index] + (
+            area - self.areas[index]) * self.slopes[index]
+
+
+class MonotoneSpline:
+    """
+    Класс реализует монотонный кубический эрмитов сплайн (PCHIP,
+    метод Фритча-Карлсона). Сплайн проходит через все узловые точки и не
+    создает "горбов" между ними: на участках монотонности исходных данных
+    сплайн также монотонен.
+
+    Коэффициенты кубических полиномов рассчитываются один раз при создании
+    экземпляра, поэтому вычисление значения сводится к поиску участка и
+    нескольким умножениям и сложениям. За пределами узловых точек значение
+    ограничивается крайними узлами.
+
+    Содержит методы: get_value.
+
+    Пример использования:
+    spline = MonotoneSpline([1, 5, 15], [900, 200, 180])
+    value = spline.get_value(10)
+    """
+    def __init__(self, x_points: list | tuple, y_points: list | tuple) -> None:
+        """
+        Расчет коэффициентов сплайна.
+        :param x_points: Строго возрастающая последовательность узлов;
+        :param y_points: Значения в узлах.
+        """
+        if len(x_points) != len(y_points) or not x_points:
+            raise ValueError('Количество узлов и значений сплайна не '
+                             'совпадает или узлы не заданы.')
+
+        self.x_points = [float(x) for x in x_points]
+        self.y_points = [float(y) for y in y_points]
+        count = len(self.x_points)
+
+        # Шаги сетки и наклоны отрезков
+        steps = [self.x_points[i + 1] - self.x_points[i]
+                 for i in range(count - 1)]
+        if any(step <= 0 for step in steps):
+            raise ValueError('Узлы сплайна должны строго возрастать.')
+        slopes = [(self.y_points[i + 1] - self.y_points[i]) / steps[i]
+                  for i in range(count - 1)]
+
+        # Производные в узлах
+        derivatives = [0.0] * count
+        if count == 2:  # Вырожденный случай - прямая
+            derivatives = [slopes[0], slopes[0]]
+        elif count > 2:
+            for i in range(1, count - 1):
+                # Экстремум или плато - производная равна нулю
+                if slopes[i - 1] * slopes[i] <= 0:
+                    continue
+                # Взвешенное гармоническое среднее наклонов
+                weight_1 = 2 * steps[i] + steps[i - 1]
+                weight_2 = steps[i] + 2 * steps[i - 1]
+                derivatives[i] = (weight_1 + weight_2) / (
+                    weight_1 / slopes[i - 1] + weight_2 / slopes[i])
+            derivatives[0] = self._edge_derivative(
+                steps[0], steps[1], slopes[0], slopes[1])
+            derivatives[-1] = self._edge_derivative(
+                steps[-1], steps[-2], slopes[-1], slopes[-2])
+
+        # Коэффициенты полинома y = y_k + d_k*t + c2*t^2 + c3*t^3
+        self.coefficients = list()
+        for i in range(count - 1):
+            self.coefficients.append((
+                self.y_points[i],
+                derivatives[i],
+                (3 * slopes[i] - 2 * derivatives[i] - derivatives[i + 1]) /
+                steps[i],
+                (derivatives[i] + derivatives[i + 1] - 2 * slopes[i]) /
+                (steps[i] ** 2)
+            ))
+
+    @staticmethod
+    def _edge_derivative(step_0: float, step_1: float,
+                         slope_0: float, slope_1: float) -> float:
+        """
+        Метод расчета производной в крайнем узле по трехточечной формуле с
+        сохранением монотонности.
+        :param step_0: Шаг крайнего участка;
+        :param step_1: Шаг соседнего участка;
+        :param slope_0: Наклон крайнего участка;
+        :param slope_1: Наклон соседнего участка;
+        :return: Производная в крайнем узле.
+        """
+        derivative = ((2 * step_0 + step_1) * slope_0 - step_0 * slope_1) / (
+            step_0 + step_1)
+        if derivative * slope_0 <= 0:
+            return 0.0
+        if slope_0 * slope_1 <= 0 and abs(derivative) > abs(3 * slope_0):
+            return 3 * slope_0
+        return derivative
+
+    def get_value(self, point: int | float) -> float:
+        """
+        Метод вычисления значения сплайна в точке.
+        :param point: Искомая точка;
+        :return: Значение сплайна (крайнее значение за пределами узлов).
+        """
+        if point <= self.x_points[0]:
+            return self.y_points[0]
+        if point >= self.x_points[-1]:
+            return self.y_points[-1]
+
+        index = bisect_right(self.x_points, point) - 1
+        y_k, d_k, c_2, c_3 = self.coefficients[index]
+        t = point - self.x_points[index]
+        return y_k + t * (d_k + t * (c_2 + t * c_3))
+
+
 class DeepEngraving:
     """
     Класс обеспечивает расчет параметров глубокой гравировки для выбранного
@@ -109,13 +283,17 @@ class DeepEngraving:
     powers = DeepEngraving(material_name).depth_calculate(depth=required_depth)
 
     """
-    def __init__(self, material_name: str = None) -> None:
+    def __init__(self, material_name: str = None, snapshot=None) -> None:
         """
-        Создание переменной конфигурации глубокой гравировки.
+        Получение режимов глубокой гравировки.
         :param material_name: Название материала.
+        :param snapshot: Снимок настроек программы (по умолчанию - текущий
+        снимок ConfigSnapshot).
         """
         self.material_name = material_name
-        self.config = DepthSet().config
+        if snapshot is None:
+            snapshot = ConfigSnapshot.get_snapshot()
+        self.depth = snapshot.depth
 
     def depth_calculate(self, depth: float | int) -> list:
         """
@@ -131,10 +309,7 @@ class DeepEngraving:
         :return: Количество проходов.
         """
         try:  # Существует ли такой материл / корректны ли данные
-            set_depth = [
-                float(x) for x in self.config['MAIN'][
-                    self.material_name].split(", ")
-            ]
+            set_depth = self.depth[self.material_name]
             depth = float(depth)
 
         except (KeyError, TypeError, ValueError) as e:
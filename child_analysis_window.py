@@ -0,0 +1,402 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль отвечает за прорисовку и конфигурацию окон анализа стоимости изделий
+из листового материала.
+
+Модуль содержит классы:
+- ChildCompareMaterials - Класс конфигурации окна сравнения стоимости
+изделия из всех материалов базы;
+- ChildQuantityBreaks - Класс конфигурации окна расчета стоимости партий
+от 1 до N изделий (выбор выгодного размера партии).
+"""
+
+
+import tkinter as tk
+from tkinter import ttk
+
+from app_logger import AppLogger
+from binds import BalloonTips
+from materials import MaterialComparison, QuantityBreaks
+from path_getting import PathName
+
+
+class ChildCompareMaterials(tk.Toplevel):
+    """
+    Класс конфигурации дочернего окна сравнения стоимости изделия из всех
+    материалов базы. Таблица сортируется щелчком по заголовку столбца
+    (повторный щелчок меняет порядок сортировки).
+
+    Содержит методы: get_data_child, sort_table, grab_focus, destroy_child.
+
+    Пример использования:
+    child_window = ChildCompareMaterials(parent, width, height, theme,
+                                         product=(100, 50, 300, 0),
+                                         round_method=round_method,
+                                         icon=logo_path)
+    child_window.grab_focus()
+    """
+    # Столбцы таблицы: (заголовок, ширина)
+    columns = (
+        ('Материал', 250),
+        ('Изделий с листа, шт', 130),
+        ('Себестоимость, руб/шт', 150),
+        ('Листов, шт', 90),
+        ('Стоимость, руб/шт', 130),
+        ('Стоимость партии, руб', 150),
+    )
+
+    def __init__(self, parent, width: int, height: int, theme: str,
+                 product: tuple, round_method,
+                 title: str = 'Сравнение материалов',
+                 resizable: tuple = (False, False), icon: str | None = None):
+        """
+        Конфигурация и прорисовка дочернего окна сравнения материалов.
+        :param parent: Класс родительского окна
+        :param width: Ширина окна
+        :param height: Высота окна
+        :param theme: Тема, используемая в родительском классе
+        :param product: Параметры изделия (ширина, высота, количество,
+        скидка оператора)
+        :param round_method: Метод округления стоимости (из класса App)
+        :param title: Название окна
+        :param resizable: Изменяемость окна. По умолчанию: (False, False)
+        :param icon: Иконка окна. По умолчанию: None
+        """
+        # Создание дочернего окна поверх основного
+        super().__init__(parent)
+        AppLogger(
+            'ChildCompareMaterials',
+            'info',
+            f'Открытие дочернего окна сравнения материалов.'
+        )
+        self.title(title)
+        self.geometry(f"{width}x{height}+20+20")
+        self.resizable(resizable[0], resizable[1])
+        if icon:
+            self.iconbitmap(PathName.resource_path(icon))
+
+        # Создание переменных
+        self.parent = parent
+        self.product = product
+        self.round_method = round_method
+        self.rows = list()
+        self.sort_column = 4
+        self.sort_reverse = False
+
+        # Установка стиля окна
+        self.style_child = ttk.Style(self)
+        self.style_child.theme_use(theme)
+
+        # Конфигурация отзывчивости окна
+        self.columnconfigure(index=0, weight=1)
+        self.columnconfigure(index=1, weight=0)
+        self.rowconfigure(index=0, weight=0)
+        self.rowconfigure(index=1, weight=1)
+        self.rowconfigure(index=2, weight=0)
+
+        # Параметры изделия
+        product_width, product_height, quantity, discount = product
+        ttk.Label(
+            self,
+            text=f'Изделие: {product_width:g} x {product_height:g} мм, '
+                 f'{quantity} шт. Скидка оператора: {discount} %',
+            font='Arial 12'
+        ).grid(row=0, column=0, padx=10, pady=10, sticky='nsew',
+               columnspan=2)
+
+        # Создание и конфигурация таблицы
+        tree_scroll = ttk.Scrollbar(self)
+        tree_scroll.grid(row=1, column=1, padx=(0, 10), pady=0,
+                         sticky="nsew")
+        self.compare_table = ttk.Treeview(
+            self,
+            selectmode="browse",
+            yscrollcommand=tree_scroll.set,
+            height=12,
+            columns=tuple(f'#{i}' for i in range(len(self.columns))),
+            show="headings"
+        )
+        for index, (text, column_width) in enumerate(self.columns):
+            self.compare_table.column(
+                index, width=column_width,
+                anchor="w" if index == 0 else "center")
+            self.compare_table.heading(
+                index, text=text, anchor="center",
+                command=lambda x=index: self.sort_table(x))
+        tree_scroll.configure(command=self.compare_table.yview)
+        self.compare_table.grid(row=1, column=0, padx=(10, 0), pady=0,
+                                sticky="nsew")
+
+        # Кнопка закрытия окна
+        self.btn_destroy = ttk.Button(
+            self,
+            text="Выход",
+            command=self.destroy_child
+        )
+        self.btn_destroy.grid(row=2, column=0, padx=10, pady=15,
+                              sticky='nse', columnspan=2)
+
+        # Расчет и заполнение таблицы
+        self.get_data_child()
+
+    def get_data_child(self) -> None:
+        """
+        Метод расчета изделия для всех материалов и заполнения таблицы.
+        """
+        product_width, product_height, quantity, discount = self.product
+        self.rows = list()
+        for name, count, cost_price, sheets, cost, _ in MaterialComparison(
+        ).compare(product_width, product_height, quantity, discount):
+            cost = self.round_method(cost)
+            self.rows.append((name, count, cost_price, sheets, cost,
+                              cost * quantity))
+        self.sort_table(self.sort_column, toggle=False)
+
+    def sort_table(self, column: int, toggle: bool = True) -> None:
+        """
+        Метод сортировки таблицы по выбранному столбцу.
+        :param column: Номер столбца
+        :param toggle: Менять порядок сортировки при повторном выборе
+        столбца
+        """
+        if toggle:
+            self.sort_reverse = (not self.sort_reverse
+                                 if column == self.sort_column else False)
+        self.sort_column = column
+        self.rows.sort(key=lambda x: x[column], reverse=self.sort_reverse)
+
+        self.compare_table.delete(*self.compare_table.get_children())
+        for name, count, cost_price, sheets, cost, total in self.rows:
+            self.compare_table.insert('', index='end', values=(
+                name, count, f'{cost_price:_.2f}'.replace('_', ' '), sheets,
+                f'{cost:_.0f}'.replace('_', ' '),
+                f'{total:_.0f}'.replace('_', ' ')))
+
+    def grab_focus(self) -> None:
+        """
+        Метод захвата фокуса на дочернем окне.
+        """
+        self.grab_set()
+        self.focus_set()
+        self.wait_window()
+
+    def destroy_child(self) -> None:
+        """
+        Метод, реализующий разрушение (закрытие) окна.
+        """
+        self.destroy()
+
+
+class ChildQuantityBreaks(tk.Toplevel):
+    """
+    Класс конфигурации дочернего окна расчета стоимости партий от 1 до N
+    изделий из выбранного материала. Отмечаются количества, при которых
+    последний лист заполнен полностью, и количества, начиная с которых
+    снижается стоимость одного изделия.
+
+    Содержит методы: get_data_child, add_tips, grab_focus, destroy_child.
+
+    Пример использования:
+    child_window = ChildQuantityBreaks(parent, width, height, theme,
+                                       product=(name, 100, 50, 300, 0),
+                                       round_method=round_method,
+                                       icon=logo_path)
+    child_window.grab_focus()
+    """
+    # Столбцы таблицы: (заголовок, ширина)
+    columns = (
+        ('Количество, шт', 110),
+        ('Листов, шт', 90),
+        ('Себестоимость, руб/шт', 160),
+        ('Стоимость, руб/шт', 130),
+        ('Стоимость партии, руб', 160),
+        ('Отметка', 230),
+    )
+
+    # Максимальное количество изделий для расчета
+    max_quantity = 10000
+
+    def __init__(self, parent, width: int, height: int, theme: str,
+                 product: tuple, round_method,
+                 title: str = 'Выгодные партии',
+                 resizable: tuple = (False, False), icon: str | None = None):
+        """
+        Конфигурация и прорисовка дочернего окна расчета партий.
+        :param parent: Класс родительского окна
+        :param width: Ширина окна
+        :param height: Высота окна
+        :param theme: Тема, используемая в родительском классе
+        :param product: Параметры изделия (материал, ширина, высота,
+        количество, скидка оператора)
+        :param round_method: Метод округления стоимости (из класса App)
+        :param title: Название окна
+        :param resizable: Изменяемость окна. По умолчанию: (False, False)
+        :param icon: Иконка окна. По умолчанию: None
+        """
+        # Создание дочернего окна поверх основного
+        super().__init__(parent)
+        AppLogger(
+            'ChildQuantityBreaks',
+            'info',
+            f'Открытие дочернего окна расчета выгодных партий.'
+        )
+        self.title(title)
+        self.geometry(f"{width}x{height}+20+20")
+        self.resizable(resizable[0], resizable[1])
+        if icon:
+            self.iconbitmap(PathName.resource_path(icon))
+
+        # Создание переменных
+        self.parent = parent
+        self.product = product
+        self.round_method = round_method
+        self.not_use = None
+        material_name, product_width, product_height, quantity, _ = product
+        self.breaks = QuantityBreaks(material_name, product_width,
+                                     product_height)
+
+        # Установка стиля окна
+        self.style_child = ttk.Style(self)
+        self.style_child.theme_use(theme)
+
+        # Конфигурация отзывчивости окна
+        self.columnconfigure(index=0, weight=1)
+        self.columnconfigure(index=1, weight=1)
+        self.columnconfigure(index=2, weight=1)
+        self.columnconfigure(index=3, weight=0)
+        self.rowconfigure(index=0, weight=0)
+        self.rowconfigure(index=1, weight=0)
+        self.rowconfigure(index=2, weight=1)
+
+        # Параметры изделия
+        ttk.Label(
+            self,
+            text=f'{material_name}: {product_width:g} x {product_height:g} '
+                 f'мм, изделий с листа: {self.breaks.per_sheet} шт.',
+            font='Arial 12'
+        ).grid(row=0, column=0, padx=10, pady=10, sticky='nsew',
+               columnspan=4)
+
+        # Поле ввода максимального количества и переключатель фильтра
+        ttk.Label(self, text='Количество до, шт:').grid(
+            row=1, column=0, padx=10, pady=5, sticky='e')
+        self.ent_max_quantity = ttk.Entry(self, width=12)
+        self.ent_max_quantity.insert(
+            0, str(min(max(quantity * 2, 100), self.max_quantity)))
+        self.ent_max_quantity.grid(row=1, column=1, padx=10, pady=5,
+                                   sticky='ew')
+        self.bool_marked = tk.BooleanVar(value=True)
+        self.switch_marked = ttk.Checkbutton(
+            self,
+            text='Только отмеченные',
+            style='Switch',
+            variable=self.bool_marked,
+            offvalue=False,
+            onvalue=True,
+            command=self.get_data_child
+        )
+        self.switch_marked.grid(row=1, column=2, padx=10, pady=5,
+                                sticky='w')
+        self.btn_calculate = ttk.Button(
+            self,
+            text="Рассчитать",
+            command=self.get_data_child
+        )
+        self.btn_calculate.grid(row=1, column=3, padx=10, pady=5,
+                                sticky='nsew')
+
+        # Создание и конфигурация таблицы
+        tree_frame = ttk.Frame(self)
+        tree_frame.grid(row=2, column=0, padx=10, pady=(5, 15),
+                        sticky='nsew', columnspan=4)
+        tree_frame.columnconfigure(index=0, weight=1)
+        tree_frame.rowconfigure(index=0, weight=1)
+        tree_scroll = ttk.Scrollbar(tree_frame)
+        tree_scroll.grid(row=0, column=1, sticky="nsew")
+        self.breaks_table = ttk.Treeview(
+            tree_frame,
+            selectmode="browse",
+            yscrollcommand=tree_scroll.set,
+            height=14,
+            columns=tuple(f'#{i}' for i in range(len(self.columns))),
+            show="headings"
+        )
+        for index, (text, column_width) in enumerate(self.columns):
+            self.breaks_table.column(index, width=column_width,
+                                     anchor="center")
+            self.breaks_table.heading(index, text=text, anchor="center")
+        self.breaks_table.tag_configure('sheet', background='#d9ead3')
+        self.breaks_table.tag_configure('price', foreground='#217346')
+        tree_scroll.configure(command=self.breaks_table.yview)
+        self.breaks_table.grid(row=0, column=0, sticky="nsew")
+
+        # Расчет, подсказки и связывание клавиш
+        self.get_data_child()
+        self.add_tips()
+        self.ent_max_quantity.bind('<Return>', self.get_data_child)
+
+    def get_data_child(self, event=None) -> None:
+        """
+        Метод расчета стоимости партий и заполнения таблицы.
+        :param event: Событие нажатия клавиши <Enter> в поле ввода
+        """
+        self.not_use = event
+        try:
+            max_quantity = min(int(self.ent_max_quantity.get()),
+                               self.max_quantity)
+        except ValueError as e:
+            AppLogger(
+                'ChildQuantityBreaks.get_data_child',
+                'warning',
+                f'{e}: Максимальное количество изделий введено неверно.'
+            )
+            return
+
+        discount = self.product[-1]
+        rows = self.breaks.calculate(max_quantity, discount,
+                                     self.round_method)
+        self.breaks_table.delete(*self.breaks_table.get_children())
+        for (number, sheets, cost_price, cost, total, filled,
+             price_break) in rows:
+            if self.bool_marked.get() and not (filled or price_break):
+                continue
+            marks = list()
+            tags = list()
+            if filled:
+                marks.append('лист заполнен')
+                tags.append('sheet')
+            if price_break:
+                marks.append('снижение цены')
+                tags.append('price')
+            self.breaks_table.insert('', index='end', tags=tags, values=(
+                number, sheets, f'{cost_price:_.2f}'.replace('_', ' '),
+                f'{cost:_.0f}'.replace('_', ' '),
+                f'{total:_.0f}'.replace('_', ' '), ', '.join(marks)))
+
+    def add_tips(self) -> None:
+        """
+        Метод добавления подсказок к элементам интерфейса.
+        """
+        BalloonTips(self.switch_marked,
+                    text=f'Показывать только количества, при которых\n'
+                         f'последний лист заполнен полностью или\n'
+                         f'снижается стоимость одного изделия.')
+        BalloonTips(self.ent_max_quantity,
+                    text=f'Максимальное количество изделий в партии\n'
+                         f'(не более {self.max_quantity}).')
+
+    def grab_focus(self) -> None:
+        """
+        Метод захвата фокуса на дочернем окне.
+        """
+        self.grab_set()
+        self.focus_set()
+        self.wait_window()
+
+    def destroy_child(self) -> None:
+        """
+        Метод, реализующий разрушение (закрытие) окна.
+        """
+        self.destroy()
@@ -24,7 +24,7 @@ from app_logger import AppLogger
 from binds import BindEntry, BalloonTips
 from path_getting import PathName
 from resources_links import OpenUrl
-from settings_configuration import ConfigSet, StandardSet
+from settings_configuration import ConfigSet, SettingsFileError, StandardSet
 
 
 class ChildConfigSet(tk.Toplevel):
@@ -654,7 +654,12 @@ class MainSettingsTab(ttk.Frame):
         if askokcancel('Сохранение настроек',
                        'Вы действительно хотите сохранить изменения?'):
             # Запись в файл конфигурации
-            self.child_temp_settings.update_settings(some_new=new_config)
+            try:
+                self.child_temp_settings.update_settings(some_new=new_config)
+            except SettingsFileError as e:
+                tk.messagebox.showerror('Ошибка сохранения', str(e))
+                self.update_data_in_widgets()
+                return
             AppLogger(
                 'MainSettingsTab.click_save_settings',
                 'info',
@@ -1051,7 +1056,10 @@ class StandardWorksTab(ttk.Frame):
             )
 
         # Записываем данные в файл
-        self.standard_works_config.update_settings(some_new=add_config)
+        try:
+            self.standard_works_config.update_settings(some_new=add_config)
+        except SettingsFileError as e:
+            tk.messagebox.showerror('Ошибка сохранения', str(e))
 
         # Обновление данных в таблице
         self.update_data_in_widgets()
@@ -1077,8 +1085,13 @@ class StandardWorksTab(ttk.Frame):
                 config_with_deleted_item.remove_option(
                     'STANDARD', str(deleted_item['values'][0]))
                 # Обновление данных в файле
-                self.standard_works_config.update_settings(
-                    some_new=config_with_deleted_item)
+                try:
+                    self.standard_works_config.update_settings(
+                        some_new=config_with_deleted_item)
+                except SettingsFileError as e:
+                    tk.messagebox.showerror('Ошибка сохранения', str(e))
+                    self.update_data_in_widgets()
+                    return
                 AppLogger(
                     'StandardWorksTab.click_delete_element',
                     'info',
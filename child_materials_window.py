@@ -23,6 +23,7 @@ from binds import BindEntry
 from binds import BalloonTips
 from materials import Materials, Interpolation
 from path_getting import PathName
+from settings_configuration import SettingsFileError
 
 
 class ChildMaterials(tk.Toplevel):
@@ -333,10 +334,16 @@ class ChildMaterials(tk.Toplevel):
             # Записываем новые данные в файл конфигурации
             temp_new['MAIN'][new_name] = (f'{new_width}, {new_height},'
                                           f' {new_price}, {type_of_laser}')
-            self.config_material_data.update_materials(some_new=temp_new)
-
-            # Создание матрицы стоимостей
-            self.config_material_data.add_matrix_file(new_name, type_of_laser)
+            try:
+                self.config_material_data.update_materials(some_new=temp_new)
+            except SettingsFileError as e:
+                messagebox.showerror('Ошибка сохранения', str(e))
+                saved = False
+            else:
+                saved = True
+                # Создание матрицы стоимостей
+                self.config_material_data.add_matrix_file(new_name,
+                                                          type_of_laser)
 
             # Обновление данных в таблице
             # Очистка таблицы
@@ -350,12 +357,13 @@ class ChildMaterials(tk.Toplevel):
             self.reset_entries_data()
 
             self.update()
-            AppLogger(
-                'ChildMaterials.click_add_material',
-                'info',
-                f'Добавлен новый элемент в таблицу "Листовой материал":'
-                f' {new_name}.'
-            )
+            if saved:
+                AppLogger(
+                    'ChildMaterials.click_add_material',
+                    'info',
+                    f'Добавлен новый элемент в таблицу "Листовой материал":'
+                    f' {new_name}.'
+                )
 
     def click_del_material(self) -> None:
         """
@@ -377,19 +385,21 @@ class ChildMaterials(tk.Toplevel):
                 deleted_data_config.remove_option(
                     'MAIN', material_name)
 
-                # Обновление данных в файле конфигурации
-                self.config_material_data.update_materials(
-                    some_new=deleted_data_config)
-
-                # Удаление файла с матрицей стоимостей
-                self.config_material_data.del_matrix_file(material_name)
-
-                AppLogger(
-                    'ChildMaterials.click_del_material',
-                    'info',
-                    f'Удаление элемента "{material_name}" из списка '
-                    f'листового материала.'
-                )
+                # Обновление данных в файле конфигурации и удаление файла с
+                # матрицей стоимостей
+                try:
+                    self.config_material_data.update_materials(
+                        some_new=deleted_data_config)
+                except SettingsFileError as e:
+                    messagebox.showerror('Ошибка сохранения', str(e))
+                else:
+                    self.config_material_data.del_matrix_file(material_name)
+                    AppLogger(
+                        'ChildMaterials.click_del_material',
+                        'info',
+                        f'Удаление элемента "{material_name}" из списка '
+                        f'листового материала.'
+                    )
 
         except (ValueError, KeyboardInterrupt, IndexError) as e:
             tk.messagebox.showerror(
@@ -566,6 +576,9 @@ class ChildMatrixMaterial(tk.Toplevel):
     add_entries_data, click_save_matrix, click_reset_matrix, grab_focus,
     destroy_child.
 
+    В окне также выбирается режим интерполяции стоимостей материала
+    (линейная или сглаженная).
+
     Пример использования:
     matrix_child = ChildMatrixMaterial(parent, width, height, theme,
     icon=logo_path)
@@ -759,6 +772,16 @@ class ChildMatrixMaterial(tk.Toplevel):
             text="Сброс",
             command=self.click_reset_matrix
         )
+        # Переключатель режима интерполяции стоимостей
+        self.bool_spline = tk.BooleanVar(
+            value=self.config_matrix_cost.get_interpolation_mode() == 'spline'
+        )
+        self.switch_spline = ttk.Checkbutton(
+            self,
+            text="Сглаженная интерполяция",
+            variable=self.bool_spline,
+            style="Switch"
+        )
         # Прорисовка интерфейса окна (виджетов)
         self.draw_widgets()
 
@@ -846,6 +869,10 @@ class ChildMatrixMaterial(tk.Toplevel):
         )
 
         BalloonTips(self.btn_reset, text='Сброс настроек "по-умолчанию".')
+        BalloonTips(self.switch_spline,
+                    text=f'Плавная (монотонная кубическая) интерполяция\n'
+                         f'стоимостей по количеству и площади изделия\n'
+                         f'вместо линейной.')
 
     def draw_solid_widget(self) -> None:
         """
@@ -863,8 +890,11 @@ class ChildMatrixMaterial(tk.Toplevel):
         )
 
         # Кнопки
+        self.switch_spline.grid(
+            row=6, column=1, padx=2, pady=10, sticky='ns', columnspan=3
+        )
         self.btn_save.grid(
-            row=6, column=1, padx=(2, 10), pady=10, sticky='nsew', columnspan=7
+            row=6, column=4, padx=(2, 10), pady=10, sticky='nsew', columnspan=4
         )
 
         self.btn_reset.grid(
@@ -901,9 +931,12 @@ class ChildMatrixMaterial(tk.Toplevel):
         )
 
         # Кнопки
+        self.switch_spline.grid(
+            row=7, column=1, padx=2, pady=10, sticky='ns', columnspan=3
+        )
         self.btn_save.grid(
-            row=7, column=1, padx=(2, 10), pady=10, sticky='nsew',
-            columnspan=7
+            row=7, column=4, padx=(2, 10), pady=10, sticky='nsew',
+            columnspan=4
         )
 
         self.btn_reset.grid(
@@ -958,6 +991,9 @@ class ChildMatrixMaterial(tk.Toplevel):
                         temp_string.append(str(int(item.get())))
                     temp_config['COSTS'][self.string_name_list[i]] =\
                         ', '.join(temp_string)
+                # Режим интерполяции
+                self.config_matrix_cost.set_interpolation_mode(
+                    'spline' if self.bool_spline.get() else 'linear')
                 AppLogger(
                     'ChildMatrixMaterial.click_save_matrix',
                     'info',
@@ -992,6 +1028,8 @@ class ChildMatrixMaterial(tk.Toplevel):
             # Создание локальной переменной конфига
             self.config_matrix_cost.get_default()
             self.config_matrix_cost = Interpolation(self.material_name)
+            self.bool_spline.set(
+                self.config_matrix_cost.get_interpolation_mode() == 'spline')
 
             # Обновляем данные в полях ввода
             self.add_entries_data()
@@ -0,0 +1,633 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль отвечает за прорисовку и конфигурацию окна раскроя заказа из изделий
+разных габаритов на листы выбранного материала и окна склада обрезков.
+
+Модуль содержит классы:
+- ChildOrderPacking - Класс конфигурации окна раскроя заказа;
+- ChildRemnants - Класс конфигурации окна склада обрезков.
+"""
+
+
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+from tkinter.messagebox import askokcancel
+
+from app_logger import AppLogger
+from binds import BindEntry
+from binds import BalloonTips
+from materials import Materials, OrderPacking
+from path_getting import PathName
+from remnants import RemnantInventory
+from settings_configuration import SettingsFileError
+
+
+class ChildOrderPacking(tk.Toplevel):
+    """
+    Класс конфигурации дочернего окна раскроя заказа из изделий разных
+    габаритов на минимальное количество листов выбранного материала.
+
+    Содержит методы: click_add_line, click_del_line, click_calculate,
+    click_save_remnants, reset_entries_data, get_lines, add_binds, add_tips,
+    grab_focus, destroy_child.
+
+    Пример использования:
+    child_window = ChildOrderPacking(parent, width, height, theme,
+                                     icon=logo_path)
+    child_window.grab_focus()
+    """
+    def __init__(self, parent, width: int, height: int, theme: str,
+                 title: str = 'Раскрой заказа',
+                 resizable: tuple = (False, False), icon: str | None = None):
+        """
+        Конфигурация и прорисовка дочернего окна раскроя заказа.
+        :param parent: Класс родительского окна
+        :param width: Ширина окна
+        :param height: Высота окна
+        :param theme: Тема, используемая в родительском классе
+        :param title: Название окна
+        :param resizable: Изменяемость окна. По умолчанию: (False, False)
+        :param icon: Иконка окна. По умолчанию: None
+        """
+        # Создание дочернего окна поверх основного
+        super().__init__(parent)
+        AppLogger(
+            'ChildOrderPacking',
+            'info',
+            f'Открытие дочернего окна раскроя заказа.'
+        )
+        self.title(title)
+        self.geometry(f"{width}x{height}+20+20")
+        self.resizable(resizable[0], resizable[1])
+        if icon:
+            self.iconbitmap(PathName.resource_path(icon))
+
+        # Создание переменной - ссылки на родителя
+        self.parent = parent
+
+        # Результат последнего раскроя (материал, раскрой)
+        self.last_packing = None
+
+        # Установка стиля окна
+        self.style_child = ttk.Style(self)
+        self.style_child.theme_use(theme)
+
+        # Конфигурация отзывчивости окна
+        self.columnconfigure(index=0, weight=1)
+        self.columnconfigure(index=1, weight=50)
+        self.columnconfigure(index=2, weight=1)
+        self.rowconfigure(index=0, weight=1)
+        self.rowconfigure(index=1, weight=1)
+        self.rowconfigure(index=2, weight=1)
+
+        # Создание и конфигурация таблицы строк заказа
+        tree_scroll = ttk.Scrollbar(self)
+        tree_scroll.grid(row=0, column=2, padx=0, pady=0,
+                         sticky="nsew")
+        self.order_table = ttk.Treeview(
+            self,
+            selectmode="extended",
+            yscrollcommand=tree_scroll.set,
+            height=8,
+            columns=('#0', '#1', '#2'),
+            show="headings"
+        )
+        self.order_table.column(0, width=150, anchor="center")
+        self.order_table.column(1, width=150, anchor="center")
+        self.order_table.column(2, width=150, anchor="center")
+
+        self.order_table.heading(0, text="Ширина, мм", anchor="center")
+        self.order_table.heading(1, text="Высота, мм", anchor="center")
+        self.order_table.heading(2, text="Количество, шт", anchor="center")
+        self.order_table.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll.configure(command=self.order_table.yview)
+
+        # Упаковка таблицы
+        self.order_table.grid(
+            row=0, column=1, padx=0, pady=0, sticky="nsew"
+        )
+
+        # Создание формы для основных виджетов
+        self.panel_settings = ttk.Frame(self, padding=(0, 0, 0, 0))
+        self.panel_settings.grid(row=1, column=0, padx=0, pady=(0, 0),
+                                 sticky="nsew", columnspan=3)
+        for index in range(5):
+            self.panel_settings.columnconfigure(index=index, weight=1)
+        for index in range(3):
+            self.panel_settings.rowconfigure(index=index, weight=1)
+
+        # Выпадающий список материалов
+        self.combo_mat = ttk.Combobox(
+            self.panel_settings,
+            values=list(Materials().get_mat_price()),
+            state='readonly'
+        )
+        self.combo_mat.current(0)
+        self.combo_mat.grid(row=0, column=0, padx=10, pady=(15, 5),
+                            sticky='nsew', columnspan=5)
+
+        # Окна ввода -Ширина, высота и количество изделий-
+        self.ent_width = ttk.Entry(self.panel_settings, width=18)
+        self.ent_width.grid(row=1, column=0, padx=10, pady=5,
+                            sticky='nsew')
+        self.ent_height = ttk.Entry(self.panel_settings, width=18)
+        self.ent_height.grid(row=1, column=1, padx=10, pady=5,
+                             sticky='nsew')
+        self.ent_quantity = ttk.Entry(self.panel_settings, width=18)
+        self.ent_quantity.grid(row=1, column=2, padx=10, pady=5,
+                               sticky='nsew')
+
+        # Кнопка добавления строки заказа
+        self.btn_add = ttk.Button(
+            self.panel_settings,
+            text="Добавить",
+            command=self.click_add_line
+        )
+        self.btn_add.grid(row=1, column=3, padx=10, pady=5, sticky='nsew')
+
+        # Кнопка удаления выбранных строк заказа
+        self.btn_del = ttk.Button(
+            self.panel_settings,
+            text="Удалить",
+            command=self.click_del_line
+        )
+        self.btn_del.grid(row=1, column=4, padx=10, pady=5, sticky='nsew')
+
+        # Кнопка расчета раскроя
+        self.btn_calculate = ttk.Button(
+            self.panel_settings,
+            text="Рассчитать раскрой заказа",
+            command=self.click_calculate
+        )
+        self.btn_calculate.grid(row=2, column=0, padx=10, pady=(5, 15),
+                                sticky='nsew', columnspan=3)
+
+        # Кнопка сохранения обрезков на склад
+        self.btn_save_remnants = ttk.Button(
+            self.panel_settings,
+            text="Сохранить обрезки",
+            command=self.click_save_remnants,
+            state='disabled'
+        )
+        self.btn_save_remnants.grid(row=2, column=3, padx=10, pady=(5, 15),
+                                    sticky='nsew')
+
+        # Кнопка закрытия окна
+        self.btn_destroy = ttk.Button(
+            self.panel_settings,
+            text="Выход",
+            command=self.destroy_child
+        )
+        self.btn_destroy.grid(row=2, column=4, padx=10, pady=(5, 15),
+                              sticky='nsew')
+
+        # Форма результатов расчета
+        self.panel_result = ttk.LabelFrame(self, text='Результаты')
+        self.panel_result.grid(row=2, column=0, padx=10, pady=(0, 15),
+                               sticky="nsew", columnspan=3)
+        self.panel_result.columnconfigure(index=0, weight=1)
+        self.panel_result.columnconfigure(index=1, weight=1)
+        self.panel_result.rowconfigure(index=0, weight=1)
+        self.panel_result.rowconfigure(index=1, weight=1)
+
+        self.lbl_sheets = ttk.Label(
+            self.panel_result,
+            text=f"Листов на заказ:  {0:.0f}  шт.",
+            font='Arial 12 bold',
+            foreground='#217346'
+        )
+        self.lbl_sheets.grid(row=0, column=0, padx=10, pady=5,
+                             sticky='nsew')
+        self.lbl_separate = ttk.Label(
+            self.panel_result,
+            text=f"При раздельном расчете:  {0:.0f}  шт.",
+            font='Arial 12'
+        )
+        self.lbl_separate.grid(row=0, column=1, padx=10, pady=5,
+                               sticky='nsew')
+        self.lbl_utilization = ttk.Label(
+            self.panel_result,
+            text=f"Использование материала:  {0:.0f} %",
+            font='Arial 12'
+        )
+        self.lbl_utilization.grid(row=1, column=0, padx=10, pady=5,
+                                  sticky='nsew')
+        self.lbl_price = ttk.Label(
+            self.panel_result,
+            text=f"Себестоимость материала:  {0:.0f}  руб.",
+            font='Arial 12'
+        )
+        self.lbl_price.grid(row=1, column=1, padx=10, pady=5,
+                            sticky='nsew')
+
+        # Устанавливаем подсказки и фоновый текст
+        self.add_binds()
+        self.add_tips()
+
+    def click_add_line(self) -> None:
+        """
+        Метод добавления строки заказа из полей ввода в таблицу.
+        """
+        try:
+            width = float(self.ent_width.get())
+            height = float(self.ent_height.get())
+            quantity = int(self.ent_quantity.get())
+            if width <= 0 or height <= 0 or quantity <= 0:
+                raise ValueError('Значения должны быть больше нуля')
+        except ValueError as e:
+            AppLogger(
+                'ChildOrderPacking.click_add_line',
+                'warning',
+                f'Строка заказа не добавлена: {e}'
+            )
+            messagebox.showwarning(
+                'Ошибка ввода',
+                'Введите ширину, высоту и количество изделий (числа больше '
+                'нуля).',
+                parent=self
+            )
+            return
+        self.order_table.insert('', index='end',
+                                values=(f'{width:g}', f'{height:g}',
+                                        quantity))
+        self.reset_entries_data()
+
+    def click_del_line(self) -> None:
+        """
+        Метод удаления выбранных строк заказа из таблицы.
+        """
+        for item in self.order_table.selection():
+            self.order_table.delete(item)
+
+    def get_lines(self) -> list:
+        """
+        Метод получения строк заказа из таблицы.
+        :return: Список строк заказа (ширина, высота, количество)
+        """
+        lines = list()
+        for item in self.order_table.get_children():
+            width, height, quantity = self.order_table.item(item)['values']
+            lines.append((float(width), float(height), int(quantity)))
+        return lines
+
+    def click_calculate(self) -> None:
+        """
+        Метод расчета раскроя заказа и вывода результатов.
+        """
+        lines = self.get_lines()
+        if not lines:
+            return
+        material_name = self.combo_mat.get()
+        try:
+            packing = OrderPacking(material_name, lines)
+            layout = packing.get_layout()
+        except KeyError as e:
+            AppLogger(
+                'ChildOrderPacking.click_calculate',
+                'error',
+                f'Материал {e} не найден в базе листового материала.',
+                info=True
+            )
+            return
+
+        self.last_packing = (material_name, layout)
+        self.btn_save_remnants.configure(state='normal')
+        self.lbl_sheets.configure(
+            text=f"Листов на заказ:  {layout.get_sheet_count():.0f}  шт.")
+        self.lbl_separate.configure(
+            text=f"При раздельном расчете:  "
+                 f"{packing.get_separate_sheet_count():.0f}  шт.")
+        self.lbl_utilization.configure(
+            text=f"Использование материала:  "
+                 f"{layout.get_utilization() * 100:.0f} %")
+        self.lbl_price.configure(
+            text=f"Себестоимость материала:  "
+                 f"{packing.get_price():_.0f}  руб.".replace('_', ' '))
+
+        if layout.unplaced:
+            messagebox.showwarning(
+                'Раскрой заказа',
+                f'Изделия не помещаются на лист материала '
+                f'"{material_name}" (строки заказа: '
+                f'{", ".join(str(x[0] + 1) for x in layout.unplaced)}).',
+                parent=self
+            )
+
+    def click_save_remnants(self) -> None:
+        """
+        Метод сохранения на склад обрезков, остающихся на листах после
+        раскроя заказа.
+        """
+        if self.last_packing is None:
+            return
+        material_name, layout = self.last_packing
+        remnants = list()
+        for index in range(layout.get_sheet_count()):
+            remnants.extend(layout.get_remnants(
+                index, RemnantInventory.min_side))
+        if not remnants:
+            messagebox.showinfo('Обрезки', 'Пригодных обрезков нет.',
+                                parent=self)
+            return
+        sizes = '\n'.join(f'{x[2]:g} x {x[3]:g} мм' for x in remnants[:10])
+        if askokcancel('Обрезки',
+                       f'Сохранить на склад обрезки материала '
+                       f'"{material_name}" ({len(remnants)} шт.)?\n{sizes}',
+                       parent=self):
+            try:
+                RemnantInventory().add_remnants(material_name, remnants)
+            except SettingsFileError as e:
+                messagebox.showerror('Ошибка сохранения', str(e),
+                                     parent=self)
+                return
+            self.btn_save_remnants.configure(state='disabled')
+
+    def reset_entries_data(self) -> None:
+        """
+        Метод очистки полей ввода и установки фонового текста.
+        """
+        self.ent_width.delete(0, tk.END)
+        self.ent_height.delete(0, tk.END)
+        self.ent_quantity.delete(0, tk.END)
+        self.add_binds()
+
+    def add_binds(self) -> None:
+        """
+        Установка фонового текста в полях ввода.
+        """
+        BindEntry(self.ent_width, text='Ширина, мм')
+        BindEntry(self.ent_height, text='Высота, мм')
+        BindEntry(self.ent_quantity, text='Количество, шт')
+
+    def add_tips(self) -> None:
+        """
+        Метод добавления подсказок к элементам интерфейса.
+        """
+        BalloonTips(self.btn_del,
+                    text=f'Для удаления выделите строки в таблице.')
+        BalloonTips(self.btn_calculate,
+                    text=f'Раскрой всех изделий заказа на минимальное\n'
+                         f'количество листов выбранного материала.')
+        BalloonTips(self.lbl_separate,
+                    text=f'Количество листов при расчете каждого\n'
+                         f'изделия отдельно (на вкладке "Листовой '
+                         f'материал").')
+
+    def grab_focus(self) -> None:
+        """
+        Метод захвата фокуса на дочернем окне.
+        """
+        self.grab_set()
+        self.focus_set()
+        self.wait_window()
+
+    def destroy_child(self) -> None:
+        """
+        Метод, реализующий разрушение (закрытие) окна.
+        """
+        self.destroy()
+
+
+class ChildRemnants(tk.Toplevel):
+    """
+    Класс конфигурации дочернего окна склада обрезков листового материала.
+
+    Содержит методы: get_data_child, click_add_remnant, click_del_remnant,
+    reset_entries_data, add_binds, add_tips, grab_focus, destroy_child.
+
+    Пример использования:
+    child_window = ChildRemnants(parent, width, height, theme, icon=logo_path)
+    child_window.grab_focus()
+    """
+    def __init__(self, parent, width: int, height: int, theme: str,
+                 title: str = 'Склад обрезков',
+                 resizable: tuple = (False, False), icon: str | None = None):
+        """
+        Конфигурация и прорисовка дочернего окна склада обрезков.
+        :param parent: Класс родительского окна
+        :param width: Ширина окна
+        :param height: Высота окна
+        :param theme: Тема, используемая в родительском классе
+        :param title: Название окна
+        :param resizable: Изменяемость окна. По умолчанию: (False, False)
+        :param icon: Иконка окна. По умолчанию: None
+        """
+        # Создание дочернего окна поверх основного
+        super().__init__(parent)
+        AppLogger(
+            'ChildRemnants',
+            'info',
+            f'Открытие дочернего окна склада обрезков.'
+        )
+        self.title(title)
+        self.geometry(f"{width}x{height}+20+20")
+        self.resizable(resizable[0], resizable[1])
+        if icon:
+            self.iconbitmap(PathName.resource_path(icon))
+
+        # Создание переменной - ссылки на родителя
+        self.parent = parent
+
+        # Создание переменной склада обрезков
+        self.inventory = RemnantInventory()
+
+        # Создание переменной для отслеживания событий
+        self.not_use = None
+
+        # Установка стиля окна
+        self.style_child = ttk.Style(self)
+        self.style_child.theme_use(theme)
+
+        # Конфигурация отзывчивости окна
+        self.columnconfigure(index=0, weight=1)
+        self.columnconfigure(index=1, weight=50)
+        self.columnconfigure(index=2, weight=1)
+        self.rowconfigure(index=0, weight=1)
+        self.rowconfigure(index=1, weight=1)
+        self.rowconfigure(index=2, weight=1)
+
+        # Выпадающий список материалов
+        self.combo_mat = ttk.Combobox(
+            self,
+            values=list(Materials().get_mat_price()),
+            state='readonly'
+        )
+        self.combo_mat.current(0)
+        self.combo_mat.grid(row=0, column=0, padx=10, pady=(15, 5),
+                            sticky='nsew', columnspan=3)
+
+        # Создание и конфигурация таблицы обрезков
+        tree_scroll = ttk.Scrollbar(self)
+        tree_scroll.grid(row=1, column=2, padx=0, pady=0,
+                         sticky="nsew")
+        self.remnant_table = ttk.Treeview(
+            self,
+            selectmode="extended",
+            yscrollcommand=tree_scroll.set,
+            height=8,
+            columns=('#0', '#1', '#2', '#3'),
+            show="headings"
+        )
+        self.remnant_table.column(0, width=80, anchor="center")
+        self.remnant_table.column(1, width=130, anchor="center")
+        self.remnant_table.column(2, width=130, anchor="center")
+        self.remnant_table.column(3, width=130, anchor="center")
+
+        self.remnant_table.heading(0, text="№", anchor="center")
+        self.remnant_table.heading(1, text="Ширина, мм", anchor="center")
+        self.remnant_table.heading(2, text="Высота, мм", anchor="center")
+        self.remnant_table.heading(3, text="Дата", anchor="center")
+        tree_scroll.configure(command=self.remnant_table.yview)
+        self.remnant_table.grid(row=1, column=1, padx=0, pady=0,
+                                sticky="nsew")
+
+        # Создание формы для основных виджетов
+        self.panel_settings = ttk.Frame(self, padding=(0, 0, 0, 0))
+        self.panel_settings.grid(row=2, column=0, padx=0, pady=(0, 0),
+                                 sticky="nsew", columnspan=3)
+        for index in range(5):
+            self.panel_settings.columnconfigure(index=index, weight=1)
+        self.panel_settings.rowconfigure(index=0, weight=1)
+
+        # Окна ввода -Ширина и высота обрезка-
+        self.ent_width = ttk.Entry(self.panel_settings, width=14)
+        self.ent_width.grid(row=0, column=0, padx=10, pady=15,
+                            sticky='nsew')
+        self.ent_height = ttk.Entry(self.panel_settings, width=14)
+        self.ent_height.grid(row=0, column=1, padx=10, pady=15,
+                             sticky='nsew')
+
+        # Кнопка добавления обрезка
+        self.btn_add = ttk.Button(
+            self.panel_settings,
+            text="Добавить",
+            command=self.click_add_remnant
+        )
+        self.btn_add.grid(row=0, column=2, padx=10, pady=15, sticky='nsew')
+
+        # Кнопка удаления (использования) выбранных обрезков
+        self.btn_del = ttk.Button(
+            self.panel_settings,
+            text="Удалить",
+            command=self.click_del_remnant
+        )
+        self.btn_del.grid(row=0, column=3, padx=10, pady=15, sticky='nsew')
+
+        # Кнопка закрытия окна
+        self.btn_destroy = ttk.Button(
+            self.panel_settings,
+            text="Выход",
+            command=self.destroy_child
+        )
+        self.btn_destroy.grid(row=0, column=4, padx=10, pady=15,
+                              sticky='nsew')
+
+        # Заполнение таблицы, подсказки и фоновый текст
+        self.get_data_child()
+        self.add_binds()
+        self.add_tips()
+
+    def get_data_child(self, event=None) -> None:
+        """
+        Метод заполнения таблицы обрезками выбранного материала.
+        :param event: Событие выбора материала в выпадающем списке
+        """
+        self.remnant_table.delete(*self.remnant_table.get_children())
+        for rid, width, height, added in self.inventory.get_remnants(
+                self.combo_mat.get()):
+            self.remnant_table.insert('', index='end', values=(
+                rid, f'{width:g}', f'{height:g}', added))
+        self.not_use = event
+
+    def click_add_remnant(self) -> None:
+        """
+        Метод добавления обрезка на склад из полей ввода.
+        """
+        try:
+            width = float(self.ent_width.get())
+            height = float(self.ent_height.get())
+        except ValueError as e:
+            AppLogger(
+                'ChildRemnants.click_add_remnant',
+                'warning',
+                f'Обрезок не добавлен: {e}'
+            )
+            messagebox.showwarning('Ошибка ввода',
+                                   'Введите ширину и высоту обрезка.',
+                                   parent=self)
+            return
+        try:
+            rid = self.inventory.add_remnant(self.combo_mat.get(), width,
+                                             height)
+        except SettingsFileError as e:
+            messagebox.showerror('Ошибка сохранения', str(e), parent=self)
+            return
+        if rid is None:
+            messagebox.showwarning(
+                'Склад обрезков',
+                f'Минимальная сторона обрезка: '
+                f'{RemnantInventory.min_side} мм.',
+                parent=self
+            )
+            return
+        self.get_data_child()
+        self.reset_entries_data()
+
+    def click_del_remnant(self) -> None:
+        """
+        Метод удаления выбранных обрезков со склада.
+        """
+        selection = self.remnant_table.selection()
+        if not selection or not askokcancel(
+                'Склад обрезков', 'Удалить выбранные обрезки со склада?',
+                parent=self):
+            return
+        try:
+            for item in selection:
+                rid = int(self.remnant_table.item(item)['values'][0])
+                self.inventory.remove_remnant(self.combo_mat.get(), rid)
+        except SettingsFileError as e:
+            messagebox.showerror('Ошибка сохранения', str(e), parent=self)
+        self.get_data_child()
+
+    def reset_entries_data(self) -> None:
+        """
+        Метод очистки полей ввода и установки фонового текста.
+        """
+        self.ent_width.delete(0, tk.END)
+        self.ent_height.delete(0, tk.END)
+        self.add_binds()
+
+    def add_binds(self) -> None:
+        """
+        Установка фонового текста в полях ввода и связывание действий
+        пользователя в интерфейсе приложения с командами.
+        """
+        self.combo_mat.bind('<<ComboboxSelected>>', self.get_data_child)
+        BindEntry(self.ent_width, text='Ширина, мм')
+        BindEntry(self.ent_height, text='Высота, мм')
+
+    def add_tips(self) -> None:
+        """
+        Метод добавления подсказок к элементам интерфейса.
+        """
+        BalloonTips(self.btn_del,
+                    text=f'Для удаления выделите использованные\n'
+                         f'обрезки в таблице.')
+
+    def grab_focus(self) -> None:
+        """
+        Метод захвата фокуса на дочернем окне.
+        """
+        self.grab_set()
+        self.focus_set()
+        self.wait_window()
+
+    def destroy_child(self) -> None:
+        """
+        Метод, реализующий разрушение (закрытие) окна.
+        """
+        self.destroy()
@@ -21,8 +21,11 @@ from tkinter import ttk
 from app_logger import AppLogger
 from binds import BindEntry, BalloonTips
 from calculations import DeepEngraving
+from event_bus import event_bus, DEPTH_CHANGED
 from path_getting import PathName
-from settings_configuration import DepthSet
+from quote_journal import quote_journal
+from settings_configuration import (ConfigSnapshot, DepthSet,
+                                    SettingsFileError)
 
 
 class ChildPowerSet(tk.Toplevel):
@@ -30,8 +33,9 @@ class ChildPowerSet(tk.Toplevel):
     Класс конфигурации дочернего окна расчета режимов глубокой гравировки.
 
     Содержит методы: update_combo_data, depth_calculation,
-    run_child_settings, dynamic_update_combo, add_binds, add_tips,
-    grab_focus, destroy_child.
+    run_child_settings, dynamic_update_combo, add_binds,
+    unsubscribe_events, return_by_keyboard, add_tips, grab_focus,
+    destroy_child.
 
     Пример использования:
     child_window = ChildPowerSet(parent, width, height, theme, icon=logo_path)
@@ -209,7 +213,8 @@ class ChildPowerSet(tk.Toplevel):
             name = self.cmb_depths.get()
 
             # Получаем переменную конфигурации
-            temp_config = DeepEngraving(material_name=name)
+            snapshot = ConfigSnapshot.get_snapshot()
+            temp_config = DeepEngraving(material_name=name, snapshot=snapshot)
 
             # Получаем результаты расчетов
             result_comment, result_power, powers = temp_config.depth_calculate(
@@ -305,6 +310,13 @@ class ChildPowerSet(tk.Toplevel):
                     'info',
                     f"Произведен расчет глубокой гравировки."
                 )
+            # Запись расчета в журнал расчетов
+            quote_journal.append(
+                'depth', {'material': name, 'depth': depth},
+                {'comment': result_comment, 'passes': result_power,
+                 'cycles': list(powers)},
+                snapshot
+            )
 
     def run_child_settings(self) -> None:
         """
@@ -332,8 +344,9 @@ class ChildPowerSet(tk.Toplevel):
 
     def dynamic_update_combo(self, event=None) -> None:
         """
-        Метод обновления файла конфигурации со списком материалов при
-        фокусировке в выпадающий список (обновление после изменения настроек).
+        Метод обновления списка материалов после изменения настроек
+        глубокой гравировки.
+        :param event: Событие изменения режимов глубокой гравировки
         """
         # Обновление данных
         self.update_combo_data()
@@ -348,11 +361,23 @@ class ChildPowerSet(tk.Toplevel):
         пользователя в интерфейсе приложения с командами.
         """
         BindEntry(self.ent_depth, text="Глубина гравировки, мм")
-        self.bind('<FocusIn>', self.dynamic_update_combo)
+
+        # Обновление списка материалов после изменения настроек (подписка
+        # снимается при закрытии окна)
+        event_bus.subscribe(DEPTH_CHANGED, self.dynamic_update_combo)
+        self.bind('<Destroy>', self.unsubscribe_events)
 
         # Расчет при нажатии на Enter
         self.bind('<Return>', self.return_by_keyboard)
 
+    def unsubscribe_events(self, event=None) -> None:
+        """
+        Метод отмены подписки окна на события при его закрытии.
+        :param event: Событие разрушения окна (или его виджета)
+        """
+        if event is None or event.widget is self:
+            event_bus.unsubscribe(DEPTH_CHANGED, self.dynamic_update_combo)
+
     def return_by_keyboard(self, event=None) -> None:
         """
         Выполнение расчетов при нажатии Return (клавиша Enter)
@@ -635,7 +660,10 @@ class DepthSettingsWindow(tk.Toplevel):
             )
 
         # Добавляем данные в файл конфигурации и обновляем переменную
-        self.depth_settings.update_settings(some_new=add_temp_config)
+        try:
+            self.depth_settings.update_settings(some_new=add_temp_config)
+        except SettingsFileError as e:
+            showerror('Ошибка сохранения', str(e))
         self.depth_settings = DepthSet()
 
         # Обновляем данные в таблице
@@ -658,8 +686,14 @@ class DepthSettingsWindow(tk.Toplevel):
                 temp_config_with_deleted_item.remove_option(
                     'MAIN', str(deleted_item['values'][0]))
                 # Обновление данных в файле
-                self.depth_settings.update_settings(
-                    some_new=temp_config_with_deleted_item)
+                try:
+                    self.depth_settings.update_settings(
+                        some_new=temp_config_with_deleted_item)
+                except SettingsFileError as e:
+                    showerror('Ошибка сохранения', str(e))
+                    self.depth_settings = DepthSet()
+                    self.update_table_data()
+                    return
                 # Обновление переменной конфигурации
                 self.depth_settings = DepthSet()
                 AppLogger(
@@ -0,0 +1,150 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует кэш разобранных файлов конфигурации для быстрого запуска
+программы. Проверенные и преобразованные данные файлов конфигурации (снимок
+настроек ConfigSnapshot, база листового материала, список дополнительных
+ресурсов) сохраняются в одном файле settings/config_cache.bin (формат
+marshal) вместе с состоянием исходных файлов (время изменения, размер).
+Если исходные файлы не изменились, при запуске читается один файл кэша
+вместо разбора нескольких .ini; при любом расхождении (изменен файл,
+другая версия схемы или Python, поврежден кэш) данные разбираются из .ini
+как обычно.
+
+Модуль содержит класс:
+- ConfigCache - кэш разобранных файлов конфигурации.
+
+Также модуль содержит общий экземпляр кэша config_cache.
+"""
+
+import atexit
+import marshal
+import os
+import sys
+
+from app_logger import AppLogger
+from config_writer import config_writer
+from path_getting import PathName
+
+
+class ConfigCache:
+    """
+    Класс кэша разобранных файлов конфигурации. Запись кэша - данные
+    (словари, списки, кортежи, числа и строки) и состояние исходных
+    файлов, по которому они получены. Кэш загружается из файла при первом
+    обращении и сохраняется при завершении программы (если были изменения).
+
+    Содержит методы: get_file_state, get, put, load, save.
+
+    Пример использования:
+    state = config_cache.get_file_state(path)
+    urls = config_cache.get('url_data', state)
+    if urls is None:
+        urls = parse(path)
+        config_cache.put('url_data', state, urls)
+    """
+    # Версия схемы данных кэша (увеличивается при изменении состава данных)
+    schema_version = 1
+
+    def __init__(self,
+                 file_name: str = 'settings\\config_cache.bin') -> None:
+        """
+        Инициализация кэша.
+        :param file_name: Относительный путь к файлу кэша.
+        """
+        self.path = PathName.resource_path(file_name)
+        self.entries = dict()
+        self.loaded = False
+        self.changed = False
+        atexit.register(self.save)
+
+    @staticmethod
+    def get_file_state(path: str) -> tuple | None:
+        """
+        Метод получения состояния файла (после записи ожидающего
+        содержимого файла).
+        :param path: Путь к файлу
+        :return: Кортеж (время изменения, размер) или None, если файл не
+        найден.
+        """
+        config_writer.flush(path)
+        return config_writer.get_state(path)
+
+    def get(self, key: str, state):
+        """
+        Метод получения данных записи кэша.
+        :param key: Ключ записи
+        :param state: Текущее состояние исходных файлов
+        :return: Данные записи или None, если записи нет или исходные файлы
+        изменились.
+        """
+        if not self.loaded:
+            self.load()
+        entry = self.entries.get(key)
+        if state is None or entry is None or entry[0] != state:
+            return None
+        return entry[1]
+
+    def put(self, key: str, state, data) -> None:
+        """
+        Метод добавления (обновления) записи кэша.
+        :param key: Ключ записи
+        :param state: Состояние исходных файлов, из которых получены данные
+        (состояние до их чтения)
+        :param data: Данные (типы, поддерживаемые модулем marshal)
+        """
+        if state is None:
+            return
+        if not self.loaded:
+            self.load()
+        self.entries[key] = (state, data)
+        self.changed = True
+
+    def load(self) -> None:
+        """
+        Метод загрузки кэша из файла. Поврежденный файл или файл другой
+        версии схемы (Python) игнорируется.
+        """
+        self.loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as file:
+                data = marshal.load(file)
+            if (data['schema'] == self.schema_version and
+                    data['python'] == tuple(sys.version_info[:2])):
+                self.entries = data['entries']
+        except (OSError, EOFError, ValueError, TypeError, KeyError) as e:
+            self.entries = dict()
+            AppLogger(
+                'ConfigCache.load',
+                'warning',
+                f'Файл кэша конфигурации не загружен ({e}), файлы '
+                f'конфигурации будут разобраны заново.'
+            )
+
+    def save(self) -> None:
+        """
+        Метод сохранения кэша в файл (только при наличии изменений).
+        """
+        if not self.changed:
+            return
+        data = {
+            'schema': self.schema_version,
+            'python': tuple(sys.version_info[:2]),
+            'entries': self.entries,
+        }
+        try:
+            config_writer.atomic_write(self.path, marshal.dumps(data))
+            self.changed = False
+        except (OSError, ValueError) as e:
+            AppLogger(
+                'ConfigCache.save',
+                'warning',
+                f'Файл кэша конфигурации не сохранен: {e}'
+            )
+
+
+# Общий кэш разобранных файлов конфигурации
+config_cache = ConfigCache()
@@ -0,0 +1,313 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует запись файлов конфигурации программы. Файл записывается
+во временный файл рядом с исходным и заменяет его одной операцией
+(os.replace), поэтому сбой во время записи не оставляет обрезанный .ini.
+Запись отложенная: содержимое конфигурации запоминается в момент
+сохранения, а в файл записывается фоновым потоком после паузы в
+сохранениях, поэтому несколько быстрых сохранений одного файла (например,
+при редактировании ячеек матрицы стоимостей) дают одну запись. Перед
+чтением файла ожидающая запись выполняется немедленно, при завершении
+программы записываются все ожидающие файлы.
+
+Запись файла выполняется под рекомендательной блокировкой (файл-метка
+.lock рядом с файлом), поэтому несколько экземпляров программы с общими
+файлами настроек не записывают один файл одновременно. Сохранение из
+окон настроек (метод save) дополнительно сверяет версию файла (время
+изменения и размер) с версией на момент чтения: файл, измененный другим
+экземпляром программы, не перезаписывается. Чтение файлов блокировку не
+использует. При подключенной общей папке настроек (модуль shared_settings)
+save также сверяет версию файла в общей папке (функция remote_save).
+
+Модуль содержит классы:
+- FileLock - рекомендательная блокировка файла между процессами;
+- ConfigWriter - атомарная отложенная запись файлов конфигурации.
+
+Также модуль содержит общий экземпляр config_writer.
+"""
+
+import _thread
+import atexit
+import io
+import os
+import time
+
+from app_logger import AppLogger
+from lazy_import import lazy_import
+
+# Модули загружаются при первой отложенной записи / копировании файла
+shutil = lazy_import('shutil')
+threading = lazy_import('threading')
+if os.name == 'nt':
+    msvcrt = lazy_import('msvcrt')
+else:
+    fcntl = lazy_import('fcntl')
+
+
+class FileLock:
+    """
+    Класс рекомендательной (advisory) блокировки файла между процессами.
+    Блокируется файл-метка {path}.lock рядом с файлом (msvcrt.locking в
+    Windows, fcntl.flock в остальных системах), поэтому блокировка
+    действует и для файлов в сетевой папке. Блокировку соблюдают только
+    операции записи, чтение файла не блокируется.
+
+    Пример использования:
+    with FileLock(path):
+        config_writer.atomic_write(path, text)
+    """
+    # Наибольшее ожидание блокировки, с
+    timeout = 5.0
+    # Пауза между попытками получения блокировки, с
+    retry = 0.05
+
+    def __init__(self, path: str) -> None:
+        """
+        Инициализация блокировки.
+        :param path: Путь к блокируемому файлу
+        """
+        self.lock_path = f'{path}.lock'
+        self.file = None
+
+    def __enter__(self):
+        """
+        Получение блокировки (с ожиданием не дольше timeout).
+        :return: Блокировка.
+        """
+        self.file = open(self.lock_path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if os.name == 'nt':
+                    self.file.seek(0)
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(self.file.fileno(),
+                                fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self.file.close()
+                    raise TimeoutError(
+                        f'Файл {self.lock_path[:-5]} занят другим '
+                        f'экземпляром программы.')
+                time.sleep(self.retry)
+
+    def __exit__(self, *args) -> None:
+        """
+        Снятие блокировки.
+        """
+        try:
+            if os.name == 'nt':
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.file.close()
+
+
+class ConfigWriter:
+    """
+    Класс атомарной отложенной записи файлов конфигурации.
+
+    Содержит методы: write, save, flush, read, copy, notify, get_state,
+    atomic_write.
+
+    Список listeners - функции, вызываемые с путем к файлу после его
+    записи (например, передача файла в общую папку настроек). Функция
+    remote_save вызывается методом save перед записью файла.
+
+    Пример использования:
+    config_writer.write(path, config)  # Запись в фоне после паузы
+    state = config_writer.save(path, config, state)  # Запись с проверкой
+    config_writer.read(config, path)   # Чтение с учетом ожидающей записи
+    config_writer.flush()              # Немедленная запись всех файлов
+    """
+    # Пауза в сохранениях, после которой выполняется запись, с
+    delay = 0.3
+
+    def __init__(self) -> None:
+        """
+        Инициализация очереди записи "Путь - содержимое файла". Блокировки
+        создаются модулем _thread: модуль threading импортируется долго.
+        """
+        self.pending = dict()
+        self.timer = None
+        # Защита очереди и таймера
+        self.lock = _thread.allocate_lock()
+        # Порядок записи файлов (запись одного файла из разных потоков)
+        self.write_lock = _thread.allocate_lock()
+        # Функции, вызываемые после записи файла
+        self.listeners = list()
+        # Функция записи файла в общую папку настроек (путь, содержимое)
+        # -> bool: False - файл в общей папке изменен (конфликт)
+        self.remote_save = None
+
+    def write(self, path: str, config) -> None:
+        """
+        Метод отложенной записи конфигурации в файл. Содержимое
+        конфигурации запоминается сразу, повторное сохранение того же
+        файла до записи заменяет ожидающее содержимое.
+        :param path: Путь к файлу
+        :param config: Конфигурация (configparser.ConfigParser)
+        """
+        buffer = io.StringIO()
+        config.write(buffer)
+        with self.lock:
+            self.pending[path] = buffer.getvalue()
+            if self.timer is None:
+                self.timer = threading.Timer(self.delay, self.flush_pending)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def save(self, path: str, config, state: tuple | None) -> tuple | None:
+        """
+        Метод немедленной записи конфигурации с проверкой версии файла
+        (оптимистичная блокировка): под блокировкой FileLock текущее
+        состояние файла сравнивается с состоянием на момент его чтения,
+        затем файл записывается в общую папку настроек (remote_save).
+        :param path: Путь к файлу
+        :param config: Конфигурация (configparser.ConfigParser)
+        :param state: Состояние файла при чтении (get_state)
+        :return: Новое состояние файла или None, если файл изменен после
+        чтения или изменен в общей папке (файл не записывается).
+        :raises TimeoutError: Файл записывает другой экземпляр программы.
+        """
+        buffer = io.StringIO()
+        config.write(buffer)
+        self.flush(path)
+        with FileLock(path):
+            with self.write_lock:
+                if self.get_state(path) != state:
+                    return None
+                if (self.remote_save is not None and
+                        not self.remote_save(path, buffer.getvalue())):
+                    return None
+                self.atomic_write(path, buffer.getvalue())
+                new_state = self.get_state(path)
+        self.notify(path)
+        return new_state
+
+    def flush_pending(self) -> None:
+        """
+        Метод записи ожидающих файлов по истечении паузы (фоновый поток).
+        """
+        with self.lock:
+            self.timer = None
+        self.flush()
+
+    def flush(self, path: str | None = None) -> None:
+        """
+        Метод немедленной записи ожидающих файлов. Ошибка записи
+        записывается в лог, а содержимое остается в очереди (если его не
+        заменило более новое) для повторной попытки.
+        :param path: Путь к файлу (по умолчанию - все ожидающие файлы)
+        """
+        with self.write_lock:
+            with self.lock:
+                if path is None:
+                    items = list(self.pending.items())
+                    self.pending.clear()
+                elif path in self.pending:
+                    items = [(path, self.pending.pop(path))]
+                else:
+                    return
+            for file_path, text in items:
+                try:
+                    with FileLock(file_path):
+                        self.atomic_write(file_path, text)
+                    self.notify(file_path)
+                except OSError as e:
+                    with self.lock:
+                        self.pending.setdefault(file_path, text)
+                    AppLogger(
+                        'ConfigWriter.flush',
+                        'error',
+                        f'Файл конфигурации {file_path} не записан: {e}',
+                        info=True
+                    )
+
+    def read(self, config, path: str) -> None:
+        """
+        Метод чтения файла конфигурации (после записи ожидающего
+        содержимого этого файла).
+        :param config: Конфигурация (configparser.ConfigParser)
+        :param path: Путь к файлу
+        """
+        self.flush(path)
+        config.read(path, encoding='utf-8')
+
+    def copy(self, source_path: str, destination_path: str) -> None:
+        """
+        Метод атомарной замены файла копией другого файла (сброс до
+        настроек "По-умолчанию"). Ожидающая запись заменяемого файла
+        отменяется.
+        :param source_path: Путь к копируемому файлу
+        :param destination_path: Путь к заменяемому файлу
+        """
+        with self.write_lock:
+            with self.lock:
+                self.pending.pop(destination_path, None)
+            temp_path = f'{destination_path}.{os.getpid()}.tmp'
+            try:
+                with FileLock(destination_path):
+                    shutil.copy2(source_path, temp_path)
+                    os.replace(temp_path, destination_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        self.notify(destination_path)
+
+    def notify(self, path: str) -> None:
+        """
+        Метод уведомления слушателей о записи файла.
+        :param path: Путь к записанному файлу
+        """
+        for listener in self.listeners:
+            listener(path)
+
+    @staticmethod
+    def get_state(path: str) -> tuple | None:
+        """
+        Метод получения состояния (версии) файла.
+        :param path: Путь к файлу
+        :return: Кортеж (время изменения, размер) или None, если файл не
+        найден.
+        """
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    @staticmethod
+    def atomic_write(path: str, text: str | bytes) -> None:
+        """
+        Метод атомарной записи файла: запись во временный файл в той же
+        папке, сброс на диск и замена исходного файла.
+        :param path: Путь к файлу
+        :param text: Содержимое файла (текст или двоичные данные)
+        """
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with (open(temp_path, 'wb') if isinstance(text, bytes) else
+                  open(temp_path, 'w', encoding='utf-8')) as file:
+                file.write(text)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+# Общий экземпляр записи файлов конфигурации программы
+config_writer = ConfigWriter()
+
+# Запись ожидающих файлов при завершении программы
+atexit.register(config_writer.flush)
@@ -0,0 +1,76 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль является точкой входа в расчетное ядро программы для скриптов и
+сервисов (пакетный расчет, HTTP-сервис, интеграции). Ядро образуют модули
+calculations, materials, nesting, bmp_read, settings_configuration и
+pricing: они не импортируют графический интерфейс (tkinter), а модули
+стандартной библиотеки для чтения конфигурации и записи в лог загружаются
+при первом обращении (модуль lazy_import). Графический интерфейс (main.py,
+child_*_window.py) зависит от ядра, ядро от интерфейса - нет.
+
+Классы ядра загружаются при первом обращении к ним, поэтому импорт модуля
+занимает доли миллисекунды.
+
+Пример использования:
+import core
+engine = core.PricingEngine(core.PricingConfig.from_snapshot(
+    core.ConfigSnapshot.get_snapshot()))
+"""
+
+import importlib
+
+
+# Публичные классы и функции ядра: имя -> модуль
+_exports = {
+    'RatioArea': 'calculations',
+    'PiecewiseRatio': 'calculations',
+    'MonotoneSpline': 'calculations',
+    'DeepEngraving': 'calculations',
+    'Materials': 'materials',
+    'Interpolation': 'materials',
+    'ContainerPacking': 'materials',
+    'OrderPacking': 'materials',
+    'MaterialComparison': 'materials',
+    'QuantityBreaks': 'materials',
+    'best_packing': 'nesting',
+    'MonochromeBMP': 'bmp_read',
+    'ConfigSet': 'settings_configuration',
+    'StandardSet': 'settings_configuration',
+    'DepthSet': 'settings_configuration',
+    'ProfileSet': 'settings_configuration',
+    'ConfigSnapshot': 'settings_configuration',
+    'SettingsFileError': 'settings_configuration',
+    'PersonalOrder': 'pricing',
+    'PricingConfig': 'pricing',
+    'PricingEngine': 'pricing',
+    'SheetOrder': 'pricing',
+    'SheetMaterialEngine': 'pricing',
+    'IndustrialEngine': 'pricing',
+    'round_cost': 'pricing',
+    'parse_order': 'pricing',
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name: str):
+    """
+    Функция загрузки класса (функции) ядра при первом обращении.
+    :param name: Имя класса или функции
+    :return: Класс или функция ядра.
+    """
+    if name not in _exports:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """
+    Функция получения списка имен модуля (с учетом отложенных имен).
+    :return: Список имен.
+    """
+    return sorted(set(globals()) | set(__all__))
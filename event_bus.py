@@ -0,0 +1,168 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует механизм уведомлений об изменении данных программы по
+схеме "издатель-подписчик". Классы, изменяющие данные (базу листового
+материала, файлы конфигурации, список дополнительных ресурсов), публикуют
+событие, а элементы интерфейса, которые отображают эти данные,
+подписываются на него и обновляются только при реальном изменении данных,
+без повторного чтения файлов на каждое действие пользователя (фокус,
+наведение курсора).
+
+Модуль содержит классы:
+- EventBus - шина событий (публикация и подписка);
+- FileWatcher - отслеживание изменений файлов по времени модификации (для
+изменений, внесенных вне программы).
+
+Также модуль содержит общий экземпляр шины событий event_bus и названия
+событий (тем).
+"""
+
+import os
+
+from app_logger import AppLogger
+from config_writer import config_writer
+from path_getting import PathName
+
+
+# Изменение базы листового материала (material_data.ini)
+MATERIALS_CHANGED = 'materials'
+
+# Изменение файлов конфигурации. Название события совпадает с именем файла
+# (Configuration.file_name), поэтому классы работы с файлами конфигурации
+# публикуют событие по имени своего файла.
+# Основные настройки программы (settings.ini)
+SETTINGS_CHANGED = 'settings'
+# Список стандартных работ (standard.ini)
+STANDARD_CHANGED = 'standard'
+# Режимы глубокой гравировки (deep_engraving.ini)
+DEPTH_CHANGED = 'deep_engraving'
+# Список дополнительных ресурсов (url_data.ini)
+URLS_CHANGED = 'url_data'
+# Профили цен (profiles.ini)
+PROFILES_CHANGED = 'profiles'
+
+
+class EventBus:
+    """
+    Класс шины событий. Подписчик получает название события в качестве
+    единственного аргумента (аналогично обработчикам событий tkinter).
+
+    Содержит методы: subscribe, unsubscribe, publish.
+
+    Пример использования:
+    event_bus.subscribe(MATERIALS_CHANGED, self.bind_update_base)
+    event_bus.publish(MATERIALS_CHANGED)
+    """
+    def __init__(self) -> None:
+        """
+        Инициализация словаря подписчиков "Событие - список обработчиков".
+        """
+        self.subscribers = dict()
+
+    def subscribe(self, topic: str, callback) -> None:
+        """
+        Метод подписки на событие.
+        :param topic: Название события;
+        :param callback: Обработчик события.
+        """
+        callbacks = self.subscribers.setdefault(topic, list())
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def unsubscribe(self, topic: str, callback) -> None:
+        """
+        Метод отмены подписки на событие.
+        :param topic: Название события;
+        :param callback: Обработчик события.
+        """
+        callbacks = self.subscribers.get(topic, list())
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, topic: str) -> None:
+        """
+        Метод публикации события. Исключение в одном обработчике не мешает
+        вызову остальных.
+        :param topic: Название события.
+        """
+        for callback in list(self.subscribers.get(topic, list())):
+            try:
+                callback(topic)
+            except Exception as e:
+                AppLogger(
+                    'EventBus.publish',
+                    'error',
+                    f'При обработке события "{topic}" возникло исключение: '
+                    f'{e}',
+                    info=True
+                )
+
+
+class FileWatcher:
+    """
+    Класс отслеживания изменений файлов конфигурации по времени модификации
+    и размеру. Используется для обнаружения изменений, внесенных вне
+    программы (например, ручное редактирование файла). Наблюдатель
+    подписан на свое событие: изменения, о которых уже сообщила сама
+    программа, повторно не публикуются.
+
+    Содержит методы: get_state, sync, check.
+
+    Пример использования:
+    watcher = FileWatcher(MATERIALS_CHANGED, ['settings\\material_data.ini'])
+    watcher.check()  # Публикует событие, если файл изменился
+    """
+    def __init__(self, topic: str, relative_paths: list,
+                 bus: EventBus | None = None) -> None:
+        """
+        Инициализация отслеживаемых файлов.
+        :param topic: Событие, публикуемое при изменении файлов;
+        :param relative_paths: Список относительных путей к файлам;
+        :param bus: Шина событий (по умолчанию - общая шина программы).
+        """
+        self.topic = topic
+        self.paths = [PathName.resource_path(x) for x in relative_paths]
+        self.bus = bus if bus else event_bus
+        self.state = self.get_state()
+        self.bus.subscribe(topic, self.sync)
+
+    def get_state(self) -> tuple:
+        """
+        Метод получения текущего состояния файлов.
+        :return: Кортеж (время модификации, размер) для каждого файла.
+        """
+        state = list()
+        for path in self.paths:
+            config_writer.flush(path)
+            try:
+                stat = os.stat(path)
+                state.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                state.append(None)
+        return tuple(state)
+
+    def sync(self, event=None) -> None:
+        """
+        Метод запоминания текущего состояния файлов без публикации события
+        (после изменений, о которых подписчики уже уведомлены).
+        :param event: Событие изменения файлов (при вызове шиной событий).
+        """
+        self.state = self.get_state()
+
+    def check(self) -> bool:
+        """
+        Метод проверки изменения файлов. При изменении публикуется событие.
+        :return: True - если файлы изменились, иначе False.
+        """
+        state = self.get_state()
+        if state == self.state:
+            return False
+        self.state = state
+        self.bus.publish(self.topic)
+        return True
+
+
+# Общая шина событий программы
+event_bus = EventBus()
@@ -0,0 +1,57 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует отложенный импорт модулей стандартной библиотеки. Модуль
+импортируется при первом обращении к его атрибуту, а не при импорте
+расчетных модулей программы (ядра), поэтому ядро импортируется быстро, а,
+например, модуль logging загружается только при первой записи в лог.
+
+Модуль содержит класс:
+- LazyModule - заместитель модуля, импортирующий его при первом обращении.
+
+Также модуль содержит функцию lazy_import.
+"""
+
+import importlib
+
+
+class LazyModule:
+    """
+    Класс-заместитель модуля. При первом обращении к атрибуту модуль
+    импортируется (importlib.import_module - безопасно при обращении из
+    нескольких потоков), далее обращения передаются модулю. Заместитель не
+    помещается в sys.modules, поэтому обычный импорт того же модуля в
+    других файлах не затрагивается.
+
+    Пример использования:
+    logging = LazyModule('logging')
+    logger = logging.getLogger(name)
+    """
+    def __init__(self, name: str) -> None:
+        """
+        Инициализация заместителя.
+        :param name: Имя модуля
+        """
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute: str):
+        """
+        Метод получения атрибута модуля (с импортом при первом обращении).
+        :param attribute: Имя атрибута
+        :return: Атрибут модуля.
+        """
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attribute)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Функция отложенного импорта модуля.
+    :param name: Имя модуля
+    :return: Заместитель модуля.
+    """
+    return LazyModule(name)
@@ -49,8 +49,8 @@ window.run()
 
 """
 
+from dataclasses import asdict
 import os
-from math import ceil
 from textwrap import wrap
 
 import tkinter as tk
@@ -62,13 +62,25 @@ from app_logger import AppLogger
 from binds import BindEntry
 from binds import BalloonTips
 from bmp_read import MonochromeBMP
-from calculations import RatioArea
-from child_config_window import ChildConfigSet, ConfigSet, StandardSet
+from child_analysis_window import ChildCompareMaterials, ChildQuantityBreaks
+from child_config_window import ChildConfigSet
 from child_materials_window import ChildMaterials
+from child_order_window import ChildOrderPacking, ChildRemnants
 from child_power_set_window import ChildPowerSet
-from materials import Materials, Interpolation, ContainerPacking
+from config_writer import config_writer
+from event_bus import (event_bus, FileWatcher, DEPTH_CHANGED,
+                       MATERIALS_CHANGED, PROFILES_CHANGED, SETTINGS_CHANGED,
+                       STANDARD_CHANGED, URLS_CHANGED)
+from materials import ContainerPacking, MaterialComparison
 from path_getting import PathName
+from pricing import (IndustrialEngine, PersonalOrder, PricingConfig,
+                     PricingEngine, SheetMaterialEngine, SheetOrder,
+                     round_cost)
+from quote_journal import quote_journal
+from remnants import RemnantInventory
 from resources_links import OpenUrl
+from settings_configuration import ConfigSnapshot
+from shared_settings import shared_settings
 
 
 class App(tk.Tk):
@@ -78,9 +90,12 @@ class App(tk.Tk):
     главного окна.
 
     Содержит методы: round_result, add_binds, add_tips,
-    get_return_by_keyboard, run, destroy_window.
+    get_return_by_keyboard, watch_config, run, destroy_window.
 
     """
+    # Период проверки изменений файлов конфигурации вне программы, мс
+    watch_period = 2000
+
     def __init__(self):
         """
         Конфигурация главного окна приложения.
@@ -114,9 +129,11 @@ class App(tk.Tk):
         # Переменная для bind методов
         self.not_use = None
 
-        # Переменные основных настроек (конфигурации) программы
-        self.main_settings = ConfigSet().config
-        self.standard_works = StandardSet().config
+        # Общая папка настроек рабочих мест (если указана в shared.ini)
+        shared_settings.setup()
+
+        # Снимок основных настроек (конфигурации) программы
+        self.config_snapshot = ConfigSnapshot.get_snapshot()
 
         # Создание основных вкладок
         self.tabs_control = ttk.Notebook(self)
@@ -124,14 +141,14 @@ class App(tk.Tk):
             self.tabs_control,
             self.round_result,
             self.destroy_window,
-            (self.main_settings, self.standard_works))
+            self.config_snapshot)
         self.tab_sheet_material = SheetMaterialsTab(
             self.tabs_control,
             self.round_result)
         self.tab_industrial_calculator = IndustrialCalculateTab(
             self.tabs_control,
             self.round_result,
-            self.main_settings)
+            self.config_snapshot)
 
         # Добавление вкладок в набор
         self.tabs_control.add(self.tab_personal_calculate,
@@ -161,14 +178,7 @@ class App(tk.Tk):
         :param cost: Число, передаваемое для округления.
         :return: Округленное число
         """
-        if cost >= 800:
-            return int(round(cost/50) * 50)
-        elif 250 <= cost < 800:
-            return int(round(cost/10) * 10)
-        elif 85 <= cost < 250:
-            return int(round(cost/5) * 5)
-        else:
-            return int(cost)
+        return round_cost(cost)
 
     def add_binds(self) -> None:
         """
@@ -187,6 +197,29 @@ class App(tk.Tk):
         self.tab_personal_calculate.add_binds()
         self.tab_sheet_material.add_binds()
 
+        # Отслеживание изменений файлов конфигурации, внесенных вне
+        # программы (изменения из окон программы публикуются сразу)
+        self.config_watchers = [
+            FileWatcher(topic, [f'settings\\{topic}.ini'])
+            for topic in (SETTINGS_CHANGED, STANDARD_CHANGED, DEPTH_CHANGED,
+                          URLS_CHANGED, PROFILES_CHANGED)
+        ]
+        self.after(self.watch_period, self.watch_config)
+
+    def watch_config(self) -> None:
+        """
+        Метод периодической проверки файлов конфигурации на изменения,
+        внесенные вне программы. При изменении файла публикуется событие
+        его изменения. Также показываются сообщения о конфликтах сверки с
+        общей папкой настроек.
+        """
+        for watcher in self.config_watchers:
+            watcher.check()
+        # Конфликты сверки с общей папкой настроек
+        for message in shared_settings.pop_conflicts():
+            tk.messagebox.showwarning('Конфликт файлов настроек', message)
+        self.after(self.watch_period, self.watch_config)
+
     def add_tips(self) -> None:
         """
         Метод добавления подсказок к элементам интерфейса.
@@ -224,6 +257,8 @@ class App(tk.Tk):
         """
         if askokcancel('Выход', 'Вы действительно хотите выйти?'):
             self.destroy()
+            # Запись ожидающих изменений файлов конфигурации
+            config_writer.flush()
 
 
 class AppMenu(tk.Menu):
@@ -232,11 +267,13 @@ class AppMenu(tk.Menu):
     Также класс связывает главное окно программы с дочерними окнами:
     - предварительной настройки программы;
     - настройки списка листового материала с параметрами;
+    - раскроя заказа на листы материала и склада обрезков;
     - расчетов глубокой гравировки.
 
     Содержит методы: draw_menu, update_url_set, run_child_materials,
-    run_child_power, run_child_settings, open_resource, get_url_menu_data,
-    open_guide, open_help, add_binds, watch_log.
+    run_child_order, run_child_remnants, run_child_power, run_child_settings,
+    open_resource, get_url_menu_data, open_guide, open_help, add_binds,
+    watch_log.
     """
     def __init__(self, parent, theme: str, destroy_method,
                  update_method) -> None:
@@ -287,6 +324,10 @@ class AppMenu(tk.Menu):
                                    command=self.run_child_settings)
         self.file_menu.add_command(label='Листовой материал',
                                    command=self.run_child_materials)
+        self.file_menu.add_command(label='Раскрой заказа',
+                                   command=self.run_child_order)
+        self.file_menu.add_command(label='Склад обрезков',
+                                   command=self.run_child_remnants)
         self.file_menu.add_command(label='Глубокая гравировка',
                                    command=self.run_child_power)
         self.file_menu.add_command(label='Просмотр расчетов',
@@ -319,8 +360,7 @@ class AppMenu(tk.Menu):
         """
         Метод обновления файла конфигурации дополнительных ресурсов после
         внесения изменений в окне предварительной настройки.
-        :param event: Событие (возвращение фокуса на вкладку после закрытия
-        окна предварительной настройки)
+        :param event: Событие изменения списка дополнительных ресурсов
         """
         try:
             # Обновляем переменную конфигурации
@@ -370,6 +410,53 @@ class AppMenu(tk.Menu):
                 f"прорисоваться / сформировать подсказки или фоновый текст."
             )
 
+    def run_child_order(self) -> None:
+        """
+        Открытие дочернего окна раскроя заказа из изделий разных габаритов
+        на листы выбранного материала.
+        """
+        try:
+            child = ChildOrderPacking(
+                self,
+                700,
+                550,
+                theme=self.theme,
+                icon=PathName.resource_path("resources\\Company_logo.ico")
+            )
+            child.grab_focus()
+        except tk.TclError as e:
+            AppLogger(
+                'AppMenu.run_child_order',
+                'warning',
+                f"При упаковке дочернего окна раскроя заказа возникло "
+                f"исключение {e}: Окно было закрыто слишком быстро. Виджеты "
+                f"не успели прорисоваться / сформировать подсказки или "
+                f"фоновый текст."
+            )
+
+    def run_child_remnants(self) -> None:
+        """
+        Открытие дочернего окна склада обрезков листового материала.
+        """
+        try:
+            child = ChildRemnants(
+                self,
+                600,
+                450,
+                theme=self.theme,
+                icon=PathName.resource_path("resources\\Company_logo.ico")
+            )
+            child.grab_focus()
+        except tk.TclError as e:
+            AppLogger(
+                'AppMenu.run_child_remnants',
+                'warning',
+                f"При упаковке дочернего окна склада обрезков возникло "
+                f"исключение {e}: Окно было закрыто слишком быстро. Виджеты "
+                f"не успели прорисоваться / сформировать подсказки или "
+                f"фоновый текст."
+            )
+
     def run_child_power(self) -> None:
         """
         Открытие дочернего окна подбора режимов для выбранного изделия
@@ -441,7 +528,7 @@ class AppMenu(tk.Menu):
         # Создаем выпадающий список-подменю "Дополнительные ресурсы"
         resources_list = list()
         # Создаем список названий ресурсов для подменю
-        for key in self.url_settings.url_config['MAIN'].keys():
+        for key in self.url_settings.get_url_dict():
             resources_list.append(key.capitalize())
         # Устанавливаем для каждого элемента команду
         for i in range(len(resources_list)):
@@ -500,7 +587,8 @@ class AppMenu(tk.Menu):
         Метод открытия временного файла лога с расчётами
         """
         try:
-            # Считываем данные расчётов из лога
+            # Ожидаем записи расчетов из очереди лога и считываем их
+            AppLogger.flush()
             with open(PathName.resource_path("log/calculation/calc_log.log"),
                       'r', encoding='utf-8') as log_calc:
                 temp_data = log_calc.read().split("\n\n")
@@ -541,11 +629,10 @@ class AppMenu(tk.Menu):
 
     def add_binds(self) -> None:
         """
-        Связывание действий пользователя в интерфейсе приложения с командами
-        (фокус в окне - обновление списка).
+        Подписка на изменение списка дополнительных ресурсов (меню
+        обновляется только после изменения файла url_data.ini).
         """
-
-        self.parent.bind("<FocusIn>", self.update_url_set)
+        event_bus.subscribe(URLS_CHANGED, self.update_url_set)
 
 
 class PersonalCalculateTab(ttk.Frame):
@@ -554,19 +641,19 @@ class PersonalCalculateTab(ttk.Frame):
     На вкладке осуществляется расчет стоимости типовых изделий, а также
     изделий с учетом сложности работы (выставляется весовыми коэффициентами).
 
-    Содержит методы: disable_taxation, settings_update, main_calculation,
-    get_ratio_for_calculation, add_new_calc, reset_tab_mian_calculate,
+    Содержит методы: disable_taxation, settings_update, select_profile,
+    main_calculation, get_order, add_new_calc, reset_tab_mian_calculate,
     reset_results, add_tips, add_binds, bind_spins.
     """
-    def __init__(self, parent, round_method, destroy_method, settings: tuple):
+    def __init__(self, parent, round_method, destroy_method,
+                 settings: ConfigSnapshot):
         """
         Конфигурация и прорисовка первой вкладки основного окна приложения
         "Частные лица".
         :param parent: Экземпляр-родитель Notebook
         :param round_method: Метод округления результата (из класса App)
         :param destroy_method: Метод закрытия приложения (из класса App)
-        :param settings: Кортеж: (Настройки программы, Список
-        стандартных работ)
+        :param settings: Снимок настроек программы (ConfigSnapshot)
         """
         # Инициализация и конфигурация отзывчивости вкладки
         super().__init__(parent)
@@ -580,9 +667,12 @@ class PersonalCalculateTab(ttk.Frame):
         self.round_method = round_method
         self.destroy_method = destroy_method
 
-        # Переменная настроек (конфигурации) программы
-        self.main_settings = settings[0]
-        self.standard_works_costs = settings[1]
+        # Снимок настроек (конфигурации) программы
+        self.config_snapshot = settings
+
+        # Снимки профилей цен и название выбранного профиля
+        self.profiles = ConfigSnapshot.get_profiles()
+        self.profile_name = ConfigSnapshot.default_profile
 
         # Переменные для переключателей выбора типа и сложности расчета
         self.bool_rotation = tk.BooleanVar(value=False)
@@ -607,36 +697,18 @@ class PersonalCalculateTab(ttk.Frame):
         self.past_cost_text = ''
         self.present_cost = 0
         self.cost_design = 0
-        self.additional_cost = 0
-        self.ratio_laser = 1
-        self.ratio_rotation = 1
-        self.ratio_different_layouts = 1
-        self.ratio_timing = 1
-        self.ratio_packing = 1
-        self.ratio_thermal_graving = 1
-        self.ratio_oversize = 1
-        self.ratio_numbering = 1
-        self.ratio_taxation_ao = 1
-        self.ratio_taxation_ip = 1
-        self.ratio_attention = 1
-        self.ratio_hand_job = 1
-        self.ratio_docking = 1
-        self.ratio_many_items = 1
-        self.ratio_difficult = 1
-        self.ratio_depth = 1
-        self.ratio_discount = 1
-        self.ratio_taxation = 1
-        self.ratio_size = 1
-        self.ratio_one_set = 1
+
+        # Механизмы расчета профилей цен (создаются при первом расчете по
+        # профилю и пересоздаются при смене версии снимка настроек)
+        self.pricing_engines = dict()
 
         # Переменная для добавления событий
         self.not_use = None
 
         # Размерность блоков ввода градационных сложностей
         self.gradation_difficult_max = len(
-            self.main_settings['GRADATION']['difficult'].split(','))
-        self.gradation_depth_max = len(
-            self.main_settings['GRADATION']['depth'].split(','))
+            self.config_snapshot.gradation_difficult)
+        self.gradation_depth_max = len(self.config_snapshot.gradation_depth)
 
         # Создание формы для виджетов основного расчета
         self.panel_main_widgets = ttk.Frame(self, padding=(0, 0, 0, 0))
@@ -698,10 +770,7 @@ class PersonalCalculateTab(ttk.Frame):
         # Создание выпадающего списка стандартных изделий
         ttk.Label(self.panel_main_widgets, text="Стандартное изделие:").grid(
             row=0, column=0, padx=15, pady=0, sticky='ew')
-        self.combo_list = list()
-        self.combo_list.append('Нет')
-        for k, v in self.standard_works_costs['STANDARD'].items():
-            self.combo_list.append(k)
+        self.combo_list = ['Нет', *self.config_snapshot.standard_costs]
 
         self.combo_products = ttk.Combobox(
             self.panel_main_widgets,
@@ -713,6 +782,20 @@ class PersonalCalculateTab(ttk.Frame):
         self.combo_products.grid(row=0, column=1, padx=10, pady=0,
                                  sticky="nsew", columnspan=1)
 
+        # Создание выпадающего списка профилей цен
+        ttk.Label(self.panel_main_widgets, text="Профиль цен:").grid(
+            row=2, column=0, padx=15, pady=5, sticky='ew')
+        self.combo_profiles = ttk.Combobox(
+            self.panel_main_widgets,
+            values=list(self.profiles),
+            width=20,
+            state='readonly',
+            takefocus=False
+        )
+        self.combo_profiles.set(self.profile_name)
+        self.combo_profiles.grid(row=2, column=1, padx=10, pady=5,
+                                 sticky="nsew", columnspan=1)
+
         # Создание переключателей выбора оборудования
         self.rbt_solid = ttk.Radiobutton(
             self.panel_main_widgets,
@@ -1038,36 +1121,54 @@ class PersonalCalculateTab(ttk.Frame):
         """
         Метод обновления вкладки. Здесь осуществляется обновление
         переменной конфигурации программы. Реализуется после изменения
-        настроек приложения.
-        :param event: Возвращение фокуса на вкладку после закрытия окна
-        предварительной настройки.
-        """
-        # Обновление переменной конфигурации
-        self.main_settings = ConfigSet().config
-        self.standard_works_costs = StandardSet().config
-
-        # Обновление данных в таблице
-        self.combo_list = list()
-        self.combo_list.append('Нет')
-        for k, v in self.standard_works_costs['STANDARD'].items():
-            self.combo_list.append(k)
-        self.combo_products.configure(values=self.combo_list)
-
-        # Устанавливается размерность блоков ввода градационных сложностей
-        self.gradation_difficult_max = len(
-            self.main_settings['GRADATION']['difficult'].split(','))
-        self.gradation_depth_max = len(
-            self.main_settings['GRADATION']['depth'].split(','))
-        self.spin_difficult.config(to=self.gradation_difficult_max)
-        self.spin_depth.config(to=self.gradation_depth_max)
+        настроек приложения: обновляется только та часть вкладки, которая
+        зависит от измененного файла.
+        :param event: Событие изменения файла конфигурации
+        (SETTINGS_CHANGED, STANDARD_CHANGED, PROFILES_CHANGED) или нажатие
+        "Обновить" в меню (обновляется вся вкладка).
+        """
+        # Обновление снимков профилей цен (файлы читаются только при
+        # изменении). Удаленный из profiles.ini профиль заменяется основным
+        self.profiles = ConfigSnapshot.get_profiles()
+        if self.profile_name not in self.profiles:
+            self.profile_name = ConfigSnapshot.default_profile
+        self.combo_profiles.configure(values=list(self.profiles))
+        self.combo_profiles.set(self.profile_name)
+
+        # Обновление списка стандартных изделий
+        if event not in (SETTINGS_CHANGED, PROFILES_CHANGED):
+            self.combo_list = ['Нет', *self.profiles[self.profile_name]
+                               .standard_costs]
+            self.combo_products.configure(values=self.combo_list)
+
+        # Обновление снимка настроек выбранного профиля
+        self.select_profile()
 
         # Обновление вкладки
         self.not_use = event
         self.update()
 
+    def select_profile(self, event=None) -> None:
+        """
+        Метод выбора профиля цен: используется готовый снимок профиля,
+        файлы конфигурации не читаются. Устанавливается размерность блоков
+        ввода градационных сложностей профиля.
+        :param event: Событие выбора профиля в выпадающем списке
+        """
+        self.profile_name = self.combo_profiles.get()
+        self.config_snapshot = self.profiles[self.profile_name]
+        self.gradation_difficult_max = len(
+            self.config_snapshot.gradation_difficult)
+        self.gradation_depth_max = len(self.config_snapshot.gradation_depth)
+        self.spin_difficult.config(to=self.gradation_difficult_max)
+        self.spin_depth.config(to=self.gradation_depth_max)
+        self.not_use = event
+
     def main_calculation(self) -> None:
         """
-        Метод основного и углубленного расчета.
+        Метод основного и углубленного расчета. Расчет выполняет механизм
+        PricingEngine (модуль pricing), вкладка передает ему параметры
+        заказа и выводит результат.
 
         Формула имеет следующий вид:
             Итоговая цена = (дополнительные прицелы +
@@ -1075,30 +1176,21 @@ class PersonalCalculateTab(ttk.Frame):
             * учет количества изделий * учет количества в одной установке
         """
         try:
-            # Формирование начальной стоимости
-            if self.combo_products.get() == "Нет":  # Если не выбрано изделие
-                cost = int(self.main_settings["MAIN"]["min_cost"])
-            else:  # Если выбрано стандартное изделие
-                cost = int(
-                    self.standard_works_costs["STANDARD"][
-                        self.combo_products.get()]
-                )
-
-            # Получение данных для коэффициентов
-            self.get_ratio_for_calculation()
+            # Механизм расчета профиля создается заново только при смене
+            # версии снимка настроек
+            engine = self.pricing_engines.get(self.profile_name)
+            if (engine is None or
+                    engine.config.version != self.config_snapshot.version):
+                engine = PricingEngine(
+                    PricingConfig.from_snapshot(self.config_snapshot))
+                self.pricing_engines[self.profile_name] = engine
 
             # Расчет основной стоимости
-            main_cost = ((self.additional_cost + (cost * (
-                    self.ratio_laser * self.ratio_rotation *
-                    self.ratio_different_layouts * self.ratio_timing *
-                    self.ratio_packing * self.ratio_thermal_graving *
-                    self.ratio_oversize * self.ratio_numbering *
-                    self.ratio_attention * self.ratio_hand_job *
-                    self.ratio_docking * self.ratio_difficult *
-                    self.ratio_depth * self.ratio_size)))
-                         * self.ratio_taxation_ao * self.ratio_taxation_ip *
-                         self.ratio_many_items * self.ratio_one_set *
-                         self.ratio_discount)
+            order = self.get_order()
+            breakdown = engine.price(order)
+            main_cost = breakdown.cost
+            self.cost_design = breakdown.design_cost
+
             # Вывод результатов стоимости гравировки
             self.lbl_result_grav.config(
                 text=f"Стоимость гравировки:"
@@ -1112,8 +1204,7 @@ class PersonalCalculateTab(ttk.Frame):
             )
 
             # Полная стоимость с учетом макетирования
-            all_cost = (self.round_method(main_cost) *
-                        int(self.spin_number.get()) + self.cost_design)
+            all_cost = breakdown.get_total(self.round_method)
             # Вывод результатов полной стоимости для текущего расчета
             self.lbl_present_results.config(
                 text=f"Текущий расчет = {all_cost:_.0f} руб.".replace(
@@ -1133,9 +1224,9 @@ class PersonalCalculateTab(ttk.Frame):
             # Считываем параметры расчёта, сохраняемые в лог
             temp_params = ['']*4
             temp_params[0] = "Гравировка на плоскости." if (
-                    self.ratio_rotation == 1) else "Гравировка на вращателе."
+                    not order.rotation) else "Гравировка на вращателе."
             temp_params[1] = "Тип оборудования: Твердотельный лазер." if (
-                    self.ratio_laser == 1) else \
+                    order.laser_type != 2) else \
                 "Тип оборудования: Газовый лазер."
             temp_params[2] = (f"Количество изделий: {self.spin_number.get()} "
                               f"шт.")
@@ -1156,6 +1247,13 @@ class PersonalCalculateTab(ttk.Frame):
                 _______=self.lbl_result_design.cget('text'),
                 ________=self.lbl_result_cost.cget('text')
             )
+            # Сохраняем расчет в журнал расчетов
+            quote_journal.append(
+                'personal', asdict(order),
+                {**asdict(breakdown), 'total': all_cost,
+                 'grand_total': self.total_cost + self.present_cost},
+                self.config_snapshot, self.profile_name
+            )
         except Exception as e:
             AppLogger(
                 "PersonalCalculateTab.main_calculation",
@@ -1164,205 +1262,79 @@ class PersonalCalculateTab(ttk.Frame):
                 True
             )
 
-    def get_ratio_for_calculation(self) -> None:
+    def get_order(self) -> PersonalOrder:
         """
-        Метод формирования коэффициентов сложностей на основе получения
-        данных из пользовательского интерфейса.
+        Метод формирования параметров заказа на основе получения данных из
+        пользовательского интерфейса.
+        :return: Параметры заказа для механизма расчета.
         """
-        # Формирование значений коэффициентов
-        # Коэффициент ratio_size __Габариты гравировки__
+        # Габариты гравировки
         try:
-            size_list = (
-                self.main_settings['GRADATION']['area'].split(','))
-
-            if self.rb_type_of_laser.get() == 2:  # Для газового лазера
-                size_min = 150 * 100
-                size_max = 400 * 680
-                ratio_size_max = float(size_list[1])
-                temp_area = float(self.ent_height_grav.get()) * float(
-                    self.ent_width_grav.get())
-                self.ratio_size = RatioArea(
-                    size_min, size_max, ratio_size_max).get_polynomial_ratio(
-                    temp_area)
-            else:  # Для твердотельного лазера
-                size_min = 70 * 70
-                size_max = 200 * 200
-                ratio_size_max = float(size_list[0])
-                temp_area = float(self.ent_height_grav.get()) * float(
-                    self.ent_width_grav.get())
-                self.ratio_size = RatioArea(
-                    size_min, size_max, ratio_size_max).get_linear_ratio(
-                    temp_area)
-
+            width = float(self.ent_width_grav.get())
+            height = float(self.ent_height_grav.get())
         except ValueError as e:
-            self.ratio_size = 1
+            width = height = None
             AppLogger(
-                'PersonalCalculateTab.get_ratio_for_calculation',
+                'PersonalCalculateTab.get_order',
                 'warning',
                 f'При считывании габаритов гравировки возникло исключение'
                 f' "{e}", размеры указаны неверно, или не указаны вовсе -('
                 f'{self.ent_width_grav.get()}, {self.ent_height_grav.get()})'
             )
 
-        # Коэффициент ratio_laser __Тип лазера__
-        if self.rb_type_of_laser.get() == 2:  # Если газовый лазер
-            self.ratio_laser = float(self.main_settings[
-                                    "RATIO_SETTINGS"]["ratio_laser_gas"])
-        else:  # Если твердотельный лазер
-            self.ratio_laser = 1
-
-        # Коэффициент ratio_rotation __Вращатель__
-        if self.bool_rotation.get():  # Если гравировка с вращением
-            self.ratio_rotation = float(self.main_settings[
-                                       "RATIO_SETTINGS"]["ratio_rotation"])
-        else:  # Если гравировка без вращения
-            self.ratio_rotation = 1
-
-        # Коэффициент ratio_different_layouts __Разные макеты__
-        if self.bool_different.get() and (
-                int(self.spin_number.get()) > 1):  # Если разные макеты
-            self.ratio_different_layouts = float(
-                self.main_settings["RATIO_SETTINGS"][
-                    "ratio_different_layouts"])
-        else:  # Если один макет
-            self.ratio_different_layouts = 1
-
-        # Коэффициент ratio_timing __Срочность__
-        if self.bool_ratio_timing.get():
-            self.ratio_timing = float(self.main_settings["RATIO_SETTINGS"][
-                                     "ratio_timing"])
-        else:
-            self.ratio_timing = 1
-
-        # Коэффициент ratio_packing __Распаковка/Запаковка__
-        if self.bool_ratio_packing.get():
-            self.ratio_packing = float(self.main_settings["RATIO_SETTINGS"][
-                                      "ratio_packing"])
-        else:
-            self.ratio_packing = 1
-
-        # Коэффициент ratio_thermal_graving __Гравировка термовлиянием__
-        if self.bool_ratio_thermal_graving.get():
-            self.ratio_thermal_graving = float(self.main_settings[
-                                               "RATIO_SETTINGS"][
-                                              "ratio_thermal_graving"])
-        else:
-            self.ratio_thermal_graving = 1
-
-        # Коэффициент ratio_oversize __Негабаритное изделие__
-        if self.bool_ratio_oversize.get():
-            self.ratio_oversize = float(self.main_settings["RATIO_SETTINGS"][
-                                       "ratio_oversize"])
-        else:
-            self.ratio_oversize = 1
-
-        # Коэффициент ratio_numbering __Счетчик__
-        if self.bool_ratio_numbering.get() and (
-                int(self.spin_number.get()) > 1):
-            self.ratio_numbering = float(self.main_settings["RATIO_SETTINGS"][
-                                        "ratio_numbering"])
-        else:
-            self.ratio_numbering = 1
-
-        # Коэффициент ratio_taxation_ao __Оплата по счету ООО__
-        if self.bool_ratio_taxation_ao.get():
-            self.ratio_taxation_ao = float(
-                self.main_settings["RATIO_SETTINGS"][
-                    "ratio_taxation"].split(',')[0])
-        else:
-            self.ratio_taxation_ao = 1
-
-        # Коэффициент ratio_attention __Повышенное внимание__
-        if self.bool_ratio_attention.get():
-            self.ratio_attention = float(self.main_settings["RATIO_SETTINGS"][
-                                        "ratio_attention"])
-        else:
-            self.ratio_attention = 1
-
-        # Коэффициент ratio_hand_job __Ручные работы__
-        if self.bool_ratio_hand_job.get():
-            self.ratio_hand_job = float(self.main_settings["RATIO_SETTINGS"][
-                                       "ratio_hand_job"])
-        else:
-            self.ratio_hand_job = 1
-
-        # Коэффициент ratio_docking __Стыковка элементов__
-        if self.bool_ratio_docking.get() and int(self.spin_aim.get()) > 1:
-            self.ratio_docking = float(self.main_settings["RATIO_SETTINGS"][
-                                      "ratio_docking"])
-        else:
-            self.ratio_docking = 1
-
-        # Коэффициент ratio_taxation_ip __Оплата по счету ИП__
-        if self.bool_ratio_taxation_ip.get():
-            self.ratio_taxation_ip = float(
-                self.main_settings["RATIO_SETTINGS"][
-                    "ratio_taxation"].split(',')[1])
-        else:
-            self.ratio_taxation_ip = 1
-
-        # Дополнительная стоимость за количество установок
-        if int(self.spin_aim.get()) > 1:
-            self.additional_cost = (
-                    (int(self.spin_aim.get()) - 1) *
-                    int(self.main_settings["MAIN"]["additional_cost"]))
-        else:
-            self.additional_cost = 0
-
-        # Коэффициент зависимости от количества изделий
-        if int(self.spin_number.get()) == 1:  # Если изделие одно
-            self.ratio_many_items = 1
-        elif 1 < int(self.spin_number.get()) <= 5:  # До 5 изделий
-            self.ratio_many_items = 1 - (int(self.spin_number.get())/10)
-        else:  # Изделий больше 5
-            self.ratio_many_items = 0.85 * (int(self.spin_number.get()) ** (
-                -float(self.main_settings["MAIN"]["many_items"])))
-
-        # Коэффициент зависимости от количества изделий в установке
-        if int(self.spin_group.get()) == 1:
-            self.ratio_one_set = 1
-        else:
-            self.ratio_one_set = int(self.spin_group.get()) ** (
-                -float(self.main_settings["MAIN"]["one_set"]))
-
-        # Коэффициент сложности установки
-        difficult_list = (
-            self.main_settings['GRADATION']['difficult'].split(','))
-        self.ratio_difficult = float(
-            difficult_list[int(self.spin_difficult.get()) - 1])
-
-        # Коэффициент глубины гравировки
-        depth_list = self.main_settings['GRADATION']['depth'].split(
-            ',')
-        self.ratio_depth = float(
-            depth_list[int(self.spin_depth.get()) - 1])
-
         # Доплата за макетирование
         try:
-            self.cost_design = float(self.ent_design.get())
+            design_cost = float(self.ent_design.get())
         except ValueError as e:
             AppLogger(
-                'PersonalCalculateTab.get_ratio_for_calculation',
+                'PersonalCalculateTab.get_order',
                 'warning',
                 f'При считывании доплаты за макетирование возникло '
                 f'исключение "{e}": Данные не введены, или введены '
                 f'некорректно - {self.ent_design.get()}.'
             )
-            self.cost_design = 0
+            design_cost = 0
 
         # Скидка оператора
         try:
-            self.ratio_discount = 1 - float(self.spin_discount.get()) / 100
+            discount = float(self.spin_discount.get())
         except ValueError as e:
-            self.ratio_discount = 1
+            discount = 0
             AppLogger(
-                'PersonalCalculateTab.get_ratio_for_calculation',
+                'PersonalCalculateTab.get_order',
                 'warning',
                 f'При считывании скидки оператора возникло '
                 f'исключение "{e}": Данные не введены, или введены '
                 f'некорректно - {self.spin_discount.get()}.'
             )
 
+        product = self.combo_products.get()
+        return PersonalOrder(
+            product=None if product == "Нет" else product,
+            laser_type=self.rb_type_of_laser.get(),
+            width=width,
+            height=height,
+            number=int(self.spin_number.get()),
+            group=int(self.spin_group.get()),
+            aims=int(self.spin_aim.get()),
+            difficult=int(self.spin_difficult.get()),
+            depth=int(self.spin_depth.get()),
+            design_cost=design_cost,
+            discount=discount,
+            rotation=self.bool_rotation.get(),
+            different_layouts=self.bool_different.get(),
+            timing=self.bool_ratio_timing.get(),
+            packing=self.bool_ratio_packing.get(),
+            thermal_graving=self.bool_ratio_thermal_graving.get(),
+            oversize=self.bool_ratio_oversize.get(),
+            numbering=self.bool_ratio_numbering.get(),
+            taxation_ao=self.bool_ratio_taxation_ao.get(),
+            taxation_ip=self.bool_ratio_taxation_ip.get(),
+            attention=self.bool_ratio_attention.get(),
+            hand_job=self.bool_ratio_hand_job.get(),
+            docking=self.bool_ratio_docking.get()
+        )
+
     def add_new_calc(self) -> None:
         """
         Метод добавления нового расчета в рамках одного заказа
@@ -1516,6 +1488,9 @@ class PersonalCalculateTab(ttk.Frame):
         """
         BalloonTips(self.combo_products,
                     text=f'Выбор стандартного типа работы.')
+        BalloonTips(self.combo_profiles,
+                    text=f'Выбор профиля цен (розница, опт и т.д.).\n'
+                         f'Профили задаются в файле profiles.ini.')
         BalloonTips(self.chk_ratio_timing,
                     text=f'Работа в выходной день\n'
                          f'или работа сверх очереди.')
@@ -1590,7 +1565,14 @@ class PersonalCalculateTab(ttk.Frame):
 
         # Установка команд
         self.spin_group.bind('<Enter>', self.bind_spins)
-        self.bind('<FocusIn>', self.settings_update)
+
+        # Обновление вкладки после изменения файлов конфигурации
+        event_bus.subscribe(SETTINGS_CHANGED, self.settings_update)
+        event_bus.subscribe(STANDARD_CHANGED, self.settings_update)
+        event_bus.subscribe(PROFILES_CHANGED, self.settings_update)
+
+        # Переключение профиля цен
+        self.combo_profiles.bind('<<ComboboxSelected>>', self.select_profile)
 
     def bind_spins(self, event=None) -> None:
         """
@@ -1613,9 +1595,13 @@ class SheetMaterialsTab(ttk.Frame):
     осуществляется расчет расходников и расчет приблизительного количества
     потребного материала.
 
-    Содержит методы: material_calculation, update_base, add_tips, add_binds,
-    bind_update_base.
+    Содержит методы: material_calculation, run_compare_materials,
+    run_quantity_breaks, update_base, add_tips, add_binds, bind_update_base,
+    watch_materials.
     """
+    # Период проверки изменений файла базы материалов вне программы, мс
+    watch_period = 2000
+
     def __init__(self, parent, round_method):
         """
         Конфигурация и прорисовка второй вкладки основного окна приложения
@@ -1650,6 +1636,7 @@ class SheetMaterialsTab(ttk.Frame):
         self.panel_sheet_materials_widgets.rowconfigure(index=4, weight=1)
         self.panel_sheet_materials_widgets.rowconfigure(index=5, weight=1)
         self.panel_sheet_materials_widgets.rowconfigure(index=6, weight=1)
+        self.panel_sheet_materials_widgets.rowconfigure(index=7, weight=1)
 
         # Создание формы для вывода результатов
         self.panel_sheet_materials_result = ttk.LabelFrame(
@@ -1667,10 +1654,16 @@ class SheetMaterialsTab(ttk.Frame):
         self.panel_sheet_materials_result.rowconfigure(index=4, weight=1)
 
         # Виджеты выбора материала
-        # Получение материалов
-        self.material_list = list()
-        for n in Materials().get_mat_price():
-            self.material_list.append(n)
+        # Получение материалов (из кэша базы материалов)
+        self.material_list = [
+            x[0] for x in MaterialComparison.get_catalogue()]
+
+        # Отслеживание изменений базы материалов, внесенных вне программы
+        self.materials_watcher = FileWatcher(
+            MATERIALS_CHANGED, ['settings\\material_data.ini'])
+
+        # Склад обрезков (перечитывается при изменении файла склада)
+        self.remnant_inventory = RemnantInventory()
 
         self.combo_mat = ttk.Combobox(
             self.panel_sheet_materials_widgets,
@@ -1737,7 +1730,46 @@ class SheetMaterialsTab(ttk.Frame):
             command=self.material_calculation
         )
         self.btn_get_cost_materials.grid(
-            row=6, column=0, padx=10, pady=0, columnspan=2, sticky='nsew'
+            row=6, column=0, padx=10, pady=0, columnspan=1, sticky='nsew'
+        )
+
+        # Переключатель точного раскроя листа
+        self.bool_exact_packing = tk.BooleanVar(value=False)
+        self.switch_exact_packing = ttk.Checkbutton(
+            self.panel_sheet_materials_widgets,
+            text='Точный раскрой',
+            style='Switch',
+            variable=self.bool_exact_packing,
+            offvalue=False,
+            onvalue=True,
+            takefocus=False
+        )
+        self.switch_exact_packing.grid(
+            row=6, column=1, padx=10, pady=0, columnspan=1, sticky='nsew'
+        )
+
+        # Кнопка сравнения стоимости изделия из всех материалов
+        self.btn_compare_materials = ttk.Button(
+            self.panel_sheet_materials_widgets,
+            width=20,
+            text="Сравнить материалы",
+            command=self.run_compare_materials
+        )
+        self.btn_compare_materials.grid(
+            row=7, column=0, padx=10, pady=(10, 0), columnspan=1,
+            sticky='nsew'
+        )
+
+        # Кнопка расчета выгодных размеров партии
+        self.btn_quantity_breaks = ttk.Button(
+            self.panel_sheet_materials_widgets,
+            width=20,
+            text="Выгодные партии",
+            command=self.run_quantity_breaks
+        )
+        self.btn_quantity_breaks.grid(
+            row=7, column=1, padx=10, pady=(10, 0), columnspan=1,
+            sticky='nsew'
         )
 
         # Виджеты результатов расчета
@@ -1825,6 +1857,16 @@ class SheetMaterialsTab(ttk.Frame):
             row=4, column=0, padx=10, pady=(0, 20), sticky='nsew'
         )
 
+        # Виджет -Подходящие обрезки со склада-
+        self.lbl_result_8 = ttk.Label(
+            self.panel_sheet_materials_result,
+            text=f"Подходящие обрезки:  нет",
+            font='Arial 12'
+        )
+        self.lbl_result_8.grid(
+            row=4, column=1, padx=10, pady=(0, 20), sticky='nsew'
+        )
+
     def material_calculation(self) -> None:
         """
         Расчет себестоимости и стоимости изделий из листового материала.
@@ -1856,66 +1898,18 @@ class SheetMaterialsTab(ttk.Frame):
                 design_cost = 0
 
             # Подсчет результатов
-            # Количество изделий с листа
-            total_3 = max(
-                ContainerPacking(
-                    gab_width, gab_height, material_name).figure_1(),
-                ContainerPacking(
-                    gab_width, gab_height, material_name).figure_2()
+            engine = SheetMaterialEngine()
+            order = SheetOrder(
+                material_name, gab_width, gab_height, number_of_products,
+                discount, design_cost, exact=self.bool_exact_packing.get()
             )
-
-            # Себестоимость одного изделия
-            try:
-                total_1 = ContainerPacking(gab_width, gab_height,
-                                           material_name).get_price() / total_3
-            except ZeroDivisionError as e:
-                AppLogger(
-                    'SheetMaterialsTab.material_calculation',
-                    'warning',
-                    f'При расчете себестоимости изделия возникло исключение '
-                    f'"{e}": Количество изделий с листа равно 0.'
-                )
-                total_1 = 0.0
-
-            # Себестоимость партии
-            total_2 = total_1 * number_of_products
-
-            # Потребное количество листов на партию
-            try:
-                total_4 = ceil(number_of_products / total_3)
-            except ZeroDivisionError as e:
-                AppLogger(
-                    'SheetMaterialsTab.material_calculation',
-                    'warning',
-                    f'При расчете потребного количества листов на партию '
-                    f'возникло исключение "{e}": Количество изделий '
-                    f'с листа равно 0.'
-                )
-                total_4 = 0.0
-
-            try:
-                # Не забываем обнулять расчет при 0 штук изделий
-                total_5 = Interpolation(material_name).get_cost(
-                    gab_height,
-                    gab_width,
-                    number_of_products)
-                if number_of_products == 0:
-                    total_5 = 0
-                else:
-                    total_5 = self.round_method(
-                        total_5 * ((100 - discount) / 100))
-
-                total_6 = total_5 * number_of_products + design_cost
-
-            except (ValueError, ZeroDivisionError) as e:
-                AppLogger(
-                    'SheetMaterialsTab.material_calculation',
-                    'warning',
-                    f'При расчете стоимости изделия и стоимости партии '
-                    f'возникло исключение "{e}"'
-                )
-                total_5 = 0.0
-                total_6 = 0.0
+            quote = engine.price(order, self.round_method)
+            total_1 = quote.cost_price_item  # Себестоимость одного изделия
+            total_2 = quote.cost_price  # Себестоимость партии
+            total_3 = quote.per_sheet  # Количество изделий с листа
+            total_4 = quote.sheets  # Потребное количество листов на партию
+            total_5 = quote.cost  # Стоимость изделия
+            total_6 = quote.total  # Стоимость партии
 
             # Вывод результатов
             self.lbl_result_1.config(
@@ -1948,6 +1942,22 @@ class SheetMaterialsTab(ttk.Frame):
                 text=f"Макетирование:"
                      f"  {design_cost:_.0f}  руб.".replace('_', ' ')
             )
+
+            # Поиск обрезков на складе, на которых помещается вся партия
+            remnants = list()
+            if number_of_products > 0:
+                self.remnant_inventory.refresh()
+                remnants = self.remnant_inventory.find_remnants(
+                    material_name, gab_width, gab_height, number_of_products,
+                    engine.kerf)
+            if remnants:
+                self.lbl_result_8.config(
+                    text=f"Подходящие обрезки:  {remnants[0][1]:g} x "
+                         f"{remnants[0][2]:g} мм (всего {len(remnants)})"
+                )
+            else:
+                self.lbl_result_8.config(text=f"Подходящие обрезки:  нет")
+
             # Формируем параметры для сохранения расчёта в лог
             temp_list = [''] * 3
             temp_list[0] = f"Материал: {material_name}."
@@ -1965,6 +1975,14 @@ class SheetMaterialsTab(ttk.Frame):
                 _____=self.lbl_result_7.cget("text"),
                 ______=self.lbl_result_6.cget("text")
             )
+            # Сохраняем расчёт в журнал расчетов
+            quote_journal.append(
+                'sheet',
+                {**asdict(order), 'kerf': engine.kerf,
+                 'margin': engine.margin},
+                {**asdict(quote), 'remnants': len(remnants)},
+                ConfigSnapshot.get_snapshot()
+            )
 
         except ValueError as e:
             tk.messagebox.showerror(
@@ -1980,15 +1998,96 @@ class SheetMaterialsTab(ttk.Frame):
                 info=True
             )
 
+    def run_compare_materials(self) -> None:
+        """
+        Открытие дочернего окна сравнения стоимости изделия из всех
+        материалов базы.
+        """
+        try:
+            product = (
+                float(self.ent_width.get()),
+                float(self.ent_height.get()),
+                int(self.ent_num.get()),
+                int(self.spin_discount_material.get())
+            )
+        except ValueError as e:
+            AppLogger(
+                'SheetMaterialsTab.run_compare_materials',
+                'warning',
+                f'{e}: Для сравнения материалов необходимо заполнить '
+                f'количество и габариты изделия.'
+            )
+            return
+        try:
+            child = ChildCompareMaterials(
+                self,
+                950,
+                450,
+                theme=ttk.Style(self).theme_use(),
+                product=product,
+                round_method=self.round_method,
+                icon=PathName.resource_path("resources\\Company_logo.ico")
+            )
+            child.grab_focus()
+        except tk.TclError as e:
+            AppLogger(
+                'SheetMaterialsTab.run_compare_materials',
+                'warning',
+                f"При упаковке дочернего окна сравнения материалов возникло "
+                f"исключение {e}: Окно было закрыто слишком быстро."
+            )
+
+    def run_quantity_breaks(self) -> None:
+        """
+        Открытие дочернего окна расчета стоимости партий от 1 до N изделий
+        из выбранного материала.
+        """
+        try:
+            product = (
+                self.combo_mat.get(),
+                float(self.ent_width.get()),
+                float(self.ent_height.get()),
+                int(self.ent_num.get()),
+                int(self.spin_discount_material.get())
+            )
+        except ValueError as e:
+            AppLogger(
+                'SheetMaterialsTab.run_quantity_breaks',
+                'warning',
+                f'{e}: Для расчета партий необходимо заполнить количество и '
+                f'габариты изделия.'
+            )
+            return
+        try:
+            child = ChildQuantityBreaks(
+                self,
+                950,
+                550,
+                theme=ttk.Style(self).theme_use(),
+                product=product,
+                round_method=self.round_method,
+                icon=PathName.resource_path("resources\\Company_logo.ico")
+            )
+            child.grab_focus()
+        except tk.TclError as e:
+            AppLogger(
+                'SheetMaterialsTab.run_quantity_breaks',
+                'warning',
+                f"При упаковке дочернего окна расчета партий возникло "
+                f"исключение {e}: Окно было закрыто слишком быстро."
+            )
+
     def update_base(self) -> None:
         """
         Метод обновления списка (базы) листового материала после изменений
-        в настройках.
+        в настройках. Выпадающий список обновляется только при реальном
+        изменении списка материалов.
         """
         # Обновление данных
-        self.material_list = list()
-        for n in Materials().get_mat_price():
-            self.material_list.append(n)
+        material_list = [x[0] for x in MaterialComparison.get_catalogue()]
+        if material_list == self.material_list:
+            return
+        self.material_list = material_list
         # Обновление выпадающего списка
         self.combo_mat['values'] = self.material_list
         self.update()
@@ -2009,6 +2108,20 @@ class SheetMaterialsTab(ttk.Frame):
         BalloonTips(self.ent_draw_overprice, text=f'Макетирование или '
                                                   f'стоимость\n'
                                                   f'дополнительных работ, руб')
+        BalloonTips(self.btn_compare_materials,
+                    text=f'Расчет изделия из всех материалов базы\n'
+                         f'(таблица сортируется по щелчку на заголовке).')
+        BalloonTips(self.btn_quantity_breaks,
+                    text=f'Стоимость партий от 1 до N изделий:\n'
+                         f'заполнение последнего листа и снижение\n'
+                         f'стоимости изделия.')
+        BalloonTips(self.lbl_result_8,
+                    text=f'Наименьший обрезок со склада, на котором\n'
+                         f'помещается вся партия изделий.')
+        BalloonTips(self.switch_exact_packing,
+                    text=f'Поиск раскроя с максимальным количеством\n'
+                         f'изделий на листе (расчет до '
+                         f'{ContainerPacking.exact_time_budget:.0f} с).')
 
     def add_binds(self) -> None:
         """
@@ -2024,18 +2137,29 @@ class SheetMaterialsTab(ttk.Frame):
         BindEntry(self.ent_height, text='Высота изделия, мм')
 
         # Обновление списка материалов после редактирования базы
-        self.bind("<Enter>", self.bind_update_base)
+        event_bus.subscribe(MATERIALS_CHANGED, self.bind_update_base)
+        self.after(self.watch_period, self.watch_materials)
 
     def bind_update_base(self, event=None) -> None:
         """
         Метод автономного обновления списка материалов после редактирования
         базы.
-        :param event: Возвращение фокуса на вкладку после закрытия окна
-        предварительной настройки материала
+        :param event: Событие изменения базы листового материала
         """
+        # Изменения уже учтены - периодическая проверка их не повторяет
+        self.materials_watcher.sync()
         self.update_base()
         self.not_use = event
 
+    def watch_materials(self) -> None:
+        """
+        Метод периодической проверки файла базы материалов на изменения,
+        внесенные вне программы. При изменении файла публикуется событие
+        изменения базы материалов.
+        """
+        self.materials_watcher.check()
+        self.after(self.watch_period, self.watch_materials)
+
 
 class IndustrialCalculateTab(ttk.Frame):
     """
@@ -2052,7 +2176,7 @@ class IndustrialCalculateTab(ttk.Frame):
         "Промышленный расчет"
         :param parent: Экземпляр-родитель Notebook
         :param round_method: Метод округления результата (из класса App)
-        :param settings: Переменная настроек (конфигурации) программы
+        :param settings: Снимок настроек программы (ConfigSnapshot)
         """
         # Инициализация и конфигурация отзывчивости вкладки
         super().__init__(parent)
@@ -2062,8 +2186,8 @@ class IndustrialCalculateTab(ttk.Frame):
 
         # Создание переменной-метода округления результатов
         self.round_method = round_method
-        # Создание переменной настроек программы
-        self.main_settings = settings
+        # Создание переменной снимка настроек программы
+        self.config_snapshot = settings
 
         # Переменная для считывания событий
         self.not_use = None
@@ -2237,12 +2361,10 @@ class IndustrialCalculateTab(ttk.Frame):
         Метод, реализующий расчет стоимости от времени работы оборудования.
         """
         try:  # Проверяем на то, что введено корректное число
-            cost = (
-                float(self.ent_time_of_work.get()) *
-                int(self.main_settings['MAIN'][
-                        'one_hour_of_work']) / 60
-
-            )
+            minutes = float(self.ent_time_of_work.get())
+            cost = IndustrialEngine(
+                self.config_snapshot.one_hour_of_work
+            ).get_cost(minutes)
             # Выводим результат
             self.lbl_result_cost.config(
                 text=f"Итого:"
@@ -2258,6 +2380,12 @@ class IndustrialCalculateTab(ttk.Frame):
                   f" {self.ent_time_of_work.get()} мин.",
                 __=self.lbl_result_cost.cget('text')
             )
+            # Записываем расчет в журнал расчетов
+            quote_journal.append(
+                'industrial_cost', {'minutes': minutes},
+                {'cost': cost, 'rounded': self.round_method(cost)},
+                self.config_snapshot
+            )
 
         except ValueError as e:  # Если число некорректно
             # Обнуляем вывод результата
@@ -2306,32 +2434,11 @@ class IndustrialCalculateTab(ttk.Frame):
             num_grav = float(self.ent_number_grav.get())
             black_pixels = float(self.ent_black_pixel.get())
 
-            # Если пользователь не ввел количество пикселей, то считаем,
-            # что планируется гравировать прямоугольник
-            if black_pixels == 0:
-                black_pixels = width_grav * height_grav * dpi_grav * dpi_grav
-                white_pixels = 0
-                flag_rectangle_grav = True
-            else:  # Иначе считаем для макета
-                flag_rectangle_grav = False
-                white_pixels = (width_grav * dpi_grav * height_grav *
-                                dpi_grav - black_pixels)
-            result = (
-                    ((width_grav * height_grav * dpi_grav * num_grav * (
-                            black_pixels / (black_pixels + white_pixels)) /
-                     speed_grav) / 60) + (
-                        (width_grav * height_grav * dpi_grav * num_grav * (
-                                white_pixels / (black_pixels +
-                                                white_pixels)) / 4000) / 60
-                    )
-            )
-            if flag_rectangle_grav:
-                # Уравниваем результаты вывода для прямоугольника
-                result_text = result_imagine = result
-            else:
-                # Считаем второй и третий случаи
-                result_text = result / 0.75
-                result_imagine = result / 0.65
+            # Расчет времени (если пользователь не ввел количество пикселей,
+            # то считаем, что планируется гравировать прямоугольник)
+            result, result_text, result_imagine = IndustrialEngine.get_time(
+                width_grav, height_grav, dpi_grav, speed_grav, num_grav,
+                black_pixels)
 
             # Выводим результаты
             self.lbl_result_time_minimum.config(
@@ -2359,6 +2466,15 @@ class IndustrialCalculateTab(ttk.Frame):
                 __=self.lbl_result_time_text.cget('text'),
                 ___=self.lbl_result_time_imagine.cget('text')
             )
+            # Записываем расчеты в журнал расчетов
+            quote_journal.append(
+                'industrial_time',
+                {'width': width_grav, 'height': height_grav,
+                 'dpi': dpi_grav, 'speed': speed_grav, 'number': num_grav,
+                 'black_pixels': black_pixels},
+                {'minimum': result, 'text': result_text,
+                 'imagine': result_imagine}
+            )
 
         except (ValueError, TypeError, ZeroDivisionError) as e:
             tk.messagebox.showerror(
@@ -2425,6 +2541,12 @@ class IndustrialCalculateTab(ttk.Frame):
                 ___=f'Высота макета: {self.ent_height_grav.get()}',
                 ____=f'Разрешение макета: {self.ent_dpi_grav.get()}'
             )
+            # Записываем данные в журнал расчетов
+            quote_journal.append(
+                'bmp', {'file': filename},
+                {'black_pixels': black, 'width': width_bmp,
+                 'height': height_bmp, 'dpi': dpi_bmp / 25.4}
+            )
 
         except (FileNotFoundError, TypeError) as e:
             # Обнуляем поля
@@ -2455,18 +2577,17 @@ class IndustrialCalculateTab(ttk.Frame):
         BindEntry(self.ent_speed_grav, text='Скорость гравировки, мм/сек')
         BindEntry(self.ent_number_grav, text='Количество проходов, шт')
 
-        # Добавление команд
-        self.bind("<Enter>", self.bind_update_time_price)
+        # Обновление стоимости часа работы после изменения настроек
+        event_bus.subscribe(SETTINGS_CHANGED, self.bind_update_time_price)
         self.add_bmp_binds()
 
     def bind_update_time_price(self, event=None) -> None:
         """
         Метод обновления стоимости времени работы оборудования после
         изменения настроек
-        :param event:Возвращение фокуса на вкладку после закрытия окна
-        предварительной настройки программы
+        :param event: Событие изменения основных настроек программы
         """
-        self.main_settings = ConfigSet().config
+        self.config_snapshot = ConfigSnapshot.get_snapshot()
         self.not_use = event
 
     def add_bmp_binds(self) -> None:
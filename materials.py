@@ -9,20 +9,37 @@ _______________________________________________________________________________
 Модуль содержит классы:
 - Materials - реализует работу с файлом конфигурации списка листового
 материала material_data.ini.
-- ContainerPacking - реализует алгоритм упаковки в контейнере.
+- ContainerPacking - реализует алгоритм упаковки в контейнере (раскрой листа
+с учетом ширины реза и отступа от края).
+- OrderPacking - реализует раскрой заказа из изделий разных габаритов на
+несколько листов материала.
 - Interpolation - реализует интерполяционный расчет стоимости изделия из
 выбранного материала.
+- MaterialComparison - реализует сравнение стоимости изделия из всех
+материалов базы.
+- QuantityBreaks - реализует расчет стоимости партии для всех количеств
+изделий от 1 до N (выбор выгодного размера партии).
 """
 
 import os
-import shutil
-
-
-import configparser
+from bisect import bisect_left, bisect_right
+from math import ceil, log
 
 from app_logger import AppLogger
+from calculations import MonotoneSpline
+from config_cache import config_cache
+from config_writer import config_writer, FileLock
+from event_bus import event_bus, MATERIALS_CHANGED
+from lazy_import import lazy_import
+from nesting import OrderLayout, OrderPacker, PackingLayout
+from packing_cache import packing_cache
 from path_getting import PathName
-from settings_configuration import SettingsFileError
+from settings_configuration import (ConfigSnapshot, SettingsConflictError,
+                                    SettingsFileError)
+
+# Модули загружаются при первом чтении файлов материалов
+configparser = lazy_import('configparser')
+shutil = lazy_import('shutil')
 
 
 class Materials:
@@ -31,10 +48,14 @@ class Materials:
     material_data.ini. Реализует работу с файлами конфигурации стоимостей
     изделий из имеющихся листовых материалов.
 
-    Содержит методы: get_mat_price, get_gab_width, get_gab_height,
+    Содержит методы: reload, get_mat_price, get_gab_width, get_gab_height,
     get_type_of_laser, update_materials, del_matrix_file, add_matrix_file,
     get_default.
 
+    При чтении запоминается версия файла material_data.ini (file_state),
+    update_materials записывает файл только если версия не изменилась,
+    иначе вызывается исключение SettingsConflictError.
+
     Пример использования:
     material_set = Materials()
     material_price = material_set.get_mat_price[material_name]
@@ -51,10 +72,8 @@ class Materials:
         material_data.ini.
         """
 
-        # Создание файла конфигурации
-        self.material_config = configparser.ConfigParser()
-        self.material_config.read(PathName.resource_path(
-            'settings\\material_data.ini'), encoding='utf-8')
+        # Чтение файла конфигурации
+        self.reload()
 
         # Проверяем файл настроек на целостность
         if self.material_config.sections() != ['INFO', 'MAIN']:
@@ -143,19 +162,48 @@ class Materials:
                 info=True
             )
 
+    def reload(self) -> None:
+        """
+        Метод чтения файла конфигурации (с учетом ожидающей записи) и
+        запоминания его версии.
+        """
+        self.path = PathName.resource_path('settings\\material_data.ini')
+        self.file_state = config_cache.get_file_state(self.path)
+        self.material_config = configparser.ConfigParser()
+        config_writer.read(self.material_config, self.path)
+
     def update_materials(self, some_new=None) -> None:
         """
-        Метод обновления файла конфигурации.
+        Метод обновления файла конфигурации (атомарная запись под
+        блокировкой с проверкой версии файла).
         :param some_new: Переменная конфигурации с новыми данными
         """
-        if some_new:  # Добавление новых данных в файл конфигурации
-            with (open(PathName.resource_path('settings\\material_data.ini'),
-                       'w', encoding='utf-8') as configfile):
-                some_new.write(configfile)
-        else:
-            with (open(PathName.resource_path('settings\\material_data.ini'),
-                       'w', encoding='utf-8') as configfile):
-                self.material_config.write(configfile)
+        try:
+            state = config_writer.save(
+                self.path, some_new if some_new else self.material_config,
+                self.file_state)
+        except TimeoutError as e:
+            raise SettingsConflictError(
+                f'{e} Изменения не сохранены, повторите сохранение.',
+                location='Materials.update_materials'
+            )
+        except OSError as e:
+            raise SettingsFileError(
+                f'Файл конфигурации material_data.ini не записан: {e}',
+                location='Materials.update_materials'
+            )
+        if state is None:
+            self.reload()
+            raise SettingsConflictError(
+                f'Файл конфигурации material_data.ini изменен другим '
+                f'экземпляром программы. Изменения не сохранены, данные '
+                f'обновлены - повторите изменения.',
+                location='Materials.update_materials'
+            )
+        self.file_state = state
+
+        # Уведомляем подписчиков об изменении базы материалов
+        event_bus.publish(MATERIALS_CHANGED)
 
     @staticmethod
     def del_matrix_file(material_name: str) -> None:
@@ -166,9 +214,11 @@ class Materials:
         try:
             file_path = PathName.resource_path(
                 f'settings/materials\\{material_name}.ini')
-            if os.path.isfile(file_path):
-                os.remove(file_path)
-        except FileNotFoundError as e:
+            config_writer.flush(file_path)
+            with FileLock(file_path):
+                if os.path.isfile(file_path):
+                    os.remove(file_path)
+        except OSError as e:
             AppLogger(
                 'Materials.del_matrix_file',
                 'error',
@@ -185,36 +235,24 @@ class Materials:
         :param laser_type: Тип лазера
         """
         try:
-            destination_path = PathName.resource_path(f'settings\\materials')
             file_new_name = PathName.resource_path(
                 f'settings\\materials\\{material_name}.ini')
 
             # Если редактируем имеющийся материал
-            if os.path.exists(PathName.resource_path(
-                    f'settings\\materials\\{material_name}.ini')):
+            if os.path.exists(file_new_name):
                 pass
 
-            # Если создаем новый материал
+            # Если создаем новый материал: файл по умолчанию для типа
+            # лазера копируется сразу под именем материала (атомарно, под
+            # блокировкой файла)
             else:
                 if laser_type == 'gas':
                     source_path = PathName.resource_path(
                         'settings\\default\\materials\\default_gas.ini')
-                    file_old_name = PathName.resource_path(
-                        'settings\\materials\\default_gas.ini')
                 else:
                     source_path = PathName.resource_path(
                         'settings\\default\\materials\\default_solid.ini')
-                    file_old_name = PathName.resource_path(
-                        'settings\\materials\\default_solid.ini')
-
-                # Копируем файл в папку назначения
-                shutil.copy(
-                    source_path,
-                    os.path.join(destination_path)
-                )
-
-                # Переименовываем файл
-                os.rename(file_old_name, file_new_name)
+                config_writer.copy(source_path, file_new_name)
         except Exception as e:
             AppLogger(
                 'Materials.add_matrix_file',
@@ -229,14 +267,15 @@ class Materials:
         Метод сброса файла конфигурации и стоимостей "по-умолчанию"
         """
         try:
+            # Ожидающие записи выполняются до замены файлов
+            config_writer.flush()
+
             # Сброс основного файла конфигурации со списком материалов
             destination_path = PathName.resource_path(
                 'settings\\material_data.ini')
             source_path = PathName.resource_path(
                 'settings\\default\\material_data.ini')
-            if os.path.exists(destination_path):
-                os.remove(destination_path)
-            shutil.copy2(source_path, destination_path)
+            config_writer.copy(source_path, destination_path)
 
             # Сброс файлов с матрицами стоимостей
             destination_path = PathName.resource_path('settings\\materials\\')
@@ -245,8 +284,9 @@ class Materials:
             deleted_files = os.listdir(destination_path)
             new_files = os.listdir(source_path)
             for file in deleted_files:
-                os.remove(PathName.resource_path(
-                    f'settings\\materials\\{file}'))
+                if file.endswith('.ini'):
+                    os.remove(PathName.resource_path(
+                        f'settings\\materials\\{file}'))
             for filename in new_files:
                 shutil.copy(
                     PathName.resource_path(
@@ -262,6 +302,9 @@ class Materials:
                     f'settings\\materials\\{item}.ini')
                 if os.path.isfile(file_path):
                     os.remove(file_path)
+
+            # Уведомляем подписчиков об изменении базы материалов
+            event_bus.publish(MATERIALS_CHANGED)
         except Exception as e:
             AppLogger(
                 'Materials.get_default',
@@ -275,19 +318,45 @@ class ContainerPacking:
     """
     Класс реализует алгоритм упаковки в контейнере.
 
-    Содержит методы: figure_1, figure_2, get_price.
+    Габариты рабочего поля листа уменьшаются на отступ от края листа
+    edge_margin, а между изделиями учитывается ширина реза kerf (параметры
+    раздела [MAIN] файла settings.ini). Основной расчет выполняется
+    алгоритмами раскроя модуля nesting (гильотинный раскрой и MaxRects, в
+    режиме 'exact' - также точный раскрой рекурсивным делением с
+    ограничением времени), методы figure_1 и figure_2 сохранены как простые
+    схемы раскроя.
+
+    Содержит методы: get_cutting_settings, figure_1, figure_2, get_layout,
+    get_quantity, update_cache, get_price.
 
     Пример использования:
-    first_packing = ContainerPacking(width, height, material_name).figure_1()
-    second_packing = ContainerPacking(width, height, material_name).figure_2()
-    max_quantity = max(first_packing, second_packing)
+    packing = ContainerPacking(width, height, material_name)
+    max_quantity = packing.get_quantity()
+    layout = packing.get_layout()
     """
-    def __init__(self, width: int, height: int, mat_name: str):
+    # Значения ширины реза и отступа от края листа по умолчанию, мм
+    default_kerf = 1
+    default_edge_margin = 10
+
+    # Ограничение времени точного раскроя (algorithm='exact') по умолчанию, с
+    exact_time_budget = 1.0
+
+    def __init__(self, width: int, height: int, mat_name: str,
+                 kerf: int | float | None = None,
+                 margin: int | float | None = None,
+                 algorithm: str = 'auto',
+                 time_budget: int | float | None = None):
         """
         Инициализация параметров для выбранного материала.
         :param width: Ширина изделия
         :param height: Высота изделия
         :param mat_name: Название материала
+        :param kerf: Ширина реза (по умолчанию - из settings.ini)
+        :param margin: Отступ от края листа (по умолчанию - из settings.ini)
+        :param algorithm: Алгоритм раскроя: 'guillotine', 'maxrects',
+        'recursive', 'auto' (лучший из гильотинного и MaxRects) или 'exact'
+        (точный раскрой - лучший из всех алгоритмов)
+        :param time_budget: Ограничение времени точного раскроя, с
         """
 
         # Создание переменных
@@ -295,15 +364,52 @@ class ContainerPacking:
         self.figure_per_columns = 0
         self.total_1 = 0
         self.total_2 = 0
-
-        # Получение габаритов листа с учетом коэффициента обрезков
-        self.w_big = Materials().get_gab_width()[mat_name] * 0.9
-        self.h_big = Materials().get_gab_height()[mat_name]
+        self.layout = None
+        self.algorithm = algorithm
+        self.time_budget = (self.exact_time_budget if time_budget is None
+                            else time_budget)
+
+        # Параметры раскроя
+        if kerf is None or margin is None:
+            default_kerf, default_margin = self.get_cutting_settings()
+            kerf = default_kerf if kerf is None else kerf
+            margin = default_margin if margin is None else margin
+        self.kerf = kerf
+        self.margin = margin
+
+        # Получение габаритов и стоимости листа (самого листа)
+        materials = Materials()
+        self.sheet_width = materials.get_gab_width()[mat_name]
+        self.sheet_height = materials.get_gab_height()[mat_name]
+        self.price = materials.get_mat_price()[mat_name]
+
+        # Габариты рабочего поля листа с учетом отступа от края
+        self.w_big = self.sheet_width - 2 * self.margin
+        self.h_big = self.sheet_height - 2 * self.margin
         self.width = width
         self.height = height
 
-        # Получение стоимости выбранного материала (самого листа)
-        self.price = Materials().get_mat_price()[mat_name]
+    @classmethod
+    def get_cutting_settings(cls) -> tuple:
+        """
+        Метод получения параметров раскроя из снимка настроек (файл
+        settings.ini). При отсутствии параметров используются значения по
+        умолчанию.
+        :return: Кортеж (ширина реза, отступ от края листа)
+        """
+        try:
+            snapshot = ConfigSnapshot.get_snapshot()
+            kerf, margin = snapshot.kerf, snapshot.edge_margin
+        except SettingsFileError as e:
+            AppLogger(
+                'ContainerPacking.get_cutting_settings',
+                'warning',
+                f'Параметры раскроя не получены ({e}), используются '
+                f'значения по умолчанию.'
+            )
+            kerf = margin = None
+        return (cls.default_kerf if kerf is None else kerf,
+                cls.default_edge_margin if margin is None else margin)
 
     def figure_1(self) -> int:
         """
@@ -369,6 +475,38 @@ class ContainerPacking:
         # Возвращаем количество изделий с листа вторым методом
         return self.total_2
 
+    def get_layout(self) -> PackingLayout:
+        """
+        Метод раскроя листа алгоритмами модуля nesting. Результат
+        запоминается в кэше раскроя (packing_cache), повторный расчет для
+        тех же габаритов листа и изделия не выполняется.
+        :return: Результат раскроя (количество изделий и схема размещения)
+        """
+        if self.layout is None:
+            self.layout = packing_cache.get_layout(
+                self.sheet_width, self.sheet_height, self.width, self.height,
+                self.kerf, self.margin, self.algorithm, self.time_budget
+            )
+        return self.layout
+
+    def get_quantity(self) -> int:
+        """
+        Метод получения максимального количества изделий на листе.
+        :return: Количество изделий на листе
+        """
+        return self.get_layout().count
+
+    @staticmethod
+    def update_cache(event=None) -> None:
+        """
+        Метод очистки кэша раскроя от записей для листов, габаритов которых
+        больше нет в базе материалов (вызывается при изменении базы).
+        :param event: Событие изменения базы листового материала
+        """
+        materials = Materials()
+        widths, heights = materials.get_gab_width(), materials.get_gab_height()
+        packing_cache.prune({(widths[x], heights[x]) for x in widths})
+
     def get_price(self) -> int | float:
         """
         Интерфейсный метод возвращения себестоимости материала
@@ -377,18 +515,123 @@ class ContainerPacking:
         return self.price
 
 
+class OrderPacking:
+    """
+    Класс реализует раскрой заказа из изделий разных габаритов на
+    минимальное количество листов выбранного материала (в отличие от
+    раздельного расчета, при котором листы округляются для каждого изделия).
+
+    Содержит методы: get_layout, get_sheet_count, get_separate_sheet_count,
+    get_price.
+
+    Пример использования:
+    packing = OrderPacking(material_name, [(100, 50, 300), (250, 120, 40)])
+    sheets = packing.get_sheet_count()
+    """
+    def __init__(self, mat_name: str, lines: list,
+                 kerf: int | float | None = None,
+                 margin: int | float | None = None):
+        """
+        Инициализация параметров для выбранного материала.
+        :param mat_name: Название материала
+        :param lines: Список строк заказа (ширина, высота, количество)
+        :param kerf: Ширина реза (по умолчанию - из settings.ini)
+        :param margin: Отступ от края листа (по умолчанию - из settings.ini)
+        """
+        self.mat_name = mat_name
+        self.lines = lines
+        self.layout = None
+
+        # Параметры раскроя
+        if kerf is None or margin is None:
+            default_kerf, default_margin = (
+                ContainerPacking.get_cutting_settings())
+            kerf = default_kerf if kerf is None else kerf
+            margin = default_margin if margin is None else margin
+        self.kerf = kerf
+        self.margin = margin
+
+        # Получение габаритов и стоимости листа
+        materials = Materials()
+        self.sheet_width = materials.get_gab_width()[mat_name]
+        self.sheet_height = materials.get_gab_height()[mat_name]
+        self.price = materials.get_mat_price()[mat_name]
+
+    def get_layout(self) -> OrderLayout:
+        """
+        Метод раскроя заказа. Результат запоминается, повторный вызов не
+        выполняет расчет заново.
+        :return: Результат раскроя заказа
+        """
+        if self.layout is None:
+            self.layout = OrderPacker(
+                self.sheet_width, self.sheet_height, self.kerf, self.margin
+            ).pack(self.lines)
+        return self.layout
+
+    def get_sheet_count(self) -> int:
+        """
+        Метод получения количества листов на заказ.
+        :return: Количество листов
+        """
+        return self.get_layout().get_sheet_count()
+
+    def get_separate_sheet_count(self) -> int:
+        """
+        Метод получения количества листов при раздельном расчете каждой
+        строки заказа (для сравнения с раскроем заказа).
+        :return: Количество листов
+        """
+        sheets = 0
+        for width, height, quantity in self.lines:
+            count = packing_cache.get_layout(
+                self.sheet_width, self.sheet_height, width, height,
+                self.kerf, self.margin).count
+            if count and quantity > 0:
+                sheets += ceil(quantity / count)
+        return sheets
+
+    def get_price(self) -> int | float:
+        """
+        Метод получения себестоимости материала на заказ.
+        :return: Стоимость листов на заказ
+        """
+        return self.price * self.get_sheet_count()
+
+
 class Interpolation:
     """
     Класс реализующий интерполяционный расчет стоимости изделия из
     выбранного листового материала.
 
-    Содержит методы: get_laser_type, get_cost, get_keys, get_interpolation,
-    update_matrix, get_default.
+    Поддерживает два режима интерполяции, выбираемые для каждого материала
+    параметром interpolation раздела [INFO] файла стоимостей:
+    - linear (по умолчанию) - линейная интерполяция по количеству и площади;
+    - spline - монотонная кубическая интерполяция (PCHIP) по логарифму
+    количества изделий и по площади изделия.
+
+    Содержит методы: get_laser_type, get_interpolation_mode,
+    set_interpolation_mode, compile_matrix, get_cost, get_costs,
+    get_spline_cost, get_keys, get_interpolation, update_matrix, get_default.
 
     Пример использования:
     total_cost = Interpolation(material_name).get_cost(height, width, number)
 
     """
+    # Список хранящий количество изделий в партии (столбцы матрицы)
+    numbering_list = [1, 5, 15, 50, 150, 500, 1000]
+
+    # Режимы интерполяции
+    interpolation_modes = ('linear', 'spline')
+
+    # Кэш скомпилированных матриц: материал -> (строки матрицы, сплайны по
+    # количеству, сплайны по площади для количеств). Запись материала
+    # заменяется при изменении строк матрицы
+    _compiled_cache = dict()
+
+    # Наибольшее количество хранимых сплайнов по площади для материала
+    max_area_splines = 64
+
     def __init__(self, file_name: str):
         """
         Инициализация переменной конфигурации и работы с файлом выбранного
@@ -396,8 +639,8 @@ class Interpolation:
         :param file_name: Название материала (файла стоимостей)
         """
         self.matrix_config = configparser.ConfigParser()
-        self.matrix_config.read(PathName.resource_path(
-            f'settings\\materials\\{file_name}.ini'), encoding='utf-8')
+        config_writer.read(self.matrix_config, PathName.resource_path(
+            f'settings\\materials\\{file_name}.ini'))
         self.name = str(file_name)
 
         # Проверяем файл конфигурации на целостность
@@ -408,6 +651,11 @@ class Interpolation:
                 location='Interpolation.__init__'
             )
 
+        # Скомпилированная матрица и сплайны по площади (рассчитываются при
+        # первом обращении)
+        self.compiled_matrix = None
+        self.area_splines = None
+
     def get_laser_type(self) -> str:
         """
         Метод возвращает строковое значение типа лазера.
@@ -416,8 +664,8 @@ class Interpolation:
         try:  # Корректны ли данные материала в файле конфигурации
             name = self.name
             laser_type_config = configparser.ConfigParser()
-            laser_type_config.read(PathName.resource_path(
-                'settings\\material_data.ini'), encoding='utf-8')
+            config_writer.read(laser_type_config, PathName.resource_path(
+                'settings\\material_data.ini'))
             laser_type = laser_type_config['MAIN'][str(name)].split(', ')[-1]
             del laser_type_config
             return laser_type
@@ -430,6 +678,90 @@ class Interpolation:
                 info=True
             )
 
+    def get_interpolation_mode(self) -> str:
+        """
+        Метод возвращает режим интерполяции, выбранный для материала.
+        :return: Режим интерполяции ('linear' или 'spline').
+        """
+        mode = self.matrix_config['INFO'].get('interpolation', 'linear')
+        mode = mode.strip().lower()
+        return mode if mode in self.interpolation_modes else 'linear'
+
+    def set_interpolation_mode(self, mode: str) -> None:
+        """
+        Метод установки режима интерполяции для материала (без записи в
+        файл, для сохранения используется update_matrix).
+        :param mode: Режим интерполяции ('linear' или 'spline').
+        """
+        if mode not in self.interpolation_modes:
+            raise ValueError(f'Неизвестный режим интерполяции: {mode}')
+        self.matrix_config['INFO']['interpolation'] = mode
+
+    def compile_matrix(self) -> list:
+        """
+        Метод компиляции матрицы стоимостей для сплайн-интерполяции. Для
+        каждой строки (габарита) рассчитываются коэффициенты монотонного
+        сплайна по логарифму количества изделий. Результат кэшируется на
+        уровне класса (одна запись на материал, заменяется при изменении
+        матрицы), поэтому повторные расчеты для неизмененной матрицы
+        коэффициенты не пересчитывают.
+        :return: Отсортированный по площади список пар (площадь, сплайн).
+        """
+        if self.compiled_matrix is not None:
+            return self.compiled_matrix
+
+        rows = tuple(self.matrix_config['COSTS'].items())
+        entry = self._compiled_cache.get(self.name)
+        if entry is None or entry[0] != rows:
+            log_numbers = [log(x) for x in self.numbering_list]
+            compiled = dict()
+            for key, value in rows:
+                temp_key = key.split(', ')
+                area = float(temp_key[1]) * float(temp_key[2])
+                # При совпадении площадей учитывается первая строка
+                if area not in compiled:
+                    compiled[area] = MonotoneSpline(
+                        log_numbers, [float(x) for x in value.split(', ')])
+            entry = (rows, sorted(compiled.items()), dict())
+            self._compiled_cache[self.name] = entry
+
+        self.compiled_matrix, self.area_splines = entry[1], entry[2]
+        return self.compiled_matrix
+
+    def get_spline_cost(self, height: int | float, width: int | float,
+                        num: int) -> float:
+        """
+        Метод получения стоимости изделия сплайн-интерполяцией. Сначала для
+        каждого габарита вычисляется стоимость при заданном количестве
+        (сплайн по логарифму количества), затем полученные значения
+        интерполируются монотонным сплайном по площади изделия.
+
+        Производные сплайна по площади зависят от стоимостей габаритов при
+        заданном количестве, поэтому его коэффициенты не рассчитываются
+        при компиляции матрицы: сплайн по площади строится один раз для
+        каждого количества и хранится вместе со скомпилированной матрицей
+        (не более max_area_splines количеств). Повторный расчет для того же
+        количества сводится к поиску участка и нескольким умножениям.
+        :param height: Высота изделия
+        :param width: Ширина изделия
+        :param num: Количество изделий
+        :return: Стоимость одного изделия
+        """
+        compiled = self.compile_matrix()
+        num = max(num, 1)
+        area_spline = self.area_splines.get(num)
+        if area_spline is None:
+            # Стоимость для каждого габарита при нужном количестве
+            log_number = log(num)
+            area_spline = MonotoneSpline(
+                [area for area, _ in compiled],
+                [spline.get_value(log_number) for _, spline in compiled])
+            if len(self.area_splines) >= self.max_area_splines:
+                self.area_splines.clear()
+            self.area_splines[num] = area_spline
+
+        return area_spline.get_value(width * height)
+
     def get_cost(self, height: int | float, width: int | float, num: int) ->\
             float:
         """
@@ -439,10 +771,14 @@ class Interpolation:
         :param num: Количество изделий
         :return: Стоимость одного изделия
         """
+        # Сглаженная интерполяция, если она выбрана для материала
+        if self.get_interpolation_mode() == 'spline':
+            return self.get_spline_cost(height, width, num)
+
         temp_cost_config = self.matrix_config['COSTS']
 
         # Список хранящий количество изделий в партии
-        numbering_list = [1, 5, 15, 50, 150, 500, 1000]
+        numbering_list = self.numbering_list
 
         # Получаем граничные строки для нашего изделия
         lower_and_bigger_key = self.get_keys(height, width)
@@ -497,6 +833,51 @@ class Interpolation:
                 [bigger_area, bigger_cost]
             )
 
+    def get_costs(self, height: int | float, width: int | float,
+                  numbers: list) -> list:
+        """
+        Метод получения стоимости изделия для списка количеств изделий
+        (результат совпадает с get_cost для каждого количества). Граничные
+        строки матрицы и их стоимости определяются один раз для всего
+        списка, поэтому расчет для тысяч количеств выполняется быстро.
+        :param height: Высота изделия
+        :param width: Ширина изделия
+        :param numbers: Список количеств изделий
+        :return: Список стоимостей одного изделия
+        """
+        if self.get_interpolation_mode() == 'spline':
+            return [self.get_spline_cost(height, width, x) for x in numbers]
+        numbering_list = self.numbering_list
+        temp_cost_config = self.matrix_config['COSTS']
+        lower_and_bigger_key = self.get_keys(height, width)
+        if type(lower_and_bigger_key) is not list:
+            lower_and_bigger_key = [lower_and_bigger_key]
+        cost_lists = [[int(x) for x in temp_cost_config[key].split(', ')]
+                      for key in lower_and_bigger_key]
+        areas = [int(key.split(', ')[1]) * int(key.split(', ')[-1])
+                 for key in lower_and_bigger_key]
+
+        costs = list()
+        for num in numbers:
+            # Границы количества изделий (как в get_cost)
+            lower_index = max(bisect_right(numbering_list, num) - 1, 0)
+            bigger_index = min(bisect_left(numbering_list, num),
+                               len(numbering_list) - 1)
+            row_costs = [self.get_interpolation(
+                num,
+                [numbering_list[lower_index], cost_list[lower_index]],
+                [numbering_list[bigger_index], cost_list[bigger_index]]
+            ) for cost_list in cost_lists]
+            if len(row_costs) == 1:
+                costs.append(row_costs[0])
+            else:
+                costs.append(self.get_interpolation(
+                    width * height,
+                    [areas[0], row_costs[0]],
+                    [areas[1], row_costs[1]]
+                ))
+        return costs
+
     def get_keys(self, width: int | float, height: int | float) -> str | list:
         """
         Метод получения строк-ключей для ближайшего большего и меньшего
@@ -615,19 +996,17 @@ class Interpolation:
     def update_matrix(self, some_new=None) -> None:
         """
         Метод обновления файла конфигурации стоимостей изделий из выбранного
-        листового материала.
+        листового материала. Файл записывается атомарно в фоне, частые
+        сохранения (редактирование ячеек) объединяются в одну запись.
         :param some_new: Переменная конфигурации с новыми данными
         """
-        if some_new:  # Обновляем файл конфигурации
-            with (open(PathName.resource_path(
-                    f'settings\\materials\\{self.name}.ini'), 'w',
-                       encoding='utf-8') as configfile):
-                some_new.write(configfile)
-        else:
-            with (open(PathName.resource_path(
-                    f'settings\\materials\\{self.name}.ini'), 'w',
-                       encoding='utf-8') as configfile):
-                self.matrix_config.write(configfile)
+        # Матрица изменилась - компиляция выполняется заново
+        self.compiled_matrix = None
+        self.area_splines = None
+
+        config_writer.write(
+            PathName.resource_path(f'settings\\materials\\{self.name}.ini'),
+            some_new if some_new else self.matrix_config)
 
     def get_default(self) -> None:
         """
@@ -640,39 +1019,17 @@ class Interpolation:
             source_path = PathName.resource_path(
                 f'settings\\default\\materials\\{self.name}.ini')
 
-            # Удаляем действующий файл конфигурации
-            if os.path.exists(destination_path):
-                os.remove(destination_path)
-
-            # Если изделие стандартное
-            if os.path.exists(source_path):
-                shutil.copy2(source_path, destination_path)
-
             # Если изделие нестандартное, то меняем путь к файлу по-умолчанию
-            else:
-                destination_path = PathName.resource_path(
-                    f'settings\\materials')
-                file_new_name = PathName.resource_path(
-                    f'settings\\materials\\{self.name}.ini')
+            if not os.path.exists(source_path):
                 if self.get_laser_type() == 'gas':
                     source_path = PathName.resource_path(
                         'settings\\default\\materials\\default_gas.ini')
-                    file_old_name = PathName.resource_path(
-                        'settings\\materials\\default_gas.ini')
                 else:
                     source_path = PathName.resource_path(
                         'settings\\default\\materials\\default_solid.ini')
-                    file_old_name = PathName.resource_path(
-                        'settings\\materials\\default_solid.ini')
 
-                # Копируем файл в папку назначения
-                shutil.copy(
-                    source_path,
-                    os.path.join(destination_path)
-                )
-
-                # Переименовываем файл
-                os.rename(file_old_name, file_new_name)
+            # Атомарная замена файла (ожидающая запись матрицы отменяется)
+            config_writer.copy(source_path, destination_path)
 
         except Exception as e:
             AppLogger(
@@ -682,3 +1039,198 @@ class Interpolation:
                 f'настроек "По-умолчанию" возникло исключение: {e}',
                 info=True
             )
+
+
+class MaterialComparison:
+    """
+    Класс реализует сравнение стоимости одного изделия из всех материалов
+    базы: количество изделий с листа, себестоимость изделия, потребное
+    количество листов и стоимость изделия (интерполяция по таблице
+    стоимостей материала).
+
+    База материалов и таблицы стоимостей (объекты Interpolation со
+    скомпилированными матрицами) кэшируются на уровне класса и читаются
+    заново только при изменении файлов. Раскрой выполняется один раз для
+    каждого габарита листа (материалы с одинаковыми листами используют
+    общий результат), поэтому таблица сравнения строится практически
+    мгновенно.
+
+    Содержит методы: get_file_state, get_catalogue, get_interpolation,
+    compare.
+
+    Пример использования:
+    rows = MaterialComparison().compare(width, height, quantity)
+    """
+    # Кэш базы материалов: (состояние файла, список материалов)
+    _catalogue = (None, list())
+
+    # Кэш таблиц стоимостей: материал -> (состояние файла, Interpolation)
+    _interpolations = dict()
+
+    def __init__(self):
+        """
+        Инициализация базы материалов и параметров раскроя.
+        """
+        self.catalogue = self.get_catalogue()
+        self.kerf, self.margin = ContainerPacking.get_cutting_settings()
+
+    @staticmethod
+    def get_file_state(relative_path: str) -> tuple | None:
+        """
+        Метод получения состояния файла (время изменения, размер).
+        :param relative_path: Относительный путь к файлу
+        :return: Состояние файла или None, если файл не найден
+        """
+        path = PathName.resource_path(relative_path)
+        config_writer.flush(path)
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    @classmethod
+    def get_catalogue(cls) -> list:
+        """
+        Метод получения базы материалов (с кэшированием по состоянию файла
+        material_data.ini в памяти и в кэше config_cache между запусками).
+        :return: Список материалов (название, ширина листа, высота листа,
+        стоимость листа)
+        """
+        state = cls.get_file_state('settings\\material_data.ini')
+        if state is None or cls._catalogue[0] != state:
+            catalogue = config_cache.get('catalogue', state)
+            if catalogue is None:
+                materials = Materials()
+                widths = materials.get_gab_width()
+                heights = materials.get_gab_height()
+                prices = materials.get_mat_price()
+                catalogue = [(name, widths[name], heights[name],
+                              prices[name]) for name in prices]
+                config_cache.put('catalogue', state, catalogue)
+            cls._catalogue = (state, catalogue)
+        return cls._catalogue[1]
+
+    @classmethod
+    def get_interpolation(cls, name: str) -> Interpolation:
+        """
+        Метод получения таблицы стоимостей материала (с кэшированием по
+        состоянию файла таблицы).
+        :param name: Название материала
+        :return: Объект Interpolation материала
+        """
+        state = cls.get_file_state(f'settings\\materials\\{name}.ini')
+        cached = cls._interpolations.get(name)
+        if state is None or cached is None or cached[0] != state:
+            cached = (state, Interpolation(name))
+            cls._interpolations[name] = cached
+        return cached[1]
+
+    def compare(self, width: int | float, height: int | float,
+                quantity: int, discount: int | float = 0) -> list:
+        """
+        Метод расчета изделия для всех материалов базы.
+        :param width: Ширина изделия
+        :param height: Высота изделия
+        :param quantity: Количество изделий
+        :param discount: Скидка оператора, %
+        :return: Список строк (название, изделий с листа, себестоимость
+        изделия, количество листов, стоимость изделия, стоимость партии).
+        Материалы, на листе которых изделие не помещается, пропускаются.
+        """
+        # Раскрой - один раз для каждого габарита листа
+        counts = dict()
+        for _, sheet_width, sheet_height, _ in self.catalogue:
+            if (sheet_width, sheet_height) not in counts:
+                counts[sheet_width, sheet_height] = packing_cache.get_layout(
+                    sheet_width, sheet_height, width, height, self.kerf,
+                    self.margin).count
+
+        rows = list()
+        for name, sheet_width, sheet_height, price in self.catalogue:
+            count = counts[sheet_width, sheet_height]
+            if not count:
+                continue
+            try:
+                cost = self.get_interpolation(name).get_cost(
+                    height, width, quantity) * (100 - discount) / 100
+            except (SettingsFileError, ValueError, ZeroDivisionError,
+                    KeyError) as e:
+                AppLogger(
+                    'MaterialComparison.compare',
+                    'warning',
+                    f'Материал "{name}" не включен в сравнение: {e}'
+                )
+                continue
+            rows.append((name, count, price / count,
+                         ceil(quantity / count), cost, cost * quantity))
+        return rows
+
+
+class QuantityBreaks:
+    """
+    Класс реализует расчет стоимости партии изделий из выбранного материала
+    для всех количеств от 1 до N. Листы покупаются целиком, поэтому
+    себестоимость изделия скачкообразно меняется на границах листов, а
+    стоимость изделия (интерполяция по таблице стоимостей) - с ростом
+    партии. Отмечаются количества, при которых последний лист заполнен
+    полностью, и количества, начиная с которых снижается стоимость одного
+    изделия для заказчика.
+
+    Содержит методы: calculate.
+
+    Пример использования:
+    rows = QuantityBreaks(material_name, width, height).calculate(1000)
+    """
+    def __init__(self, mat_name: str, width: int | float,
+                 height: int | float):
+        """
+        Инициализация параметров изделия и раскроя листа.
+        :param mat_name: Название материала
+        :param width: Ширина изделия
+        :param height: Высота изделия
+        """
+        self.mat_name = mat_name
+        self.width = width
+        self.height = height
+        packing = ContainerPacking(width, height, mat_name)
+        self.per_sheet = packing.get_quantity()
+        self.price = packing.get_price()
+
+    def calculate(self, max_quantity: int, discount: int | float = 0,
+                  round_method=None) -> list:
+        """
+        Метод расчета стоимости для количеств изделий от 1 до max_quantity.
+        :param max_quantity: Максимальное количество изделий
+        :param discount: Скидка оператора, %
+        :param round_method: Метод округления стоимости изделия (по
+        умолчанию - без округления)
+        :return: Список строк (количество, листов, себестоимость изделия,
+        стоимость изделия, стоимость партии, последний лист заполнен,
+        снижение стоимости изделия). Если изделие не помещается на лист -
+        пустой список.
+        """
+        if not self.per_sheet or max_quantity < 1:
+            return list()
+        numbers = range(1, max_quantity + 1)
+        costs = Interpolation(self.mat_name).get_costs(
+            self.height, self.width, numbers)
+
+        rows = list()
+        previous_cost = None
+        for number, cost in zip(numbers, costs):
+            cost = cost * (100 - discount) / 100
+            if round_method:
+                cost = round_method(cost)
+            sheets = ceil(number / self.per_sheet)
+            rows.append((
+                number, sheets, sheets * self.price / number, cost,
+                cost * number, number % self.per_sheet == 0,
+                previous_cost is not None and cost < previous_cost
+            ))
+            previous_cost = cost
+        return rows
+
+
+# Очистка кэша раскроя при изменении габаритов листов в базе материалов
+event_bus.subscribe(MATERIALS_CHANGED, ContainerPacking.update_cache)
@@ -0,0 +1,496 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует необязательное хранилище базы листового материала и матриц
+стоимостей в базе данных SQLite (стандартная библиотека sqlite3).
+
+Хранилище позволяет выполнять поиск материалов и массовое редактирование
+без чтения и перезаписи десятков файлов .ini, а сброс базы до настроек
+"По-умолчанию" выполняется одной транзакцией. Для совместимости с остальной
+программой предусмотрены однократный импорт из дерева файлов конфигурации
+(settings/material_data.ini, settings/materials/*.ini и их копии
+"По-умолчанию") и экспорт обратно в это дерево.
+
+Программа читает файлы конфигурации, поэтому база редактируется вне окон
+настроек и выгружается в файлы командой из папки приложения:
+python materials_database.py import   - база из файлов конфигурации;
+python materials_database.py export   - файлы конфигурации из базы;
+python materials_database.py reset    - сброс базы до "По-умолчанию".
+Экспорт записывает файлы через config_writer: запущенные экземпляры
+программы и общая папка настроек получают изменения как после сохранения
+в окне настроек.
+
+Модуль содержит класс:
+- MaterialsDatabase - работа с базой листового материала в SQLite.
+
+Также модуль содержит функцию main - точку входа командной строки.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+import configparser
+
+from app_logger import AppLogger
+from config_writer import config_writer
+from path_getting import PathName
+from settings_configuration import SettingsFileError
+from shared_settings import shared_settings
+
+
+class MaterialsDatabase:
+    """
+    Класс реализует хранение списка листового материала и матриц стоимостей
+    изделий в базе данных SQLite.
+
+    Данные хранятся в двух областях (scope): 'current' - рабочие данные
+    программы, 'default' - данные "По-умолчанию" (включая шаблоны матриц
+    default_gas и default_solid для новых материалов).
+
+    Содержит методы: import_from_ini, export_to_ini, get_materials,
+    get_material, get_matrix, set_material, update_prices, delete_material,
+    set_matrix, reset_to_defaults, close.
+
+    Пример использования:
+    database = MaterialsDatabase()
+    database.import_from_ini()
+    database.set_material('пэт 2 мм', 2000, 1250, 2500, 'gas')
+    database.reset_to_defaults()
+    database.export_to_ini()
+    """
+    # Области хранения данных
+    scopes = ('current', 'default')
+
+    def __init__(self, db_path: str | None = None) -> None:
+        """
+        Подключение к базе данных и создание структуры таблиц.
+        :param db_path: Путь к файлу базы данных (по умолчанию
+        settings/materials.db).
+        """
+        self.db_path = db_path if db_path else PathName.resource_path(
+            'settings\\materials.db')
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.create_tables()
+
+    def create_tables(self) -> None:
+        """
+        Метод создания таблиц и индексов базы данных (если их нет).
+        """
+        with self.connection:
+            self.connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS materials (
+                    scope TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    width REAL NOT NULL,
+                    height REAL NOT NULL,
+                    price REAL NOT NULL,
+                    laser_type TEXT NOT NULL,
+                    PRIMARY KEY (scope, name)
+                );
+                CREATE TABLE IF NOT EXISTS matrices (
+                    scope TEXT NOT NULL,
+                    material TEXT NOT NULL,
+                    interpolation TEXT NOT NULL DEFAULT 'linear',
+                    PRIMARY KEY (scope, material)
+                );
+                CREATE TABLE IF NOT EXISTS matrix_rows (
+                    scope TEXT NOT NULL,
+                    material TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    row_name TEXT NOT NULL,
+                    width REAL NOT NULL,
+                    height REAL NOT NULL,
+                    costs TEXT NOT NULL,
+                    PRIMARY KEY (scope, material, position),
+                    FOREIGN KEY (scope, material)
+                        REFERENCES matrices (scope, material)
+                        ON DELETE CASCADE
+                );
+                CREATE INDEX IF NOT EXISTS idx_materials_laser
+                    ON materials (scope, laser_type);
+                CREATE INDEX IF NOT EXISTS idx_matrix_rows_area
+                    ON matrix_rows (scope, material, width, height);
+                """
+            )
+
+    def import_from_ini(self) -> None:
+        """
+        Однократный импорт данных из дерева файлов конфигурации. Все
+        данные базы заменяются одной транзакцией.
+        """
+        sources = {
+            'current': ('settings\\material_data.ini', 'settings\\materials'),
+            'default': ('settings\\default\\material_data.ini',
+                        'settings\\default\\materials')
+        }
+        try:
+            with self.connection:
+                self.connection.execute('DELETE FROM matrix_rows')
+                self.connection.execute('DELETE FROM matrices')
+                self.connection.execute('DELETE FROM materials')
+
+                for scope, (data_file, matrix_dir) in sources.items():
+                    # Список материалов
+                    material_config = self._read_ini(
+                        data_file, ['INFO', 'MAIN'])
+                    for name, value in material_config['MAIN'].items():
+                        self._insert_material(scope, name, value)
+
+                    # Матрицы стоимостей
+                    matrix_path = PathName.resource_path(matrix_dir)
+                    for file_name in sorted(os.listdir(matrix_path)):
+                        if not file_name.endswith('.ini'):
+                            continue
+                        matrix_config = self._read_ini(
+                            f'{matrix_dir}\\{file_name}', ['INFO', 'COSTS'])
+                        self._insert_matrix(scope, file_name[:-4],
+                                            matrix_config)
+        except (sqlite3.Error, ValueError, IndexError, OSError) as e:
+            AppLogger(
+                'MaterialsDatabase.import_from_ini',
+                'error',
+                f'При импорте базы листового материала из файлов '
+                f'конфигурации возникло исключение: {e}',
+                info=True
+            )
+            raise
+
+    def export_to_ini(self) -> None:
+        """
+        Экспорт рабочих данных базы в дерево файлов конфигурации
+        (settings/material_data.ini и settings/materials/*.ini). Файлы
+        матриц материалов, отсутствующих в базе, удаляются. Файлы
+        записываются через config_writer (блокировка файлов, уведомление
+        слушателей и общей папки настроек).
+        """
+        try:
+            # Список материалов
+            material_config = configparser.ConfigParser()
+            material_config['INFO'] = {
+                'info': '"Файл содержит список параметров основного '
+                        'листового материала"'
+            }
+            material_config['MAIN'] = {
+                name: f'{self._format_number(width)}, '
+                      f'{self._format_number(height)}, '
+                      f'{self._format_number(price)}, {laser_type}'
+                for name, (width, height, price, laser_type)
+                in self.get_materials().items()
+            }
+            config_writer.write(
+                PathName.resource_path('settings\\material_data.ini'),
+                material_config)
+
+            # Матрицы стоимостей
+            matrix_dir = PathName.resource_path('settings\\materials')
+            exported = set()
+            for (material, interpolation) in self.connection.execute(
+                    'SELECT material, interpolation FROM matrices '
+                    'WHERE scope = ?', ('current',)).fetchall():
+                matrix_config = configparser.ConfigParser()
+                matrix_config['INFO'] = {
+                    'info': '# Файл содержит матрицу стоимостей материала'
+                }
+                if interpolation != 'linear':
+                    matrix_config['INFO']['interpolation'] = interpolation
+                matrix_config['COSTS'] = {
+                    row_name: ', '.join(str(x) for x in costs)
+                    for row_name, _, _, costs in self.get_matrix(material)
+                }
+                config_writer.write(PathName.resource_path(
+                    f'settings\\materials\\{material}.ini'), matrix_config)
+                exported.add(f'{material}.ini')
+            config_writer.flush()
+
+            for file_name in os.listdir(matrix_dir):
+                if file_name.endswith('.ini') and file_name not in exported:
+                    os.remove(os.path.join(matrix_dir, file_name))
+        except (sqlite3.Error, OSError) as e:
+            AppLogger(
+                'MaterialsDatabase.export_to_ini',
+                'error',
+                f'При экспорте базы листового материала в файлы '
+                f'конфигурации возникло исключение: {e}',
+                info=True
+            )
+            raise
+
+    def get_materials(self, scope: str = 'current') -> dict:
+        """
+        Метод возвращает словарь материалов.
+        :param scope: Область данных ('current' или 'default');
+        :return: Словарь "Название - (ширина, высота, стоимость, тип лазера)"
+        """
+        return {
+            name: (width, height, price, laser_type)
+            for name, width, height, price, laser_type
+            in self.connection.execute(
+                'SELECT name, width, height, price, laser_type '
+                'FROM materials WHERE scope = ? ORDER BY rowid', (scope,))
+        }
+
+    def get_material(self, name: str, scope: str = 'current') -> tuple | None:
+        """
+        Метод возвращает параметры одного материала.
+        :param name: Название материала;
+        :param scope: Область данных ('current' или 'default');
+        :return: Кортеж (ширина, высота, стоимость, тип лазера) или None.
+        """
+        return self.connection.execute(
+            'SELECT width, height, price, laser_type FROM materials '
+            'WHERE scope = ? AND name = ?', (scope, name)).fetchone()
+
+    def get_matrix(self, name: str, scope: str = 'current') -> list:
+        """
+        Метод возвращает матрицу стоимостей материала.
+        :param name: Название материала;
+        :param scope: Область данных ('current' или 'default');
+        :return: Список строк (название, ширина, высота, список стоимостей).
+        """
+        return [
+            (row_name, width, height, [int(x) for x in costs.split(', ')])
+            for row_name, width, height, costs in self.connection.execute(
+                'SELECT row_name, width, height, costs FROM matrix_rows '
+                'WHERE scope = ? AND material = ? ORDER BY position',
+                (scope, name))
+        ]
+
+    def set_material(self, name: str, width: int | float,
+                     height: int | float, price: int | float,
+                     laser_type: str) -> None:
+        """
+        Метод добавления или редактирования материала. Для нового материала
+        матрица стоимостей создается из шаблона для выбранного типа лазера
+        в той же транзакции.
+        :param name: Название материала;
+        :param width: Ширина листа;
+        :param height: Высота листа;
+        :param price: Стоимость листа;
+        :param laser_type: Тип лазера ('solid' или 'gas').
+        """
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO materials '
+                '(scope, name, width, height, price, laser_type) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (scope, name) DO UPDATE SET width = '
+                'excluded.width, height = excluded.height, '
+                'price = excluded.price, laser_type = excluded.laser_type',
+                ('current', name, width, height, price, laser_type))
+
+            # Матрица стоимостей из шаблона
+            if not self.connection.execute(
+                    'SELECT 1 FROM matrices WHERE scope = ? AND material = ?',
+                    ('current', name)).fetchone():
+                template = 'default_gas' if laser_type == 'gas' \
+                    else 'default_solid'
+                self.connection.execute(
+                    'INSERT INTO matrices (scope, material) VALUES (?, ?)',
+                    ('current', name))
+                self.connection.execute(
+                    'INSERT INTO matrix_rows (scope, material, position, '
+                    'row_name, width, height, costs) '
+                    'SELECT ?, ?, position, row_name, width, height, costs '
+                    'FROM matrix_rows WHERE scope = ? AND material = ?',
+                    ('current', name, 'default', template))
+
+    def update_prices(self, prices: dict) -> None:
+        """
+        Метод массового изменения стоимостей листов одной транзакцией.
+        :param prices: Словарь "Название - новая стоимость листа".
+        """
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE materials SET price = ? WHERE scope = ? AND name = ?',
+                [(price, 'current', name) for name, price in prices.items()])
+
+    def delete_material(self, name: str) -> None:
+        """
+        Метод удаления материала вместе с его матрицей стоимостей.
+        :param name: Название материала.
+        """
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM materials WHERE scope = ? AND name = ?',
+                ('current', name))
+            self.connection.execute(
+                'DELETE FROM matrices WHERE scope = ? AND material = ?',
+                ('current', name))
+
+    def set_matrix(self, name: str, rows: list,
+                   interpolation: str = 'linear') -> None:
+        """
+        Метод замены матрицы стоимостей материала.
+        :param name: Название материала;
+        :param rows: Список строк (название, ширина, высота, стоимости);
+        :param interpolation: Режим интерполяции матрицы.
+        """
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM matrices WHERE scope = ? AND material = ?',
+                ('current', name))
+            self.connection.execute(
+                'INSERT INTO matrices (scope, material, interpolation) '
+                'VALUES (?, ?, ?)', ('current', name, interpolation))
+            self.connection.executemany(
+                'INSERT INTO matrix_rows (scope, material, position, '
+                'row_name, width, height, costs) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [('current', name, position, row_name, width, height,
+                  ', '.join(str(int(x)) for x in costs))
+                 for position, (row_name, width, height, costs)
+                 in enumerate(rows)])
+
+    def reset_to_defaults(self) -> None:
+        """
+        Метод сброса рабочих данных до настроек "По-умолчанию" одной
+        транзакцией.
+        """
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM materials WHERE scope = ?', ('current',))
+            self.connection.execute(
+                'DELETE FROM matrices WHERE scope = ?', ('current',))
+            self.connection.execute(
+                'INSERT INTO materials '
+                '(scope, name, width, height, price, laser_type) '
+                'SELECT ?, name, width, height, price, laser_type '
+                'FROM materials WHERE scope = ? ORDER BY rowid',
+                ('current', 'default'))
+            # Шаблоны для типов лазера в рабочие данные не переносятся
+            self.connection.execute(
+                'INSERT INTO matrices (scope, material, interpolation) '
+                'SELECT ?, material, interpolation FROM matrices '
+                'WHERE scope = ? AND material NOT IN (?, ?)',
+                ('current', 'default', 'default_gas', 'default_solid'))
+            self.connection.execute(
+                'INSERT INTO matrix_rows (scope, material, position, '
+                'row_name, width, height, costs) '
+                'SELECT ?, material, position, row_name, width, height, costs '
+                'FROM matrix_rows WHERE scope = ? AND material NOT IN (?, ?)',
+                ('current', 'default', 'default_gas', 'default_solid'))
+
+    def close(self) -> None:
+        """
+        Метод закрытия соединения с базой данных.
+        """
+        self.connection.close()
+
+    def _insert_material(self, scope: str, name: str, value: str) -> None:
+        """
+        Метод добавления строки материала из файла конфигурации.
+        :param scope: Область данных;
+        :param name: Название материала;
+        :param value: Строка параметров "ширина, высота, стоимость, тип".
+        """
+        temp = [x.strip() for x in value.split(',')]
+        self.connection.execute(
+            'INSERT INTO materials '
+            '(scope, name, width, height, price, laser_type) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (scope, name, float(temp[0]), float(temp[1]), float(temp[2]),
+             temp[-1]))
+
+    def _insert_matrix(self, scope: str, name: str,
+                       matrix_config: configparser.ConfigParser) -> None:
+        """
+        Метод добавления матрицы стоимостей из файла конфигурации.
+        :param scope: Область данных;
+        :param name: Название материала (файла стоимостей);
+        :param matrix_config: Переменная конфигурации матрицы.
+        """
+        self.connection.execute(
+            'INSERT INTO matrices (scope, material, interpolation) '
+            'VALUES (?, ?, ?)',
+            (scope, name,
+             matrix_config['INFO'].get('interpolation', 'linear')))
+        for position, (row_name, costs) in enumerate(
+                matrix_config['COSTS'].items()):
+            temp_key = row_name.split(', ')
+            self.connection.execute(
+                'INSERT INTO matrix_rows (scope, material, position, '
+                'row_name, width, height, costs) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (scope, name, position, row_name, float(temp_key[1]),
+                 float(temp_key[2]), costs))
+
+    @staticmethod
+    def _read_ini(relative_path: str,
+                  sections: list) -> configparser.ConfigParser:
+        """
+        Метод чтения файла конфигурации с проверкой его структуры.
+        :param relative_path: Относительный путь к файлу;
+        :param sections: Ожидаемый список разделов файла;
+        :return: Переменная конфигурации.
+        """
+        config = configparser.ConfigParser()
+        config.read(PathName.resource_path(relative_path), encoding='utf-8')
+        if config.sections() != sections:
+            raise SettingsFileError(
+                f'Файл конфигурации {relative_path} нарушен, возможно он '
+                f'был удалён или его структура изменена.',
+                location='MaterialsDatabase._read_ini'
+            )
+        return config
+
+    @staticmethod
+    def _format_number(value: float) -> str:
+        """
+        Метод форматирования числа для записи в файл конфигурации (целые
+        значения записываются без дробной части).
+        :param value: Число;
+        :return: Строковое представление числа.
+        """
+        return f'{value:.0f}' if float(value).is_integer() else f'{value}'
+
+
+def main(argv: list | None = None) -> int:
+    """
+    Точка входа командной строки.
+    :param argv: Аргументы командной строки (по умолчанию - sys.argv)
+    :return: Код завершения (0 - успешно).
+    """
+    parser = argparse.ArgumentParser(
+        description='База листового материала и матриц стоимостей SQLite.')
+    parser.add_argument(
+        'command', choices=('import', 'export', 'reset'),
+        help='import - база из файлов конфигурации, export - файлы '
+             'конфигурации из базы, reset - сброс базы до "По-умолчанию"')
+    parser.add_argument(
+        '--db', default=None,
+        help='Файл базы данных (по умолчанию - settings/materials.db)')
+    args = parser.parse_args(argv)
+
+    shared_settings.setup()
+    try:
+        database = MaterialsDatabase(args.db)
+        try:
+            if args.command == 'import':
+                database.import_from_ini()
+            elif args.command == 'export':
+                database.export_to_ini()
+            else:
+                database.reset_to_defaults()
+            count = len(database.get_materials())
+        finally:
+            database.close()
+    except (sqlite3.Error, OSError, ValueError, IndexError,
+            SettingsFileError) as e:
+        print(f'Ошибка: {e}', file=sys.stderr)
+        return 1
+
+    AppLogger(
+        'materials_database.main',
+        'info',
+        f'База листового материала: команда {args.command} выполнена, '
+        f'материалов - {count}.'
+    )
+    print(f'Материалов в базе: {count}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
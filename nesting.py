@@ -0,0 +1,1066 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует алгоритмы раскроя (размещения) одинаковых прямоугольных
+изделий на листе материала, а также раскроя заказа из изделий разных
+габаритов на несколько листов, с учетом ширины реза и отступа от края листа.
+
+Ширина реза учитывается увеличением габаритов изделия и рабочего поля листа
+на ширину реза: n изделий шириной w с резом k занимают n*w + (n-1)*k, что
+эквивалентно размещению изделий (w + k) на поле (W + k).
+
+Модуль содержит классы:
+- PackingLayout - результат раскроя (количество изделий и схема блоков);
+- GuillotinePacker - гильотинный раскрой с рекурсивным делением остатков
+листа;
+- MaxRectsPacker - раскрой по алгоритму MaxRects (свободные максимальные
+прямоугольники);
+- RecursivePartitionPacker - точный (близкий к точному) раскрой рекурсивным
+делением на две и пять частей с ограничением времени расчета;
+- OrderLayout - результат раскроя заказа из изделий разных габаритов;
+- SheetBin - лист заказа со свободными прямоугольниками MaxRects и сеточным
+индексом;
+- OrderPacker - раскрой заказа на минимальное количество листов (First Fit
+Decreasing и MaxRects).
+
+Также модуль содержит функции: best_packing - выбор лучшего раскроя,
+find_remnants - поиск остатков (обрезков) листа после раскроя.
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from math import ceil
+from time import perf_counter
+
+
+class PackingLayout:
+    """
+    Класс результата раскроя. Схема хранится блоками одинаково
+    ориентированных изделий, поэтому даже для тысяч изделий на листе схема
+    остается компактной.
+
+    Блок - кортеж (x, y, столбцы, строки, ширина изделия, высота изделия),
+    координаты указаны от левого нижнего угла листа в мм.
+
+    Содержит методы: get_placements, get_remnants.
+
+    Пример использования:
+    layout = GuillotinePacker(2000, 1250, kerf=1, margin=10).pack(100, 50)
+    count = layout.count
+    """
+    def __init__(self, count: int, blocks: list, algorithm: str,
+                 kerf: int | float = 0) -> None:
+        """
+        Инициализация результата раскроя.
+        :param count: Количество изделий на листе;
+        :param blocks: Список блоков изделий;
+        :param algorithm: Название алгоритма раскроя;
+        :param kerf: Ширина реза.
+        """
+        self.count = count
+        self.blocks = blocks
+        self.algorithm = algorithm
+        self.kerf = kerf
+
+    def get_placements(self):
+        """
+        Генератор координат всех изделий раскроя.
+        :return: Кортежи (x, y, ширина, высота) для каждого изделия.
+        """
+        for x, y, columns, rows, width, height in self.blocks:
+            for i in range(columns):
+                for j in range(rows):
+                    yield (x + i * (width + self.kerf),
+                           y + j * (height + self.kerf), width, height)
+
+    def get_remnants(self, sheet_width: int | float,
+                     sheet_height: int | float, margin: int | float = 0,
+                     min_side: int | float = 0) -> list:
+        """
+        Метод получения остатков (обрезков) листа после раскроя.
+        :param sheet_width: Ширина листа;
+        :param sheet_height: Высота листа;
+        :param margin: Отступ от края листа;
+        :param min_side: Минимальная сторона используемого обрезка;
+        :return: Список непересекающихся обрезков (x, y, ширина, высота).
+        """
+        occupied = [(x, y, columns * (width + self.kerf) - self.kerf,
+                     rows * (height + self.kerf) - self.kerf)
+                    for x, y, columns, rows, width, height in self.blocks]
+        return find_remnants(sheet_width, sheet_height, occupied, self.kerf,
+                             margin, min_side)
+
+
+class GuillotinePacker:
+    """
+    Класс гильотинного раскроя одинаковых изделий. В углу листа (или его
+    части) размещается блок изделий одной ориентации, а оставшаяся
+    Г-образная часть делится одним из двух гильотинных резов на две
+    прямоугольные части, которые заполняются рекурсивно. Результаты для
+    частей одинаковых размеров запоминаются.
+
+    Для каждой части перебирается не более max_steps вариантов количества
+    столбцов и строк блока, а часть, в которой помещается только одна
+    ориентация изделия, рассчитывается сразу (сетка изделий). Расчет
+    ограничен по времени (time_budget): по истечении времени для
+    оставшихся частей используется только наибольший блок, поэтому расчет
+    занимает миллисекунды и для мелких изделий.
+
+    Содержит методы: pack.
+
+    Пример использования:
+    layout = GuillotinePacker(sheet_width, sheet_height, kerf, margin).pack(
+        part_width, part_height)
+    """
+    algorithm = 'guillotine'
+
+    # Ограничение времени расчета по умолчанию, с
+    time_budget = 0.2
+
+    # Наибольшее количество перебираемых вариантов столбцов (строк) блока
+    max_steps = 8
+
+    def __init__(self, width: int | float, height: int | float,
+                 kerf: int | float = 0, margin: int | float = 0,
+                 time_budget: int | float | None = None) -> None:
+        """
+        Инициализация параметров листа.
+        :param width: Ширина листа;
+        :param height: Высота листа;
+        :param kerf: Ширина реза;
+        :param margin: Отступ от края листа;
+        :param time_budget: Ограничение времени расчета, с.
+        """
+        self.width = width
+        self.height = height
+        self.kerf = kerf
+        self.margin = margin
+        if time_budget is not None:
+            self.time_budget = time_budget
+        self.orientations = tuple()
+        self.memo = dict()
+        self.deadline = 0.0
+
+    def pack(self, part_width: int | float,
+             part_height: int | float) -> PackingLayout:
+        """
+        Метод раскроя листа.
+        :param part_width: Ширина изделия;
+        :param part_height: Высота изделия;
+        :return: Результат раскроя.
+        """
+        field_width = self.width - 2 * self.margin + self.kerf
+        field_height = self.height - 2 * self.margin + self.kerf
+        if part_width <= 0 or part_height <= 0:
+            return PackingLayout(0, [], self.algorithm, self.kerf)
+
+        # Эффективные габариты изделия в двух ориентациях
+        self.orientations = ((part_width + self.kerf,
+                              part_height + self.kerf),)
+        if part_width != part_height:
+            self.orientations += ((part_height + self.kerf,
+                                   part_width + self.kerf),)
+        self.memo = dict()
+        self.deadline = perf_counter() + self.time_budget
+
+        count = self._fill(field_width, field_height)
+        blocks = list()
+        self._collect(field_width, field_height, self.margin, self.margin,
+                      blocks)
+        return PackingLayout(count, blocks, self.algorithm, self.kerf)
+
+    def _fill(self, width: float, height: float) -> int:
+        """
+        Рекурсивный расчет максимального количества изделий в
+        прямоугольнике.
+        :param width: Эффективная ширина прямоугольника;
+        :param height: Эффективная высота прямоугольника;
+        :return: Количество изделий.
+        """
+        key = (width, height)
+        if key in self.memo:
+            return self.memo[key][0]
+
+        best_count, best_plan = 0, None
+        upper_bound = int(width * height // (
+            self.orientations[0][0] * self.orientations[0][1]))
+
+        # Если помещается только одна ориентация изделия, лучший раскрой -
+        # сетка изделий (остатки по обеим сторонам меньше изделия)
+        fits = [index for index, (part_w, part_h)
+                in enumerate(self.orientations)
+                if part_w <= width and part_h <= height]
+        if len(fits) < 2:
+            if fits:
+                part_w, part_h = self.orientations[fits[0]]
+                columns, rows = int(width // part_w), int(height // part_h)
+                best_count = columns * rows
+                best_plan = (fits[0], columns, rows, 'vertical')
+            self.memo[key] = (best_count, best_plan)
+            return best_count
+
+        # По истечении времени расчета перебирается только наибольший блок
+        steps = self.max_steps if perf_counter() <= self.deadline else 1
+
+        for index, (part_w, part_h) in enumerate(self.orientations):
+            columns_max = int(width // part_w)
+            rows_max = int(height // part_h)
+            if columns_max == 0 or rows_max == 0:
+                continue
+
+            # Уменьшение блока имеет смысл, пока освобожденное место
+            # может вместить изделие в другой ориентации
+            other_w, other_h = self.orientations[-1 - index]
+            columns_min = max(1, columns_max - ceil(other_w / part_w),
+                              columns_max - steps + 1)
+            rows_min = max(1, rows_max - ceil(other_h / part_h),
+                           rows_max - steps + 1)
+
+            for columns in range(columns_max, columns_min - 1, -1):
+                for rows in range(rows_max, rows_min - 1, -1):
+                    block_w = columns * part_w
+                    block_h = rows * part_h
+                    block = columns * rows
+                    rest_w = width - block_w
+                    rest_h = height - block_h
+
+                    # Вертикальный рез: правая часть на всю высоту
+                    count = block + self._fill(rest_w, height) + self._fill(
+                        block_w, rest_h)
+                    if count > best_count:
+                        best_count = count
+                        best_plan = (index, columns, rows, 'vertical')
+
+                    # Горизонтальный рез: верхняя часть на всю ширину
+                    count = block + self._fill(rest_w, block_h) + self._fill(
+                        width, rest_h)
+                    if count > best_count:
+                        best_count = count
+                        best_plan = (index, columns, rows, 'horizontal')
+
+                    if best_count >= upper_bound:
+                        break
+                if best_count >= upper_bound:
+                    break
+
+        self.memo[key] = (best_count, best_plan)
+        return best_count
+
+    def _collect(self, width: float, height: float, x: float, y: float,
+                 blocks: list) -> None:
+        """
+        Рекурсивное восстановление схемы раскроя по запомненным решениям.
+        :param width: Эффективная ширина прямоугольника;
+        :param height: Эффективная высота прямоугольника;
+        :param x: Координата левого нижнего угла по горизонтали;
+        :param y: Координата левого нижнего угла по вертикали;
+        :param blocks: Список блоков, в который добавляется схема.
+        """
+        plan = self.memo.get((width, height), (0, None))[1]
+        if plan is None:
+            return
+
+        index, columns, rows, cut = plan
+        part_w, part_h = self.orientations[index]
+        block_w, block_h = columns * part_w, rows * part_h
+        blocks.append((x, y, columns, rows, part_w - self.kerf,
+                       part_h - self.kerf))
+
+        if cut == 'vertical':
+            self._collect(width - block_w, height, x + block_w, y, blocks)
+            self._collect(block_w, height - block_h, x, y + block_h, blocks)
+        else:
+            self._collect(width - block_w, block_h, x + block_w, y, blocks)
+            self._collect(width, height - block_h, x, y + block_h, blocks)
+
+
+class MaxRectsPacker:
+    """
+    Класс раскроя по алгоритму MaxRects: список свободных максимальных
+    прямоугольников листа, изделие размещается в свободный прямоугольник
+    по правилу наилучшего совпадения короткой стороны (Best Short Side Fit)
+    в любой из двух ориентаций. Алгоритм не ограничен гильотинными резами,
+    но размещает изделия по одному, поэтому применяется при умеренном
+    количестве изделий на листе (не более max_items).
+
+    Содержит методы: pack.
+
+    Пример использования:
+    layout = MaxRectsPacker(sheet_width, sheet_height, kerf, margin).pack(
+        part_width, part_height)
+    """
+    algorithm = 'maxrects'
+
+    # Максимальное количество изделий на листе для алгоритма
+    max_items = 300
+
+    def __init__(self, width: int | float, height: int | float,
+                 kerf: int | float = 0, margin: int | float = 0) -> None:
+        """
+        Инициализация параметров листа.
+        :param width: Ширина листа;
+        :param height: Высота листа;
+        :param kerf: Ширина реза;
+        :param margin: Отступ от края листа.
+        """
+        self.width = width
+        self.height = height
+        self.kerf = kerf
+        self.margin = margin
+
+    def pack(self, part_width: int | float,
+             part_height: int | float) -> PackingLayout | None:
+        """
+        Метод раскроя листа.
+        :param part_width: Ширина изделия;
+        :param part_height: Высота изделия;
+        :return: Результат раскроя или None, если изделий на листе больше,
+        чем max_items.
+        """
+        field_width = self.width - 2 * self.margin + self.kerf
+        field_height = self.height - 2 * self.margin + self.kerf
+        if part_width <= 0 or part_height <= 0:
+            return PackingLayout(0, [], self.algorithm, self.kerf)
+        part_w, part_h = part_width + self.kerf, part_height + self.kerf
+        if field_width * field_height // (part_w * part_h) > self.max_items:
+            return None
+
+        free = [(0, 0, field_width, field_height)]
+        blocks = list()
+        while True:
+            placement = self._find_position(free, part_w, part_h)
+            if placement is None:
+                break
+            x, y, width, height = placement
+            blocks.append((x + self.margin, y + self.margin, 1, 1,
+                           width - self.kerf, height - self.kerf))
+            free = self._split(free, placement)
+        return PackingLayout(len(blocks), blocks, self.algorithm, self.kerf)
+
+    @staticmethod
+    def _find_position(free: list, part_w: float,
+                       part_h: float) -> tuple | None:
+        """
+        Метод выбора свободного прямоугольника для изделия (Best Short Side
+        Fit, при равенстве - нижнее левое положение).
+        :param free: Список свободных прямоугольников;
+        :param part_w: Эффективная ширина изделия;
+        :param part_h: Эффективная высота изделия;
+        :return: Размещение (x, y, ширина, высота) или None.
+        """
+        best, best_score = None, None
+        for x, y, width, height in free:
+            for w, h in ((part_w, part_h), (part_h, part_w)):
+                if w <= width and h <= height:
+                    score = (min(width - w, height - h),
+                             max(width - w, height - h), y, x)
+                    if best_score is None or score < best_score:
+                        best, best_score = (x, y, w, h), score
+        return best
+
+    @staticmethod
+    def _split(free: list, used: tuple) -> list:
+        """
+        Метод деления свободных прямоугольников, пересекающихся с
+        размещенным изделием, и удаления вложенных прямоугольников.
+        :param free: Список свободных прямоугольников;
+        :param used: Размещение изделия (x, y, ширина, высота);
+        :return: Новый список свободных прямоугольников.
+        """
+        ux, uy, uw, uh = used
+        result = list()
+        for rect in free:
+            x, y, width, height = rect
+            if (ux >= x + width or ux + uw <= x or
+                    uy >= y + height or uy + uh <= y):
+                result.append(rect)
+                continue
+            if ux > x:
+                result.append((x, y, ux - x, height))
+            if ux + uw < x + width:
+                result.append((ux + uw, y, x + width - ux - uw, height))
+            if uy > y:
+                result.append((x, y, width, uy - y))
+            if uy + uh < y + height:
+                result.append((x, uy + uh, width, y + height - uy - uh))
+
+        # Удаление прямоугольников, вложенных в другие
+        result.sort(key=lambda r: r[2] * r[3], reverse=True)
+        pruned = list()
+        for x, y, width, height in result:
+            if not any(px <= x and py <= y and x + width <= px + pw and
+                       y + height <= py + ph for px, py, pw, ph in pruned):
+                pruned.append((x, y, width, height))
+        return pruned
+
+
+class RecursivePartitionPacker:
+    """
+    Класс точного (или близкого к точному) раскроя одинаковых изделий
+    методом рекурсивного деления прямоугольника (Birgin, Lobato, Morabito):
+    прямоугольник делится гильотинным резом на две части или негильотинным
+    делением первого порядка на пять частей, части заполняются рекурсивно.
+    Положения резов перебираются только по нормальным точкам (комбинациям
+    габаритов изделия), габариты частей приводятся к нормальным точкам.
+
+    Таблица решений для частей листа хранится по габаритам изделия и
+    используется повторно последующими расчетами (для других листов и
+    отступов), поэтому повторные запросы выполняются быстрее. Расчет
+    ограничен по времени (time_budget): по истечении времени возвращается
+    лучший найденный раскрой, а незавершенные решения в общую таблицу не
+    сохраняются.
+
+    Содержит методы: pack.
+
+    Пример использования:
+    layout = RecursivePartitionPacker(sheet_width, sheet_height, kerf,
+                                      margin, time_budget=1).pack(
+        part_width, part_height)
+    """
+    algorithm = 'recursive'
+
+    # Ограничение времени расчета по умолчанию, с
+    time_budget = 1.0
+
+    # Максимальное количество изделий на листе и количество изделий по
+    # стороне листа (ограничение глубины рекурсии)
+    max_items = 1000
+    max_items_per_side = 300
+
+    # Максимальное количество изделий в части листа, для которой
+    # перебираются деления на пять частей
+    five_block_items = 150
+
+    # Общие таблицы решений: габариты изделия -> {(ширина, высота): решение}
+    max_tables = 32
+    _tables = OrderedDict()
+
+    def __init__(self, width: int | float, height: int | float,
+                 kerf: int | float = 0, margin: int | float = 0,
+                 time_budget: int | float | None = None) -> None:
+        """
+        Инициализация параметров листа.
+        :param width: Ширина листа;
+        :param height: Высота листа;
+        :param kerf: Ширина реза;
+        :param margin: Отступ от края листа;
+        :param time_budget: Ограничение времени расчета, с.
+        """
+        self.width = width
+        self.height = height
+        self.kerf = kerf
+        self.margin = margin
+        if time_budget is not None:
+            self.time_budget = time_budget
+        self.parts = tuple()
+        self.normal = list()
+        self.memo = dict()
+        self.table = dict()
+        self.raster = dict()
+        self.deadline = 0.0
+        self.complete = True
+
+    def pack(self, part_width: int | float,
+             part_height: int | float) -> PackingLayout | None:
+        """
+        Метод раскроя листа.
+        :param part_width: Ширина изделия;
+        :param part_height: Высота изделия;
+        :return: Результат раскроя или None, если изделий на листе больше
+        допустимого для метода количества.
+        """
+        field_width = self.width - 2 * self.margin + self.kerf
+        field_height = self.height - 2 * self.margin + self.kerf
+        if part_width <= 0 or part_height <= 0:
+            return PackingLayout(0, [], self.algorithm, self.kerf)
+
+        # Эффективные габариты изделия (меньший габарит - первый)
+        short = round(min(part_width, part_height) + self.kerf, 6)
+        long = round(max(part_width, part_height) + self.kerf, 6)
+        if (field_width * field_height // (short * long) > self.max_items or
+                max(field_width, field_height) / short >
+                self.max_items_per_side):
+            return None
+        self.parts = ((short, long),) if short == long else (
+            (short, long), (long, short))
+
+        # Общая таблица решений для изделия
+        tables = RecursivePartitionPacker._tables
+        self.table = tables.setdefault((short, long), dict())
+        tables.move_to_end((short, long))
+        while len(tables) > self.max_tables:
+            tables.popitem(last=False)
+
+        # Нормальные точки: суммы i * short + j * long
+        limit = max(field_width, field_height) + 1e-9
+        points = set()
+        for i in range(int(limit // short) + 1):
+            rest = limit - i * short
+            for j in range(int(rest // long) + 1):
+                points.add(round(i * short + j * long, 6))
+        self.normal = sorted(points)
+        self.memo = dict()
+        self.raster = dict()
+        self.complete = True
+        self.deadline = perf_counter() + self.time_budget
+
+        width, height = (self._normalize(field_width),
+                         self._normalize(field_height))
+        count = self._solve(width, height)
+        blocks = list()
+        self._collect(width, height, self.margin, self.margin, blocks)
+        return PackingLayout(count, blocks, self.algorithm, self.kerf)
+
+    def _normalize(self, length: float) -> float:
+        """
+        Метод приведения длины к наибольшей нормальной точке, не
+        превышающей ее (количество изделий в прямоугольнике не меняется).
+        :param length: Длина стороны;
+        :return: Нормальная точка.
+        """
+        return self.normal[bisect_right(self.normal, length + 1e-9) - 1]
+
+    def _cuts(self, length: float) -> list:
+        """
+        Метод получения положений резов вдоль стороны: нормальные точки,
+        после реза по которым остаток стороны также приводится к
+        нормальной точке (растровые точки).
+        :param length: Длина стороны (нормальная точка);
+        :return: Отсортированный список положений резов.
+        """
+        if length not in self.raster:
+            end = bisect_right(self.normal, length + 1e-9)
+            points = {self._normalize(length - x)
+                      for x in self.normal[1:end]}
+            points.discard(0)
+            points.discard(length)
+            self.raster[length] = sorted(points)
+        return self.raster[length]
+
+    def _bound(self, width: float, height: float) -> int:
+        """
+        Верхняя оценка количества изделий в прямоугольнике (по площади).
+        :param width: Ширина прямоугольника;
+        :param height: Высота прямоугольника;
+        :return: Верхняя оценка.
+        """
+        short, long = self.parts[0]
+        if width < short or height < short or max(width, height) < long:
+            return 0
+        return int(width * height / (short * long) + 1e-9)
+
+    def _solve(self, width: float, height: float) -> int:
+        """
+        Рекурсивный расчет максимального количества изделий в
+        прямоугольнике с нормальными габаритами.
+        :param width: Ширина прямоугольника;
+        :param height: Высота прямоугольника;
+        :return: Количество изделий.
+        """
+        key = (width, height)
+        if key in self.table:
+            return self.table[key][0]
+        if key in self.memo:
+            return self.memo[key][0]
+
+        upper_bound = self._bound(width, height)
+        best_count, best_plan = 0, None
+
+        # Однородный блок изделий одной ориентации
+        for index, (part_w, part_h) in enumerate(self.parts):
+            count = int(width // part_w) * int(height // part_h)
+            if count > best_count:
+                best_count = count
+                best_plan = ('block', index, int(width // part_w),
+                             int(height // part_h))
+
+        complete = perf_counter() <= self.deadline
+        if complete and 0 < best_count < upper_bound:
+            # Гильотинные резы (до середины стороны в силу симметрии)
+            for x in self._cuts(width):
+                if x > width / 2 or best_count >= upper_bound:
+                    break
+                rest = self._normalize(width - x)
+                if self._bound(x, height) + self._bound(
+                        rest, height) <= best_count:
+                    continue
+                count = self._solve(x, height) + self._solve(rest, height)
+                if count > best_count:
+                    best_count, best_plan = count, ('vertical', x)
+            for y in self._cuts(height):
+                if y > height / 2 or best_count >= upper_bound:
+                    break
+                rest = self._normalize(height - y)
+                if self._bound(width, y) + self._bound(
+                        width, rest) <= best_count:
+                    continue
+                count = self._solve(width, y) + self._solve(width, rest)
+                if count > best_count:
+                    best_count, best_plan = count, ('horizontal', y)
+
+            # Деление на пять частей (негильотинный раскрой)
+            if best_count < upper_bound <= self.five_block_items:
+                best_count, best_plan, complete = self._five_block(
+                    width, height, best_count, best_plan, upper_bound)
+
+        if not complete or perf_counter() > self.deadline:
+            self.complete = False
+        if self.complete:
+            self.table[key] = (best_count, best_plan)
+        else:
+            self.memo[key] = (best_count, best_plan)
+        return best_count
+
+    def _five_block(self, width: float, height: float, best_count: int,
+                    best_plan: tuple, upper_bound: int) -> tuple:
+        """
+        Метод перебора делений прямоугольника на пять частей: части
+        (x1, y2), (W - x1, y1), (x2 - x1, y2 - y1), (x2, H - y2),
+        (W - x2, H - y1), где 0 < x1 < x2 < W, 0 < y1 < y2 < H.
+        :param width: Ширина прямоугольника;
+        :param height: Высота прямоугольника;
+        :param best_count: Лучшее найденное количество изделий;
+        :param best_plan: Лучшее найденное решение;
+        :param upper_bound: Верхняя оценка количества изделий;
+        :return: Кортеж (количество, решение, признак завершения перебора).
+        """
+        norm, bound, solve = self._normalize, self._bound, self._solve
+        cuts_x, cuts_y = self._cuts(width), self._cuts(height)
+        for i, x1 in enumerate(cuts_x):
+            for x2 in cuts_x[i + 1:]:
+                for j, y1 in enumerate(cuts_y):
+                    for y2 in cuts_y[j + 1:]:
+                        if perf_counter() > self.deadline:
+                            return best_count, best_plan, False
+                        blocks = (
+                            (x1, y2), (norm(width - x1), y1),
+                            (norm(x2 - x1), norm(y2 - y1)),
+                            (x2, norm(height - y2)),
+                            (norm(width - x2), norm(height - y1))
+                        )
+                        if sum(bound(w, h) for w, h in blocks) <= best_count:
+                            continue
+                        count = sum(solve(w, h) for w, h in blocks)
+                        if count > best_count:
+                            best_count = count
+                            best_plan = ('five', x1, x2, y1, y2)
+                            if best_count >= upper_bound:
+                                return best_count, best_plan, True
+        return best_count, best_plan, True
+
+    def _collect(self, width: float, height: float, x: float, y: float,
+                 blocks: list) -> None:
+        """
+        Рекурсивное восстановление схемы раскроя по запомненным решениям.
+        :param width: Ширина прямоугольника;
+        :param height: Высота прямоугольника;
+        :param x: Координата левого нижнего угла по горизонтали;
+        :param y: Координата левого нижнего угла по вертикали;
+        :param blocks: Список блоков, в который добавляется схема.
+        """
+        key = (width, height)
+        solution = self.table.get(key) or self.memo.get(key)
+        if solution is None or solution[1] is None:
+            return
+        plan = solution[1]
+        norm = self._normalize
+
+        if plan[0] == 'block':
+            part_w, part_h = self.parts[plan[1]]
+            blocks.append((x, y, plan[2], plan[3], part_w - self.kerf,
+                           part_h - self.kerf))
+        elif plan[0] == 'vertical':
+            self._collect(plan[1], height, x, y, blocks)
+            self._collect(norm(width - plan[1]), height, x + plan[1], y,
+                          blocks)
+        elif plan[0] == 'horizontal':
+            self._collect(width, plan[1], x, y, blocks)
+            self._collect(width, norm(height - plan[1]), x, y + plan[1],
+                          blocks)
+        else:
+            x1, x2, y1, y2 = plan[1:]
+            self._collect(x1, y2, x, y, blocks)
+            self._collect(norm(width - x1), y1, x + x1, y, blocks)
+            self._collect(norm(x2 - x1), norm(y2 - y1), x + x1, y + y1,
+                          blocks)
+            self._collect(x2, norm(height - y2), x, y + y2, blocks)
+            self._collect(norm(width - x2), norm(height - y1), x + x2,
+                          y + y1, blocks)
+
+
+class OrderLayout:
+    """
+    Класс результата раскроя заказа из изделий разных габаритов на
+    несколько листов одного материала.
+
+    Изделие на листе - кортеж (x, y, ширина, высота, номер строки заказа),
+    координаты указаны от левого нижнего угла листа в мм.
+
+    Содержит методы: get_sheet_count, get_part_count, get_utilization,
+    get_remnants.
+
+    Пример использования:
+    layout = OrderPacker(2000, 1250, kerf=1, margin=10).pack(
+        [(100, 50, 300), (250, 120, 40)])
+    sheets = layout.get_sheet_count()
+    """
+    def __init__(self, sheets: list, unplaced: list,
+                 sheet_width: int | float, sheet_height: int | float,
+                 kerf: int | float = 0, margin: int | float = 0) -> None:
+        """
+        Инициализация результата раскроя заказа.
+        :param sheets: Список листов (списков размещенных изделий);
+        :param unplaced: Список строк заказа (номер, количество), изделия
+        которых не помещаются на лист;
+        :param sheet_width: Ширина листа;
+        :param sheet_height: Высота листа;
+        :param kerf: Ширина реза;
+        :param margin: Отступ от края листа.
+        """
+        self.sheets = sheets
+        self.unplaced = unplaced
+        self.sheet_width = sheet_width
+        self.sheet_height = sheet_height
+        self.kerf = kerf
+        self.margin = margin
+
+    def get_sheet_count(self) -> int:
+        """
+        Метод получения количества листов на заказ.
+        :return: Количество листов.
+        """
+        return len(self.sheets)
+
+    def get_part_count(self) -> int:
+        """
+        Метод получения количества размещенных изделий.
+        :return: Количество изделий.
+        """
+        return sum(len(sheet) for sheet in self.sheets)
+
+    def get_utilization(self) -> float:
+        """
+        Метод получения доли использования площади листов.
+        :return: Отношение площади изделий к площади листов (от 0 до 1).
+        """
+        if not self.sheets:
+            return 0.0
+        used = sum(w * h for sheet in self.sheets for _, _, w, h, _ in sheet)
+        return used / (len(self.sheets) * self.sheet_width * self.sheet_height)
+
+    def get_remnants(self, index: int, min_side: int | float = 0) -> list:
+        """
+        Метод получения остатков (обрезков) листа заказа после раскроя.
+        :param index: Номер листа (с нуля);
+        :param min_side: Минимальная сторона используемого обрезка;
+        :return: Список непересекающихся обрезков (x, y, ширина, высота).
+        """
+        occupied = [(x, y, w, h) for x, y, w, h, _ in self.sheets[index]]
+        return find_remnants(self.sheet_width, self.sheet_height, occupied,
+                             self.kerf, self.margin, min_side)
+
+
+class SheetBin:
+    """
+    Класс листа для раскроя заказа по алгоритму MaxRects. Свободные
+    максимальные прямоугольники листа индексируются равномерной сеткой,
+    поэтому при размещении изделия проверяются только прямоугольники из
+    ячеек сетки, пересекающихся с изделием. Габариты изделий, не
+    поместившихся на лист, запоминаются: свободное место листа только
+    уменьшается, поэтому изделия не меньших габаритов на лист больше не
+    проверяются.
+
+    Содержит методы: insert.
+
+    Пример использования:
+    sheet = SheetBin(field_width, field_height, cell=100, min_side=10)
+    position = sheet.insert(part_w, part_h)
+    """
+    def __init__(self, width: float, height: float, cell: float,
+                 min_side: float = 0) -> None:
+        """
+        Инициализация свободного поля листа.
+        :param width: Ширина поля листа;
+        :param height: Высота поля листа;
+        :param cell: Размер ячейки сетки индекса;
+        :param min_side: Минимальная сторона изделий заказа (свободные
+        прямоугольники с меньшей стороной не запоминаются).
+        """
+        self.cell = cell
+        self.min_side = min_side
+        self.free = dict()
+        self.grid = dict()
+        self.next_id = 0
+        self.failed = list()
+        self._add((0, 0, width, height))
+
+    def _cells(self, rect: tuple):
+        """
+        Генератор ячеек сетки, пересекающихся с прямоугольником.
+        :param rect: Прямоугольник (x, y, ширина, высота);
+        :return: Ключи ячеек сетки.
+        """
+        x, y, width, height = rect
+        for i in range(int(x // self.cell),
+                       int((x + width - 1e-9) // self.cell) + 1):
+            for j in range(int(y // self.cell),
+                           int((y + height - 1e-9) // self.cell) + 1):
+                yield i, j
+
+    def _add(self, rect: tuple) -> None:
+        """
+        Метод добавления свободного прямоугольника в индекс.
+        :param rect: Прямоугольник (x, y, ширина, высота).
+        """
+        rect_id = self.next_id
+        self.next_id += 1
+        self.free[rect_id] = rect
+        for key in self._cells(rect):
+            self.grid.setdefault(key, set()).add(rect_id)
+
+    def _remove(self, rect_id: int) -> None:
+        """
+        Метод удаления свободного прямоугольника из индекса.
+        :param rect_id: Идентификатор прямоугольника.
+        """
+        rect = self.free.pop(rect_id)
+        for key in self._cells(rect):
+            self.grid[key].discard(rect_id)
+
+    def insert(self, part_w: float, part_h: float) -> tuple | None:
+        """
+        Метод размещения изделия в свободный прямоугольник по правилу Best
+        Short Side Fit в любой из двух ориентаций.
+        :param part_w: Ширина изделия;
+        :param part_h: Высота изделия;
+        :return: Размещение (x, y, ширина, высота) или None, если изделие
+        не помещается на лист.
+        """
+        short, long = min(part_w, part_h), max(part_w, part_h)
+        for failed_short, failed_long in self.failed:
+            if failed_short <= short and failed_long <= long:
+                return None
+
+        best, best_score = None, None
+        for x, y, width, height in self.free.values():
+            for w, h in ((part_w, part_h), (part_h, part_w)):
+                if w <= width and h <= height:
+                    score = (min(width - w, height - h),
+                             max(width - w, height - h), y, x)
+                    if best_score is None or score < best_score:
+                        best, best_score = (x, y, w, h), score
+        if best is None:
+            self.failed.append((short, long))
+            return None
+        self._split(best)
+        return best
+
+    def _split(self, used: tuple) -> None:
+        """
+        Метод деления свободных прямоугольников, пересекающихся с
+        размещенным изделием, и удаления вложенных прямоугольников.
+        :param used: Размещение изделия (x, y, ширина, высота).
+        """
+        ux, uy, uw, uh = used
+        candidates = set()
+        for key in self._cells(used):
+            candidates.update(self.grid.get(key, ()))
+
+        new_rects = list()
+        for rect_id in candidates:
+            x, y, width, height = self.free[rect_id]
+            if (ux >= x + width or ux + uw <= x or
+                    uy >= y + height or uy + uh <= y):
+                continue
+            self._remove(rect_id)
+            if ux > x:
+                new_rects.append((x, y, ux - x, height))
+            if ux + uw < x + width:
+                new_rects.append((ux + uw, y, x + width - ux - uw, height))
+            if uy > y:
+                new_rects.append((x, y, width, uy - y))
+            if uy + uh < y + height:
+                new_rects.append((x, uy + uh, width, y + height - uy - uh))
+
+        # Новые прямоугольники, в которые не помещается ни одно изделие или
+        # вложенные в другие, не запоминаются
+        new_rects = [r for r in new_rects if min(r[2], r[3]) >= self.min_side]
+        new_rects.sort(key=lambda r: r[2] * r[3], reverse=True)
+        kept = list()
+        for rect in new_rects:
+            x, y, width, height = rect
+            if any(px <= x and py <= y and x + width <= px + pw and
+                   y + height <= py + ph for px, py, pw, ph in kept):
+                continue
+            key = (int(x // self.cell), int(y // self.cell))
+            if any(px <= x and py <= y and x + width <= px + pw and
+                   y + height <= py + ph for px, py, pw, ph in
+                   (self.free[i] for i in self.grid.get(key, ()))):
+                continue
+            kept.append(rect)
+        for rect in kept:
+            self._add(rect)
+
+
+class OrderPacker:
+    """
+    Класс раскроя заказа из изделий разных габаритов на минимальное
+    количество листов одного материала: изделия упорядочиваются по
+    убыванию площади (First Fit Decreasing) и размещаются на первый лист,
+    на котором для них есть место (алгоритм MaxRects с сеточным индексом
+    свободных прямоугольников).
+
+    Содержит методы: pack.
+
+    Пример использования:
+    layout = OrderPacker(sheet_width, sheet_height, kerf, margin).pack(
+        [(width_1, height_1, quantity_1), (width_2, height_2, quantity_2)])
+    """
+    # Количество ячеек сеточного индекса по большей стороне листа
+    grid_size = 8
+
+    def __init__(self, width: int | float, height: int | float,
+                 kerf: int | float = 0, margin: int | float = 0) -> None:
+        """
+        Инициализация параметров листа.
+        :param width: Ширина листа;
+        :param height: Высота листа;
+        :param kerf: Ширина реза;
+        :param margin: Отступ от края листа.
+        """
+        self.width = width
+        self.height = height
+        self.kerf = kerf
+        self.margin = margin
+
+    def pack(self, lines: list) -> OrderLayout:
+        """
+        Метод раскроя заказа.
+        :param lines: Список строк заказа (ширина, высота, количество);
+        :return: Результат раскроя заказа.
+        """
+        field_width = self.width - 2 * self.margin + self.kerf
+        field_height = self.height - 2 * self.margin + self.kerf
+
+        # Строки заказа по убыванию площади изделия
+        order = list()
+        unplaced = list()
+        for index, (width, height, quantity) in enumerate(lines):
+            part_w, part_h = width + self.kerf, height + self.kerf
+            if quantity <= 0 or width <= 0 or height <= 0:
+                continue
+            if not ((part_w <= field_width and part_h <= field_height) or
+                    (part_h <= field_width and part_w <= field_height)):
+                unplaced.append((index, quantity))
+                continue
+            order.append((part_w, part_h, quantity, index))
+        order.sort(key=lambda x: (x[0] * x[1], max(x[0], x[1])),
+                   reverse=True)
+        if not order:
+            return OrderLayout([], unplaced, self.width, self.height,
+                               self.kerf, self.margin)
+
+        # Сетка индекса - не более grid_size ячеек по стороне листа, но не
+        # мельче среднего габарита изделий
+        min_side = min(min(x[0], x[1]) for x in order)
+        cell = max(sum(x[0] + x[1] for x in order) / (2 * len(order)),
+                   max(field_width, field_height) / self.grid_size)
+
+        bins, sheets = list(), list()
+        for part_w, part_h, quantity, index in order:
+            first = 0
+            for _ in range(quantity):
+                # Листы до first уже не вмещают изделие этой строки
+                while first < len(bins):
+                    position = bins[first].insert(part_w, part_h)
+                    if position is not None:
+                        break
+                    first += 1
+                else:
+                    bins.append(SheetBin(field_width, field_height, cell,
+                                         min_side))
+                    sheets.append(list())
+                    position = bins[first].insert(part_w, part_h)
+                x, y, w, h = position
+                sheets[first].append((x + self.margin, y + self.margin,
+                                      w - self.kerf, h - self.kerf, index))
+        return OrderLayout(sheets, unplaced, self.width, self.height,
+                           self.kerf, self.margin)
+
+
+def find_remnants(sheet_width: int | float, sheet_height: int | float,
+                  occupied: list, kerf: int | float = 0,
+                  margin: int | float = 0, min_side: int | float = 0) -> list:
+    """
+    Функция поиска остатков (обрезков) листа после раскроя. Свободное поле
+    листа делится на максимальные свободные прямоугольники (как в алгоритме
+    MaxRects), затем жадно выбираются наибольшие непересекающиеся обрезки
+    (с учетом ширины реза между обрезком и изделиями).
+    :param sheet_width: Ширина листа;
+    :param sheet_height: Высота листа;
+    :param occupied: Список занятых прямоугольников (x, y, ширина, высота);
+    :param kerf: Ширина реза;
+    :param margin: Отступ от края листа;
+    :param min_side: Минимальная сторона используемого обрезка;
+    :return: Список обрезков (x, y, ширина, высота) по убыванию площади.
+    """
+    def usable(rects: list) -> list:
+        return [r for r in rects if min(r[2], r[3]) >= max(min_side, 1e-9)]
+
+    free = [(margin, margin, sheet_width - 2 * margin,
+             sheet_height - 2 * margin)]
+    for x, y, width, height in occupied:
+        free = usable(MaxRectsPacker._split(
+            free, (x - kerf, y - kerf, width + 2 * kerf, height + 2 * kerf)))
+
+    remnants = list()
+    while free:
+        best = max(free, key=lambda r: r[2] * r[3])
+        remnants.append(best)
+        x, y, width, height = best
+        free = usable(MaxRectsPacker._split(
+            free, (x - kerf, y - kerf, width + 2 * kerf, height + 2 * kerf)))
+    return remnants
+
+
+def best_packing(sheet_width: int | float, sheet_height: int | float,
+                 part_width: int | float, part_height: int | float,
+                 kerf: int | float = 0, margin: int | float = 0,
+                 algorithm: str = 'auto',
+                 time_budget: int | float | None = None) -> PackingLayout:
+    """
+    Функция выбора лучшего раскроя листа из доступных алгоритмов.
+    :param sheet_width: Ширина листа;
+    :param sheet_height: Высота листа;
+    :param part_width: Ширина изделия;
+    :param part_height: Высота изделия;
+    :param kerf: Ширина реза;
+    :param margin: Отступ от края листа;
+    :param algorithm: Алгоритм: 'guillotine', 'maxrects', 'recursive',
+    'auto' (лучший из гильотинного и MaxRects) или 'exact' (лучший из всех
+    алгоритмов);
+    :param time_budget: Ограничение времени расчета для алгоритма
+    'recursive', с;
+    :return: Результат раскроя с наибольшим количеством изделий.
+    """
+    packers = {'guillotine': GuillotinePacker, 'maxrects': MaxRectsPacker,
+               'recursive': RecursivePartitionPacker}
+    if algorithm == 'auto':
+        names = ['guillotine', 'maxrects']
+    elif algorithm == 'exact':
+        names = list(packers)
+    else:
+        names = [algorithm]
+
+    best = PackingLayout(0, [], algorithm, kerf)
+    for name in names:
+        if name == 'recursive':
+            packer = RecursivePartitionPacker(
+                sheet_width, sheet_height, kerf, margin, time_budget)
+        else:
+            packer = packers[name](sheet_width, sheet_height, kerf, margin)
+        layout = packer.pack(part_width, part_height)
+        if layout is not None and layout.count > best.count:
+            best = layout
+    return best
@@ -0,0 +1,216 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует кэш результатов раскроя листа. Одни и те же габариты
+изделий (таблички, бирки) рассчитываются многократно, поэтому результаты
+раскроя запоминаются по геометрии листа и изделия и сохраняются между
+запусками программы в файле settings/packing_cache.json.
+
+Модуль содержит класс:
+- PackingCache - кэш результатов раскроя с вытеснением давно не
+используемых записей (LRU).
+
+Также модуль содержит общий экземпляр кэша packing_cache.
+"""
+
+import _thread
+import atexit
+import os
+from collections import OrderedDict
+
+from app_logger import AppLogger
+from lazy_import import lazy_import
+from nesting import PackingLayout, best_packing
+from path_getting import PathName
+
+# Модуль загружается при первом чтении файла кэша
+json = lazy_import('json')
+
+
+class PackingCache:
+    """
+    Класс кэша результатов раскроя листа. Ключ записи - нормализованные
+    параметры раскроя (ширина и высота листа, меньший и больший габарит
+    изделия, ширина реза, отступ от края, алгоритм): изделие может
+    поворачиваться, поэтому его ориентация на результат не влияет.
+
+    Кэш загружается из файла при первом обращении и сохраняется при
+    завершении программы (если были изменения). Записи кэша защищены
+    блокировкой, а раскрой выполняется вне ее, поэтому одновременные
+    расчеты (потоки сервиса расчета) не ожидают друг друга. Записи для листов,
+    удаленных из базы материалов, удаляются методом prune; записи для
+    других листов (обрезков со склада) сохраняются.
+
+    Содержит методы: get_key, get_layout, prune, clear, load, save.
+
+    Пример использования:
+    layout = packing_cache.get_layout(sheet_width, sheet_height, part_width,
+                                      part_height, kerf, margin, 'auto')
+    """
+    # Версия формата файла кэша
+    version = 1
+
+    def __init__(self, file_name: str = 'settings\\packing_cache.json',
+                 max_size: int = 512) -> None:
+        """
+        Инициализация кэша.
+        :param file_name: Относительный путь к файлу кэша;
+        :param max_size: Максимальное количество записей.
+        """
+        self.path = PathName.resource_path(file_name)
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.loaded = False
+        self.changed = False
+        # Габариты листов базы материалов при последней очистке (prune)
+        self.sheets = None
+        # Блокировка создается модулем _thread: модуль threading
+        # импортируется долго
+        self.lock = _thread.allocate_lock()
+        atexit.register(self.save)
+
+    @staticmethod
+    def get_key(sheet_width: int | float, sheet_height: int | float,
+                part_width: int | float, part_height: int | float,
+                kerf: int | float, margin: int | float,
+                algorithm: str) -> tuple:
+        """
+        Метод получения нормализованного ключа записи.
+        :param sheet_width: Ширина листа;
+        :param sheet_height: Высота листа;
+        :param part_width: Ширина изделия;
+        :param part_height: Высота изделия;
+        :param kerf: Ширина реза;
+        :param margin: Отступ от края листа;
+        :param algorithm: Алгоритм раскроя;
+        :return: Ключ записи.
+        """
+        return (round(float(sheet_width), 3), round(float(sheet_height), 3),
+                round(float(min(part_width, part_height)), 3),
+                round(float(max(part_width, part_height)), 3),
+                round(float(kerf), 3), round(float(margin), 3), algorithm)
+
+    def get_layout(self, sheet_width: int | float, sheet_height: int | float,
+                   part_width: int | float, part_height: int | float,
+                   kerf: int | float = 0, margin: int | float = 0,
+                   algorithm: str = 'auto',
+                   time_budget: int | float | None = None) -> PackingLayout:
+        """
+        Метод получения результата раскроя из кэша. При отсутствии записи
+        выполняется расчет (функция nesting.best_packing), результат
+        запоминается.
+        :param sheet_width: Ширина листа;
+        :param sheet_height: Высота листа;
+        :param part_width: Ширина изделия;
+        :param part_height: Высота изделия;
+        :param kerf: Ширина реза;
+        :param margin: Отступ от края листа;
+        :param algorithm: Алгоритм раскроя;
+        :param time_budget: Ограничение времени точного раскроя, с;
+        :return: Результат раскроя.
+        """
+        key = self.get_key(sheet_width, sheet_height, part_width,
+                           part_height, kerf, margin, algorithm)
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        layout = best_packing(sheet_width, sheet_height, part_width,
+                              part_height, kerf, margin, algorithm,
+                              time_budget)
+        with self.lock:
+            self.entries[key] = layout
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            self.changed = True
+        return layout
+
+    def prune(self, sheets: set) -> None:
+        """
+        Метод удаления записей для листов, удаленных из базы материалов
+        после предыдущей очистки. Записи для листов не из базы материалов
+        (обрезки со склада) не удаляются. Кэш записывается в файл при
+        завершении программы.
+        :param sheets: Множество габаритов листов базы (ширина, высота).
+        """
+        valid = {(round(float(w), 3), round(float(h), 3)) for w, h in sheets}
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            if valid == self.sheets:
+                return
+            removed = self.sheets - valid if self.sheets else set()
+            for key in [k for k in self.entries if k[:2] in removed]:
+                del self.entries[key]
+            self.sheets = valid
+            self.changed = True
+
+    def clear(self) -> None:
+        """
+        Метод очистки кэша.
+        """
+        self.entries.clear()
+        self.loaded = True
+        self.changed = True
+        self.save()
+
+    def load(self) -> None:
+        """
+        Метод загрузки кэша из файла. Поврежденный файл или файл другой
+        версии игнорируется.
+        """
+        self.loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') != self.version:
+                return
+            if 'sheets' in data:
+                self.sheets = {tuple(x) for x in data['sheets']}
+            for key, count, algorithm, kerf, blocks in data['entries']:
+                self.entries[tuple(key)] = PackingLayout(
+                    count, [tuple(x) for x in blocks], algorithm, kerf)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.entries.clear()
+            self.sheets = None
+            AppLogger(
+                'PackingCache.load',
+                'warning',
+                f'Файл кэша раскроя не загружен ({e}), кэш будет создан '
+                f'заново.'
+            )
+
+    def save(self) -> None:
+        """
+        Метод сохранения кэша в файл (только при наличии изменений).
+        """
+        if not self.changed:
+            return
+        data = {
+            'version': self.version,
+            'sheets': sorted(self.sheets) if self.sheets else list(),
+            'entries': [
+                [list(key), x.count, x.algorithm, x.kerf, x.blocks]
+                for key, x in self.entries.items()
+            ]
+        }
+        try:
+            with open(self.path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            self.changed = False
+        except OSError as e:
+            AppLogger(
+                'PackingCache.save',
+                'warning',
+                f'Файл кэша раскроя не сохранен: {e}'
+            )
+
+
+# Общий кэш результатов раскроя
+packing_cache = PackingCache()
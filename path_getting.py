@@ -16,11 +16,18 @@ class PathName:
     Класс реализует получение абсолютного пути к ресурсу (файлу),
     для корректной работы приложения и создания исполняемого файла .exe
 
+    Атрибут redirect - функция перенаправления пути (relative_path,
+    абсолютный путь) -> путь. Используется общей папкой настроек
+    (модуль shared_settings): файлы настроек читаются из локальной копии.
+
     Содержит метод: resource_path
 
     Пример использования:
     patho_to_file = PathName.resource_path(relative_path)
     """
+    # Функция перенаправления пути (None - без перенаправления)
+    redirect = None
+
     def __init__(self):
         """
         Get absolute path to resource, works for dev and for PyInstaller
@@ -42,4 +49,7 @@ class PathName:
         except Exception:
             base_path = os.path.abspath(".")
 
-        return os.path.join(base_path, relative_path)
+        path = os.path.join(base_path, relative_path)
+        if PathName.redirect is not None:
+            return PathName.redirect(relative_path, path)
+        return path
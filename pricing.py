@@ -0,0 +1,603 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует расчеты стоимости без графического интерфейса. Вкладки
+главного окна формируют из полей ввода заказ и передают его механизму
+расчета, поэтому те же расчеты могут выполняться пакетно (из файла, по
+сети) без создания окон.
+
+Модуль содержит функции:
+- round_cost - округление стоимости с учетом получившейся суммы;
+- parse_number - преобразование значения поля заказа в конечное число;
+- parse_order - преобразование данных заказа (строки файла, запроса) в
+параметры заказа.
+
+Модуль содержит классы:
+- PersonalOrder - параметры заказа гравировки;
+- PricingConfig - числовые настройки расчета из снимка настроек
+ConfigSnapshot;
+- PriceBreakdown - результат расчета с разбивкой по коэффициентам;
+- PricingEngine - механизм расчета стоимости гравировки;
+- SheetOrder - параметры заказа изделий из листового материала;
+- SheetQuote - результат расчета изделий из листового материала;
+- SheetMaterialEngine - механизм расчета изделий из листового материала;
+- IndustrialEngine - расчет стоимости от времени работы оборудования и
+ориентировочного времени гравировки.
+"""
+
+from dataclasses import dataclass, field, fields
+from math import ceil, isfinite
+
+from app_logger import AppLogger
+from calculations import PiecewiseRatio, RatioArea
+from materials import ContainerPacking, MaterialComparison
+from packing_cache import packing_cache
+from settings_configuration import SettingsFileError
+
+
+# Значения логических полей заказа, означающие "да"
+TRUE_VALUES = ('1', 'true', 'yes', 'да', '+')
+
+
+def round_cost(cost: int | float) -> int:
+    """
+    Функция округления стоимости с учетом получившейся суммы.
+    :param cost: Число, передаваемое для округления.
+    :return: Округленное число
+    """
+    if cost >= 800:
+        return int(round(cost/50) * 50)
+    elif 250 <= cost < 800:
+        return int(round(cost/10) * 10)
+    elif 85 <= cost < 250:
+        return int(round(cost/5) * 5)
+    else:
+        return int(cost)
+
+
+def parse_number(value) -> float:
+    """
+    Функция преобразования значения поля заказа (строки файла, запроса) в
+    число. Бесконечные значения ('inf', 1e400) и 'nan' не принимаются:
+    стоимость из них не рассчитывается.
+    :param value: Значение поля (число или строка)
+    :return: Число.
+    :raises ValueError: Значение не является конечным числом.
+    """
+    number = float(value)
+    if not isfinite(number):
+        raise ValueError(f'недопустимое число: {value}')
+    return number
+
+
+def parse_order(row: dict, order_class):
+    """
+    Функция преобразования строки файла заказов (данных запроса) в
+    параметры заказа. Значения приводятся к типам полей класса заказа,
+    пустые значения и отсутствующие поля заменяются значениями по
+    умолчанию.
+    :param row: Данные заказа (поле -> значение)
+    :param order_class: Класс параметров заказа (PersonalOrder, SheetOrder)
+    :return: Экземпляр класса параметров заказа.
+    """
+    values = dict()
+    for item in fields(order_class):
+        value = row.get(item.name)
+        if value is None or value == '':
+            continue
+        if item.type in ('bool', bool):
+            value = (value if isinstance(value, bool)
+                     else str(value).strip().lower() in TRUE_VALUES)
+        elif item.type in ('int', int):
+            value = int(parse_number(value))
+        elif 'float' in str(item.type):
+            value = parse_number(value)
+        elif item.name == 'product' and value == 'Нет':
+            value = None
+        values[item.name] = value
+    return order_class(**values)
+
+
+@dataclass(slots=True)
+class PersonalOrder:
+    """
+    Класс параметров заказа гравировки (вкладка "Частные лица").
+
+    Пример использования:
+    order = PersonalOrder(laser_type=2, width=100, height=50, number=10)
+    """
+    # Стандартное изделие (None - расчет от минимальной стоимости)
+    product: str | None = None
+    # Тип лазера: 1 - твердотельный, 2 - газовый
+    laser_type: int = 1
+    # Габариты гравировки, мм (None - габариты не указаны)
+    width: float | None = None
+    height: float | None = None
+    # Количество изделий, изделий в одной установке, установок (прицелов)
+    number: int = 1
+    group: int = 1
+    aims: int = 1
+    # Градации сложности установки и глубины гравировки (с единицы)
+    difficult: int = 1
+    depth: int = 1
+    # Доплата за макетирование, руб и скидка оператора, %
+    design_cost: float = 0
+    discount: float = 0
+    # Дополнительные условия работы
+    rotation: bool = False
+    different_layouts: bool = False
+    timing: bool = False
+    packing: bool = False
+    thermal_graving: bool = False
+    oversize: bool = False
+    numbering: bool = False
+    taxation_ao: bool = False
+    taxation_ip: bool = False
+    attention: bool = False
+    hand_job: bool = False
+    docking: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PricingConfig:
+    """
+    Класс числовых настроек расчета. Настройки берутся из снимка
+    ConfigSnapshot (метод from_snapshot), в котором строки файлов
+    конфигурации уже преобразованы в числа, поэтому при расчете строки не
+    разбираются.
+
+    Пример использования:
+    config = PricingConfig.from_snapshot(ConfigSnapshot.get_snapshot())
+    """
+    min_cost: int
+    additional_cost: int
+    many_items: float
+    one_set: float
+    ratio_laser_gas: float
+    ratio_rotation: float
+    ratio_timing: float
+    ratio_attention: float
+    ratio_packing: float
+    ratio_hand_job: float
+    ratio_taxation: tuple
+    ratio_oversize: float
+    ratio_different_layouts: float
+    ratio_numbering: float
+    ratio_thermal_graving: float
+    ratio_docking: float
+    gradation_difficult: tuple
+    gradation_depth: tuple
+    # Функции коэффициента габаритов гравировки для типов лазера
+    size_solid: object
+    size_gas: object
+    # Стоимость стандартных изделий
+    standard_costs: dict = field(default_factory=dict)
+    # Версия снимка настроек, из которого созданы настройки расчета
+    version: int = 0
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Метод создания настроек расчета из снимка настроек программы.
+        :param snapshot: Снимок настроек (ConfigSnapshot.get_snapshot())
+        :return: Экземпляр класса.
+        """
+        try:
+            ratios = snapshot.ratios
+            area = snapshot.gradation_area
+
+            # Узловые точки (если заданы) или стандартные зависимости
+            points = snapshot.area_points
+            size_solid = (PiecewiseRatio(points['solid']).get_ratio
+                          if points['solid'] else RatioArea(
+                              70 * 70, 200 * 200, area[0]).get_linear_ratio)
+            size_gas = (PiecewiseRatio(points['gas']).get_ratio
+                        if points['gas'] else RatioArea(
+                            150 * 100, 400 * 680, area[1]
+                        ).get_polynomial_ratio)
+
+            return cls(
+                min_cost=snapshot.min_cost,
+                additional_cost=snapshot.additional_cost,
+                many_items=snapshot.many_items,
+                one_set=snapshot.one_set,
+                ratio_laser_gas=ratios['ratio_laser_gas'],
+                ratio_rotation=ratios['ratio_rotation'],
+                ratio_timing=ratios['ratio_timing'],
+                ratio_attention=ratios['ratio_attention'],
+                ratio_packing=ratios['ratio_packing'],
+                ratio_hand_job=ratios['ratio_hand_job'],
+                ratio_taxation=ratios['ratio_taxation'],
+                ratio_oversize=ratios['ratio_oversize'],
+                ratio_different_layouts=ratios['ratio_different_layouts'],
+                ratio_numbering=ratios['ratio_numbering'],
+                ratio_thermal_graving=ratios['ratio_thermal_graving'],
+                ratio_docking=ratios['ratio_docking'],
+                gradation_difficult=snapshot.gradation_difficult,
+                gradation_depth=snapshot.gradation_depth,
+                size_solid=size_solid,
+                size_gas=size_gas,
+                standard_costs=snapshot.standard_costs,
+                version=snapshot.version
+            )
+        except (KeyError, IndexError) as e:
+            raise SettingsFileError(
+                f'Настройки расчета файла settings.ini заданы неверно: {e}',
+                location='PricingConfig.from_snapshot'
+            ) from e
+
+
+@dataclass(slots=True)
+class PriceBreakdown:
+    """
+    Класс результата расчета стоимости гравировки с разбивкой по
+    коэффициентам.
+
+    Итоговая стоимость изделия:
+        cost = (additional_cost + base_cost * коэффициенты работы) *
+               * коэффициенты заказа
+
+    Пример использования:
+    breakdown = engine.price(order)
+    total = breakdown.get_total(round_method)
+    """
+    # Начальная стоимость и доплата за дополнительные установки, руб
+    base_cost: float
+    additional_cost: float
+    # Коэффициенты, умножаемые на начальную стоимость (сложность работы)
+    work_ratios: dict
+    # Коэффициенты, умножаемые на всю стоимость (налоги, количество, скидка)
+    order_ratios: dict
+    # Стоимость гравировки одного изделия, руб
+    cost: float
+    # Количество изделий и доплата за макетирование, руб
+    number: int
+    design_cost: float
+
+    def get_total(self, round_method=None) -> float:
+        """
+        Метод расчета полной стоимости заказа с учетом макетирования.
+        :param round_method: Метод округления стоимости изделия (по
+        умолчанию - без округления)
+        :return: Полная стоимость, руб.
+        """
+        cost = round_method(self.cost) if round_method else self.cost
+        return cost * self.number + self.design_cost
+
+
+class PricingEngine:
+    """
+    Класс механизма расчета стоимости гравировки для частных лиц. Не зависит
+    от графического интерфейса: получает заказ PersonalOrder и числовые
+    настройки PricingConfig, возвращает разбивку PriceBreakdown.
+
+    Содержит методы: price, price_many.
+
+    Пример использования:
+    engine = PricingEngine(PricingConfig.from_snapshot(snapshot))
+    breakdown = engine.price(PersonalOrder(number=10, rotation=True))
+    """
+    def __init__(self, config: PricingConfig) -> None:
+        """
+        Инициализация механизма расчета.
+        :param config: Числовые настройки расчета
+        """
+        self.config = config
+
+    def price(self, order: PersonalOrder) -> PriceBreakdown:
+        """
+        Метод расчета стоимости гравировки одного изделия заказа.
+        :param order: Параметры заказа
+        :return: Разбивка стоимости по коэффициентам.
+        :raises ValueError: Количество или градация вне допустимого
+        диапазона.
+        """
+        config = self.config
+        number = order.number
+
+        # Проверка количества и номеров градаций (с единицы)
+        if number < 1 or order.group < 1 or order.aims < 1:
+            raise ValueError(
+                f'Количество изделий ({number}), изделий в установке '
+                f'({order.group}) и установок ({order.aims}) должно быть '
+                f'не меньше 1.')
+        if not 1 <= order.difficult <= len(config.gradation_difficult):
+            raise ValueError(
+                f'Градация сложности {order.difficult} вне диапазона 1-'
+                f'{len(config.gradation_difficult)}.')
+        if not 1 <= order.depth <= len(config.gradation_depth):
+            raise ValueError(
+                f'Градация глубины {order.depth} вне диапазона 1-'
+                f'{len(config.gradation_depth)}.')
+
+        # Начальная стоимость (минимальная или стандартного изделия)
+        if order.product is None:
+            base_cost = config.min_cost
+        else:
+            base_cost = config.standard_costs[order.product]
+
+        # Коэффициент габаритов гравировки
+        if order.width is None or order.height is None:
+            ratio_size = 1
+        elif order.laser_type == 2:
+            ratio_size = config.size_gas(order.width * order.height)
+        else:
+            ratio_size = config.size_solid(order.width * order.height)
+
+        # Коэффициенты сложности работы
+        work_ratios = {
+            'laser': (config.ratio_laser_gas
+                      if order.laser_type == 2 else 1),
+            'rotation': config.ratio_rotation if order.rotation else 1,
+            'different_layouts': (
+                config.ratio_different_layouts
+                if order.different_layouts and number > 1 else 1),
+            'timing': config.ratio_timing if order.timing else 1,
+            'packing': config.ratio_packing if order.packing else 1,
+            'thermal_graving': (config.ratio_thermal_graving
+                                if order.thermal_graving else 1),
+            'oversize': config.ratio_oversize if order.oversize else 1,
+            'numbering': (config.ratio_numbering
+                          if order.numbering and number > 1 else 1),
+            'attention': config.ratio_attention if order.attention else 1,
+            'hand_job': config.ratio_hand_job if order.hand_job else 1,
+            'docking': (config.ratio_docking
+                        if order.docking and order.aims > 1 else 1),
+            'difficult': config.gradation_difficult[order.difficult - 1],
+            'depth': config.gradation_depth[order.depth - 1],
+            'size': ratio_size,
+        }
+
+        # Коэффициент зависимости от количества изделий
+        if number == 1:
+            ratio_many_items = 1
+        elif 1 < number <= 5:
+            ratio_many_items = 1 - number / 10
+        else:
+            ratio_many_items = 0.85 * number ** -config.many_items
+
+        # Коэффициенты заказа
+        order_ratios = {
+            'taxation_ao': (config.ratio_taxation[0]
+                            if order.taxation_ao else 1),
+            'taxation_ip': (config.ratio_taxation[1]
+                            if order.taxation_ip else 1),
+            'many_items': ratio_many_items,
+            'one_set': (1 if order.group == 1
+                        else order.group ** -config.one_set),
+            'discount': 1 - order.discount / 100,
+        }
+
+        # Доплата за количество установок
+        additional_cost = (
+            (order.aims - 1) * config.additional_cost if order.aims > 1
+            else 0)
+
+        work = 1
+        for ratio in work_ratios.values():
+            work *= ratio
+        cost = additional_cost + base_cost * work
+        for ratio in order_ratios.values():
+            cost *= ratio
+
+        return PriceBreakdown(base_cost, additional_cost, work_ratios,
+                              order_ratios, cost, number, order.design_cost)
+
+    def price_many(self, orders) -> list:
+        """
+        Метод расчета стоимости для последовательности заказов.
+        :param orders: Последовательность заказов PersonalOrder
+        :return: Список разбивок стоимости.
+        """
+        price = self.price
+        return [price(order) for order in orders]
+
+
+@dataclass(slots=True)
+class SheetOrder:
+    """
+    Класс параметров заказа изделий из листового материала (вкладка
+    "Листовой материал").
+
+    Пример использования:
+    order = SheetOrder(material_name, width=100, height=50, number=300)
+    """
+    # Название материала (из базы листового материала)
+    material: str
+    # Габариты изделия, мм и количество изделий, шт
+    width: float
+    height: float
+    number: int
+    # Скидка оператора, % и доплата за макетирование, руб
+    discount: float = 0
+    design_cost: float = 0
+    # Точный раскрой листа (дольше, иногда на лист помещается больше)
+    exact: bool = False
+
+
+@dataclass(slots=True)
+class SheetQuote:
+    """
+    Класс результата расчета изделий из листового материала.
+
+    Пример использования:
+    quote = SheetMaterialEngine().price(order)
+    print(quote.total)
+    """
+    # Количество изделий с листа и потребное количество листов, шт
+    per_sheet: int
+    sheets: int
+    # Себестоимость одного изделия и партии, руб
+    cost_price_item: float
+    cost_price: float
+    # Стоимость одного изделия (с округлением), руб
+    cost: float
+    # Стоимость партии с макетированием и доплата за макетирование, руб
+    total: float
+    design_cost: float
+
+
+class SheetMaterialEngine:
+    """
+    Класс механизма расчета изделий из листового материала. База материалов
+    и таблицы стоимостей берутся из кэша MaterialComparison (читаются заново
+    только при изменении файлов), раскрой листа - из кэша packing_cache,
+    поэтому массовый расчет не читает файлы конфигурации на каждый заказ.
+
+    Содержит методы: get_sheet, price.
+
+    Пример использования:
+    engine = SheetMaterialEngine()
+    quote = engine.price(SheetOrder(material_name, 100, 50, 300))
+    """
+    def __init__(self, kerf: int | float | None = None,
+                 margin: int | float | None = None) -> None:
+        """
+        Инициализация параметров раскроя.
+        :param kerf: Ширина реза (по умолчанию - из settings.ini)
+        :param margin: Отступ от края листа (по умолчанию - из settings.ini)
+        """
+        if kerf is None or margin is None:
+            default_kerf, default_margin = (
+                ContainerPacking.get_cutting_settings())
+            kerf = default_kerf if kerf is None else kerf
+            margin = default_margin if margin is None else margin
+        self.kerf = kerf
+        self.margin = margin
+        self.catalogue = None
+        self.sheets = dict()
+
+    def get_sheet(self, material: str) -> tuple:
+        """
+        Метод получения габаритов и стоимости листа материала.
+        :param material: Название материала
+        :return: Кортеж (ширина листа, высота листа, стоимость листа)
+        """
+        catalogue = MaterialComparison.get_catalogue()
+        if catalogue is not self.catalogue:
+            self.catalogue = catalogue
+            self.sheets = {name: (width, height, price)
+                           for name, width, height, price in catalogue}
+        return self.sheets[material]
+
+    def price(self, order: SheetOrder, round_method=round_cost) -> SheetQuote:
+        """
+        Метод расчета себестоимости и стоимости изделий заказа.
+        :param order: Параметры заказа
+        :param round_method: Метод округления стоимости изделия
+        :return: Результат расчета.
+        """
+        sheet_width, sheet_height, price = self.get_sheet(order.material)
+        per_sheet = packing_cache.get_layout(
+            sheet_width, sheet_height, order.width, order.height, self.kerf,
+            self.margin, 'exact' if order.exact else 'auto',
+            ContainerPacking.exact_time_budget
+        ).count
+
+        # Себестоимость изделия и потребное количество листов
+        if per_sheet:
+            cost_price_item = price / per_sheet
+            sheets = ceil(order.number / per_sheet)
+        else:
+            AppLogger(
+                'SheetMaterialEngine.price',
+                'warning',
+                f'Изделие {order.width} x {order.height} мм не помещается '
+                f'на лист материала "{order.material}".'
+            )
+            cost_price_item = 0.0
+            sheets = 0
+
+        # Стоимость изделия (обнуляется при 0 штук изделий) и партии
+        try:
+            cost = MaterialComparison.get_interpolation(
+                order.material).get_cost(order.height, order.width,
+                                         order.number)
+            if order.number == 0:
+                cost = 0
+            else:
+                cost = round_method(cost * ((100 - order.discount) / 100))
+            total = cost * order.number + order.design_cost
+        except (ValueError, ZeroDivisionError) as e:
+            AppLogger(
+                'SheetMaterialEngine.price',
+                'warning',
+                f'При расчете стоимости изделия и стоимости партии '
+                f'возникло исключение "{e}"'
+            )
+            cost = 0.0
+            total = 0.0
+
+        return SheetQuote(per_sheet, sheets, cost_price_item,
+                          cost_price_item * order.number, cost, total,
+                          order.design_cost)
+
+
+class IndustrialEngine:
+    """
+    Класс расчетов вкладки "Промышленный расчет": стоимость от времени
+    работы оборудования и ориентировочное время гравировки.
+
+    Содержит методы: get_cost, get_time.
+
+    Пример использования:
+    engine = IndustrialEngine(one_hour_of_work=5000)
+    cost = engine.get_cost(minutes=30)
+    minimum, text, imagine = IndustrialEngine.get_time(100, 50, 10, 300, 1)
+    """
+    # Скорость холостого хода для стандартных настроек динамики, мм/сек
+    idle_speed = 4000
+
+    # Поправочные коэффициенты времени гравировки текста и рисунков
+    ratio_text = 0.75
+    ratio_imagine = 0.65
+
+    def __init__(self, one_hour_of_work: int | float) -> None:
+        """
+        Инициализация стоимости часа работы оборудования.
+        :param one_hour_of_work: Стоимость часа работы оборудования, руб
+        """
+        self.one_hour_of_work = one_hour_of_work
+
+    def get_cost(self, minutes: int | float) -> float:
+        """
+        Метод расчета стоимости от времени работы оборудования.
+        :param minutes: Время работы оборудования, мин
+        :return: Стоимость (без округления), руб.
+        """
+        return minutes * self.one_hour_of_work / 60
+
+    @classmethod
+    def get_time(cls, width: float, height: float, dpi: float,
+                 speed: float, passes: float,
+                 black_pixels: float = 0) -> tuple:
+        """
+        Метод расчета ориентировочного времени гравировки. Если количество
+        черных пикселей не задано, гравируется прямоугольник целиком.
+        :param width: Ширина гравировки, мм
+        :param height: Высота гравировки, мм
+        :param dpi: Плотность (разрешение) гравировки, точек/мм
+        :param speed: Скорость гравировки, мм/сек
+        :param passes: Количество проходов
+        :param black_pixels: Количество черных пикселей в макете
+        :return: Кортеж времени гравировки, мин: (жирный текст и неплотные
+        рисунки, изображения из тонких линий, обычный текст и рисунки с
+        большим количеством элементов).
+        """
+        rectangle = black_pixels == 0
+        if rectangle:
+            black_pixels = width * height * dpi * dpi
+            white_pixels = 0
+        else:
+            white_pixels = width * dpi * height * dpi - black_pixels
+        pixels = black_pixels + white_pixels
+        result = (
+            ((width * height * dpi * passes * (black_pixels / pixels) /
+              speed) / 60) +
+            ((width * height * dpi * passes * (white_pixels / pixels) /
+              cls.idle_speed) / 60)
+        )
+        if rectangle:  # Для прямоугольника результаты совпадают
+            return result, result, result
+        return result, result / cls.ratio_text, result / cls.ratio_imagine
@@ -0,0 +1,290 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует журнал расчетов: каждый расчет (частные лица, листовой
+материал, промышленная гравировка, .bmp изображение, глубокая гравировка)
+дописывается в конец файла log/calculation/quotes.jsonl одной строкой JSON
+с типизированными параметрами, результатами и версией настроек. Лог
+расчетов calc_log.log остается текстом для чтения пользователем, журнал -
+для отчетов и повторного анализа расчетов.
+
+Запись журнала:
+{"ts": "2026-10-18T14:05:31.120", "kind": "personal",
+ "config": {"version": 3, "digest": "5f0c2a9b71de", "profile": "Основной"},
+ "inputs": {...}, "outputs": {...}}
+
+Рядом с журналом хранится индекс log/calculation/quotes.idx - строки
+"дата тип смещение длина", поэтому расчеты за день читаются по смещениям
+без просмотра всего журнала. Индекс дописывается вместе с журналом; если
+запись индекса не выполнена (сбой при записи), недостающие строки
+восстанавливаются из конца журнала при следующем обращении.
+
+Модуль содержит класс:
+- QuoteJournal - журнал расчетов с индексом по датам и типам расчета.
+
+Также модуль содержит общий экземпляр quote_journal.
+"""
+
+import _thread
+import json
+import os
+
+from app_logger import AppLogger
+from config_writer import FileLock
+from lazy_import import lazy_import
+from path_getting import PathName
+
+# Модули загружаются при первой записи в журнал
+datetime = lazy_import('datetime')
+hashlib = lazy_import('hashlib')
+
+
+class QuoteJournal:
+    """
+    Класс журнала расчетов. Журнал только дописывается: запись и строка
+    индекса добавляются под блокировкой FileLock, поэтому несколько
+    экземпляров программы пишут в один журнал. Ошибка записи журнала
+    записывается в лог и не прерывает расчет.
+
+    Типы расчетов (kinds): personal - частные лица, sheet - листовой
+    материал, industrial_cost - стоимость от времени работы оборудования,
+    industrial_time - время работы оборудования, bmp - параметры .bmp
+    изображения, depth - глубокая гравировка.
+
+    Содержит методы: append, get_config, read_day, get_offsets,
+    update_index, index_journal, add_index.
+
+    Пример использования:
+    quote_journal.append('industrial_cost', {'minutes': 30.0},
+                         {'cost': 1500}, snapshot)
+    quotes = quote_journal.read_day('2026-10-18', 'personal')
+    """
+    # Типы расчетов
+    kinds = ('personal', 'sheet', 'industrial_cost', 'industrial_time',
+             'bmp', 'depth')
+
+    def __init__(self,
+                 journal_file: str = 'log\\calculation\\quotes.jsonl',
+                 index_file: str = 'log\\calculation\\quotes.idx') -> None:
+        """
+        Инициализация журнала. Индекс загружается при первом обращении.
+        :param journal_file: Относительный путь к файлу журнала
+        :param index_file: Относительный путь к файлу индекса
+        """
+        self.path = PathName.resource_path(journal_file)
+        self.index_path = PathName.resource_path(index_file)
+        # Индекс "Дата - [(тип, смещение, длина), ...]", прочитанный объем
+        # файла индекса и конец проиндексированной части журнала
+        self.index = dict()
+        self.index_size = 0
+        self.indexed_end = 0
+        # Отпечатки снимков настроек "id снимка - (снимок, отпечаток)"
+        self.digests = dict()
+        # Блокировка создается модулем _thread: модуль threading
+        # импортируется долго
+        self.lock = _thread.allocate_lock()
+
+    def append(self, kind: str, inputs: dict, outputs: dict,
+               snapshot=None, profile: str | None = None) -> None:
+        """
+        Метод записи расчета в журнал.
+        :param kind: Тип расчета (kinds)
+        :param inputs: Параметры расчета (числа, строки, словари, списки)
+        :param outputs: Результаты расчета
+        :param snapshot: Снимок настроек расчета (ConfigSnapshot)
+        :param profile: Название профиля цен
+        """
+        if kind not in self.kinds:
+            raise ValueError(f'Неизвестный тип расчета: {kind}')
+        now = datetime.datetime.now()
+        record = {
+            'ts': now.isoformat(timespec='milliseconds'),
+            'kind': kind,
+            'config': self.get_config(snapshot, profile),
+            'inputs': inputs,
+            'outputs': outputs,
+        }
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':'),
+                           default=str) + '\n').encode('utf-8')
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self.lock, FileLock(self.path):
+                self.update_index()
+                with open(self.path, 'ab') as file:
+                    offset = file.seek(0, os.SEEK_END)
+                    file.write(line)
+                self.add_index([(record['ts'][:10], kind, offset,
+                                 len(line))])
+                self.indexed_end = offset + len(line)
+        except OSError as e:
+            AppLogger(
+                'QuoteJournal.append',
+                'error',
+                f'Расчет ({kind}) не записан в журнал расчетов: {e}'
+            )
+
+    def get_config(self, snapshot, profile: str | None = None) -> dict | None:
+        """
+        Метод получения версии настроек расчета. Номер версии снимка
+        действует только в текущем запуске программы, поэтому записывается
+        и отпечаток значений снимка: одинаковые настройки в разных запусках
+        дают одинаковый отпечаток.
+        :param snapshot: Снимок настроек (ConfigSnapshot) или None
+        :param profile: Название профиля цен
+        :return: Словарь версии настроек или None, если снимка нет.
+        """
+        if snapshot is None:
+            return None
+        entry = self.digests.get(id(snapshot))
+        if entry is None or entry[0] is not snapshot:
+            text = json.dumps(snapshot.get_values(), sort_keys=True,
+                              default=str)
+            entry = (snapshot,
+                     hashlib.sha1(text.encode('utf-8')).hexdigest()[:12])
+            if len(self.digests) > 32:
+                self.digests.clear()
+            self.digests[id(snapshot)] = entry
+        config = {'version': snapshot.version, 'digest': entry[1]}
+        if profile is not None:
+            config['profile'] = profile
+        return config
+
+    def read_day(self, day, kind: str | None = None) -> list:
+        """
+        Метод чтения расчетов за день.
+        :param day: Дата ('2026-10-18' или datetime.date)
+        :param kind: Тип расчета (по умолчанию - все типы)
+        :return: Список записей журнала (словари) в порядке записи.
+        """
+        offsets = self.get_offsets(day, kind)
+        records = list()
+        if not offsets:
+            return records
+        with open(self.path, 'rb') as file:
+            for offset, length in offsets:
+                file.seek(offset)
+                try:
+                    records.append(json.loads(file.read(length)))
+                except ValueError as e:
+                    AppLogger(
+                        'QuoteJournal.read_day',
+                        'warning',
+                        f'Поврежденная запись журнала расчетов (смещение '
+                        f'{offset}): {e}'
+                    )
+        return records
+
+    def get_offsets(self, day, kind: str | None = None) -> list:
+        """
+        Метод получения смещений записей журнала за день по индексу.
+        :param day: Дата ('2026-10-18' или datetime.date)
+        :param kind: Тип расчета (по умолчанию - все типы)
+        :return: Список кортежей (смещение, длина).
+        """
+        if not os.path.exists(self.path):
+            return list()
+        with self.lock, FileLock(self.path):
+            self.update_index()
+            entries = list(self.index.get(str(day), ()))
+        return [(offset, length) for entry_kind, offset, length in entries
+                if kind is None or entry_kind == kind]
+
+    def update_index(self) -> None:
+        """
+        Метод догрузки индекса: чтение строк, дописанных в файл индекса
+        (в том числе другими экземплярами программы), и восстановление
+        строк для непроиндексированного конца журнала. Выполняется под
+        блокировкой журнала.
+        """
+        try:
+            index_size = os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            index_size = 0
+        if index_size < self.index_size:
+            # Файл индекса удален или заменен: индекс строится заново
+            self.index = dict()
+            self.index_size = 0
+            self.indexed_end = 0
+        data = b''
+        if index_size > self.index_size:
+            with open(self.index_path, 'rb') as file:
+                file.seek(self.index_size)
+                data = file.read(index_size - self.index_size)
+            if not data.endswith(b'\n'):
+                # Незавершенная строка (сбой при записи) отделяется от
+                # следующих строк, ее запись журнала восстанавливается ниже
+                with open(self.index_path, 'ab') as file:
+                    file.write(b'\n')
+                data += b'\n'
+        self.index_size += len(data)
+        for line in data.decode('ascii', 'replace').splitlines():
+            try:
+                day, kind, offset, length = line.split()
+                offset, length = int(offset), int(length)
+            except ValueError:
+                continue
+            self.index.setdefault(day, list()).append((kind, offset, length))
+            self.indexed_end = max(self.indexed_end, offset + length)
+        try:
+            journal_size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            journal_size = 0
+        if journal_size > self.indexed_end:
+            self.index_journal(journal_size)
+
+    def index_journal(self, journal_size: int) -> None:
+        """
+        Метод восстановления индекса для конца журнала, не попавшего в
+        индекс. Незавершенная последняя строка (сбой при записи)
+        дополняется переводом строки и в индекс не попадает.
+        :param journal_size: Размер журнала, байт
+        """
+        entries = list()
+        with open(self.path, 'rb+') as file:
+            file.seek(self.indexed_end)
+            data = file.read(journal_size - self.indexed_end)
+            if not data.endswith(b'\n'):
+                file.seek(0, os.SEEK_END)
+                file.write(b'\n')
+        offset = self.indexed_end
+        for line in data.splitlines(keepends=True):
+            try:
+                record = json.loads(line)
+                entries.append((record['ts'][:10], record['kind'], offset,
+                                len(line)))
+            except (ValueError, KeyError, TypeError):
+                AppLogger(
+                    'QuoteJournal.index_journal',
+                    'warning',
+                    f'Поврежденная запись журнала расчетов (смещение '
+                    f'{offset}) пропущена.'
+                )
+            offset += len(line)
+        if entries:
+            self.add_index(entries)
+        self.indexed_end = journal_size + (not data.endswith(b'\n'))
+        if entries:
+            AppLogger(
+                'QuoteJournal.index_journal',
+                'info',
+                f'Индекс журнала расчетов восстановлен: {len(entries)} '
+                f'записей.'
+            )
+
+    def add_index(self, entries: list) -> None:
+        """
+        Метод записи строк индекса.
+        :param entries: Список кортежей (дата, тип, смещение, длина)
+        """
+        data = ''.join(f'{day} {kind} {offset} {length}\n'
+                       for day, kind, offset, length in entries)
+        with open(self.index_path, 'ab') as file:
+            file.write(data.encode('ascii'))
+        self.index_size += len(data)
+        for day, kind, offset, length in entries:
+            self.index.setdefault(day, list()).append((kind, offset, length))
+
+
+# Общий журнал расчетов программы
+quote_journal = QuoteJournal()
@@ -0,0 +1,427 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует локальный HTTP-сервис расчета стоимости (JSON) для
+интернет-магазина и других программ. Используются те же формулы, что и в
+главном окне приложения. Файлы конфигурации и таблицы стоимостей
+материалов хранятся в памяти и читаются заново только при изменении файлов.
+Запросы обрабатываются пулом потоков, графический интерфейс не
+импортируется.
+
+Запросы (POST, тело - JSON-объект с полями заказа):
+- /personal - вкладка "Частные лица" (поля класса pricing.PersonalOrder);
+- /sheet - вкладка "Листовой материал" (поля класса pricing.SheetOrder);
+- /deep-engraving - параметры глубокой гравировки (поля material, depth);
+- /time - время гравировки (поля width, height, dpi, speed, passes,
+black_pixels) и/или стоимость от времени работы (поле minutes).
+Запрос GET /health возвращает состояние сервиса, GET /materials - список
+листовых материалов.
+
+Пример использования (из папки программы):
+python quote_server.py --port 8765
+curl -d '{"number": 10, "rotation": true}' http://127.0.0.1:8765/personal
+
+Модуль содержит классы:
+- QuoteState - загруженные в память настройки и механизмы расчета;
+- QuoteService - хранение состояния и его обновление при изменении файлов;
+- QuoteRequestHandler - обработчик запросов;
+- QuoteServer - HTTP-сервер с пулом потоков.
+
+Также модуль содержит функцию main - точку входа командной строки.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from app_logger import AppLogger
+from calculations import DeepEngraving
+from materials import MaterialComparison
+from path_getting import PathName
+from pricing import (IndustrialEngine, PersonalOrder, PricingConfig,
+                     PricingEngine, SheetMaterialEngine, SheetOrder,
+                     parse_number, parse_order, round_cost)
+from settings_configuration import ConfigSnapshot, SettingsFileError
+from shared_settings import shared_settings
+
+
+class QuoteState:
+    """
+    Класс загруженных в память настроек и механизмов расчета. Экземпляр не
+    изменяется после создания: при смене версии снимка настроек создается
+    новый экземпляр, поэтому запросы, выполняемые в это время, используют
+    согласованные настройки.
+
+    Пример использования:
+    state = QuoteState(ConfigSnapshot.get_snapshot())
+    breakdown = state.pricing.price(order)
+    """
+    def __init__(self, snapshot: ConfigSnapshot) -> None:
+        """
+        Создание механизмов расчета по снимку настроек.
+        :param snapshot: Снимок настроек программы
+        """
+        self.snapshot = snapshot
+        self.pricing = PricingEngine(PricingConfig.from_snapshot(snapshot))
+        self.sheet = SheetMaterialEngine()
+        self.industrial = IndustrialEngine(snapshot.one_hour_of_work)
+        self.created = time.time()
+
+
+class QuoteService:
+    """
+    Класс хранения состояния сервиса расчета. Снимок настроек
+    ConfigSnapshot проверяется не чаще одного раза в check_interval секунд,
+    состояние пересоздается только при смене версии снимка (изменении
+    файлов конфигурации). Таблицы стоимостей и база материалов обновляются
+    кэшем MaterialComparison.
+
+    Содержит метод: get_state.
+
+    Пример использования:
+    service = QuoteService()
+    state = service.get_state()
+    """
+    # Интервал проверки изменения файлов, с
+    check_interval = 1.0
+
+    def __init__(self) -> None:
+        """
+        Загрузка состояния сервиса.
+        """
+        self.lock = threading.Lock()
+        self.state = QuoteState(ConfigSnapshot.get_snapshot())
+        self.checked = time.monotonic()
+
+    def get_state(self) -> QuoteState:
+        """
+        Метод получения актуального состояния сервиса. Если файлы
+        конфигурации изменились, состояние пересоздается; при ошибке чтения
+        новых файлов сохраняется прежнее состояние.
+        :return: Состояние сервиса.
+        """
+        now = time.monotonic()
+        if now - self.checked < self.check_interval:
+            return self.state
+        with self.lock:
+            if now - self.checked < self.check_interval:
+                return self.state
+            self.checked = now
+            try:
+                snapshot = ConfigSnapshot.get_snapshot()
+                if snapshot.version != self.state.snapshot.version:
+                    self.state = QuoteState(snapshot)
+                    AppLogger(
+                        'QuoteService.get_state',
+                        'info',
+                        f'Сервис расчета: конфигурация перечитана после '
+                        f'изменения файлов (версия {snapshot.version}).'
+                    )
+            except SettingsFileError as e:
+                AppLogger(
+                    'QuoteService.get_state',
+                    'error',
+                    f'Сервис расчета: новая конфигурация не загружена, '
+                    f'используется прежняя ({e}).'
+                )
+        return self.state
+
+
+class QuoteRequestHandler(BaseHTTPRequestHandler):
+    """
+    Класс обработчика запросов сервиса расчета. Ответ - JSON-объект;
+    ошибки данных заказа возвращаются с кодом 400 и полем error. Точный
+    раскрой листа ("exact": true) выполняется одним запросом за раз: если
+    он не начат за exact_wait секунд, возвращается код 503.
+
+    Содержит методы: do_GET, do_POST, quote_personal, quote_sheet,
+    quote_deep_engraving, quote_time, send_json, log_message.
+    """
+    server_version = 'RazoomQuote/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    # Максимальный размер тела запроса, байт
+    max_body = 65536
+
+    # Время ожидания данных соединения, с (освобождение потока пула)
+    timeout = 15
+
+    # Отправка ответа без задержки (заголовки и тело пишутся раздельно)
+    disable_nagle_algorithm = True
+
+    # Наибольшее ожидание очереди точного раскроя, с
+    exact_wait = 5
+
+    def do_GET(self) -> None:
+        """
+        Обработка запросов GET (состояние сервиса, список материалов).
+        """
+        state = self.server.service.get_state()
+        match self.path.rstrip('/'):
+            case '/health':
+                self.send_json(200, {
+                    'status': 'ok', 'config_loaded': state.created,
+                    'config_version': state.snapshot.version})
+            case '/materials':
+                self.send_json(200, {'materials': [
+                    {'name': name, 'width': width, 'height': height,
+                     'price': price}
+                    for name, width, height, price in
+                    MaterialComparison.get_catalogue()]})
+            case _:
+                self.send_json(404, {'error': 'Неизвестный запрос'})
+
+    def do_POST(self) -> None:
+        """
+        Обработка запросов расчета.
+        """
+        handlers = {
+            '/personal': self.quote_personal,
+            '/sheet': self.quote_sheet,
+            '/deep-engraving': self.quote_deep_engraving,
+            '/time': self.quote_time,
+        }
+        handler = handlers.get(self.path.rstrip('/'))
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if handler is None:
+            self.send_json(404, {'error': 'Неизвестный запрос'})
+            return
+        if not 0 <= length <= self.max_body:
+            self.close_connection = True
+            self.send_json(413, {'error': 'Неверный размер запроса'})
+            return
+        try:
+            data = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(data, dict):
+                raise ValueError('тело запроса должно быть JSON-объектом')
+            self.send_json(200, handler(self.server.service.get_state(),
+                                        data))
+        except TimeoutError as e:
+            self.send_json(503, {'error': str(e)})
+        except (ValueError, TypeError, KeyError, IndexError, OverflowError,
+                ZeroDivisionError, SettingsFileError) as e:
+            self.send_json(400, {'error': f'{type(e).__name__}: {e}'})
+
+    @staticmethod
+    def quote_personal(state: QuoteState, data: dict) -> dict:
+        """
+        Расчет стоимости гравировки (вкладка "Частные лица").
+        :param state: Состояние сервиса
+        :param data: Поля заказа
+        :return: Результат расчета.
+        """
+        breakdown = state.pricing.price(parse_order(data, PersonalOrder))
+        return {
+            'cost': round_cost(breakdown.cost),
+            'total': breakdown.get_total(round_cost),
+            'design_cost': breakdown.design_cost,
+            'base_cost': breakdown.base_cost,
+            'additional_cost': breakdown.additional_cost,
+            'work_ratios': breakdown.work_ratios,
+            'order_ratios': breakdown.order_ratios,
+        }
+
+    def quote_sheet(self, state: QuoteState, data: dict) -> dict:
+        """
+        Расчет изделий из листового материала. Запросы точного раскроя
+        (общие таблицы решений точного алгоритма) выполняются по одному.
+        :param state: Состояние сервиса
+        :param data: Поля заказа
+        :return: Результат расчета.
+        :raises TimeoutError: Очередь точного раскроя занята.
+        """
+        order = parse_order(data, SheetOrder)
+        if not order.exact:
+            quote = state.sheet.price(order)
+        elif self.server.exact_lock.acquire(timeout=self.exact_wait):
+            try:
+                quote = state.sheet.price(order)
+            finally:
+                self.server.exact_lock.release()
+        else:
+            raise TimeoutError('Сервис занят точным раскроем, повторите '
+                               'запрос позже')
+        return {
+            'per_sheet': quote.per_sheet,
+            'sheets': quote.sheets,
+            'cost_price_item': quote.cost_price_item,
+            'cost_price': quote.cost_price,
+            'cost': quote.cost,
+            'total': quote.total,
+            'design_cost': quote.design_cost,
+        }
+
+    @staticmethod
+    def quote_deep_engraving(state: QuoteState, data: dict) -> dict:
+        """
+        Расчет параметров глубокой гравировки.
+        :param state: Состояние сервиса
+        :param data: Поля material (материал) и depth (глубина, мм)
+        :return: Результат расчета.
+        """
+        result = DeepEngraving(data.get('material'),
+                               state.snapshot).depth_calculate(
+            data.get('depth'))
+        if result is None:
+            raise ValueError('материал не найден или глубина задана неверно')
+        comment, passes, power_list = result
+        return {'comment': comment, 'passes': passes,
+                'focus_changes': power_list}
+
+    @staticmethod
+    def quote_time(state: QuoteState, data: dict) -> dict:
+        """
+        Расчет времени гравировки и стоимости от времени работы.
+        :param state: Состояние сервиса
+        :param data: Поля width, height, dpi, speed, passes, black_pixels
+        и/или minutes
+        :return: Результат расчета.
+        """
+        result = dict()
+        if data.get('minutes') not in (None, ''):
+            result['cost'] = round_cost(
+                state.industrial.get_cost(parse_number(data['minutes'])))
+        if data.get('width') not in (None, ''):
+            result.update(zip(
+                ('time_minimum', 'time_text', 'time_imagine'),
+                state.industrial.get_time(
+                    parse_number(data['width']), parse_number(data['height']),
+                    parse_number(data['dpi']), parse_number(data['speed']),
+                    parse_number(data.get('passes') or 1),
+                    parse_number(data.get('black_pixels') or 0))))
+        if not result:
+            raise ValueError('не заданы параметры гравировки или время '
+                             'работы')
+        return result
+
+    def send_json(self, code: int, data: dict) -> None:
+        """
+        Метод отправки ответа в формате JSON.
+        :param code: Код ответа HTTP
+        :param data: Данные ответа
+        """
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        Отключение вывода каждого запроса в консоль (ошибки сервиса
+        записываются в лог программы).
+        """
+        pass
+
+
+class QuoteServer(HTTPServer):
+    """
+    Класс HTTP-сервера сервиса расчета. Соединения обрабатываются пулом
+    потоков фиксированного размера (вместо нового потока на каждое
+    соединение).
+
+    Содержит методы: process_request, process_request_thread,
+    server_close.
+
+    Пример использования:
+    server = QuoteServer(('127.0.0.1', 8765), workers=8)
+    server.serve_forever()
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple, workers: int = 8,
+                 service: QuoteService | None = None) -> None:
+        """
+        Инициализация сервера, пула потоков и состояния сервиса.
+        :param address: Адрес и порт сервера
+        :param workers: Количество потоков обработки запросов
+        :param service: Состояние сервиса (по умолчанию - создается)
+        """
+        self.service = service or QuoteService()
+        self.exact_lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=workers,
+                                       thread_name_prefix='quote')
+        super().__init__(address, QuoteRequestHandler)
+
+    def process_request(self, request, client_address) -> None:
+        """
+        Передача соединения в пул потоков.
+        :param request: Сокет соединения
+        :param client_address: Адрес клиента
+        """
+        self.pool.submit(self.process_request_thread, request,
+                         client_address)
+
+    def process_request_thread(self, request, client_address) -> None:
+        """
+        Обработка соединения в потоке пула.
+        :param request: Сокет соединения
+        :param client_address: Адрес клиента
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        """
+        Закрытие сервера и остановка пула потоков.
+        """
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv: list | None = None) -> int:
+    """
+    Точка входа командной строки.
+    :param argv: Аргументы командной строки (по умолчанию - sys.argv)
+    :return: Код завершения (0 - успешно).
+    """
+    parser = argparse.ArgumentParser(
+        description='Локальный HTTP-сервис расчета стоимости.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Адрес сервера (по умолчанию - 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='Порт сервера (по умолчанию - 8765)')
+    parser.add_argument('--workers', type=int,
+                        default=min(32, (os.cpu_count() or 1) + 4),
+                        help='Количество потоков обработки запросов')
+    args = parser.parse_args(argv)
+
+    shared_settings.setup()
+    try:
+        server = QuoteServer((args.host, args.port), args.workers)
+    except (OSError, SettingsFileError) as e:
+        print(f'Ошибка запуска сервиса: {e}', file=sys.stderr)
+        return 1
+
+    AppLogger(
+        'quote_server.main',
+        'info',
+        f'Сервис расчета запущен: http://{args.host}:{args.port} '
+        f'(папка программы {PathName.resource_path("")}).'
+    )
+    print(f'Сервис расчета: http://{args.host}:{args.port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует склад остатков (обрезков) листового материала. Обрезки
+хранятся отдельно для каждого материала в файле settings/remnants.json и
+индексируются по габаритам, что позволяет перед раскроем нового листа
+быстро найти обрезки, на которых помещается заказ.
+
+Склад изменяется под блокировкой файла (FileLock): перед изменением
+загружаются изменения других окон и экземпляров программы, файл
+записывается атомарно (config_writer.atomic_write).
+
+Модуль содержит класс:
+- RemnantInventory - склад обрезков листового материала.
+"""
+
+import json
+import os
+from bisect import bisect_left, insort
+from datetime import date
+
+from app_logger import AppLogger
+from config_writer import FileLock, config_writer
+from packing_cache import packing_cache
+from path_getting import PathName
+from settings_configuration import SettingsConflictError, SettingsFileError
+
+
+class RemnantInventory:
+    """
+    Класс склада обрезков листового материала. Для каждого материала
+    поддерживается отсортированный индекс (меньшая сторона, большая
+    сторона, идентификатор): обрезки, меньшая сторона которых меньше
+    меньшей стороны изделия, отсекаются двоичным поиском, поэтому запрос
+    "на каких обрезках помещается N изделий W×H" не перебирает весь склад.
+
+    Содержит методы: get_remnants, add_remnant, add_remnants, remove_remnant,
+    find_remnants, update, refresh, load, save.
+
+    Пример использования:
+    inventory = RemnantInventory()
+    inventory.add_remnant(material_name, 400, 250)
+    inventory.refresh()  # Перечитать файл, если склад изменен в другом окне
+    suitable = inventory.find_remnants(material_name, 100, 50, 12, kerf)
+    """
+    # Версия формата файла склада
+    version = 1
+
+    # Минимальная сторона обрезка, сохраняемого на склад, мм
+    min_side = 50
+
+    def __init__(self, file_name: str = 'settings\\remnants.json') -> None:
+        """
+        Инициализация склада и загрузка обрезков из файла.
+        :param file_name: Относительный путь к файлу склада.
+        """
+        self.path = PathName.resource_path(file_name)
+        self.remnants = dict()
+        self.index = dict()
+        self.next_id = 1
+        # Состояние файла склада при последней загрузке или сохранении
+        self.state = None
+        # Ошибка загрузки файла склада (поврежденный файл не перезаписывается)
+        self.load_error = None
+        self.load()
+
+    def get_remnants(self, material: str) -> list:
+        """
+        Метод получения списка обрезков материала.
+        :param material: Название материала;
+        :return: Список обрезков (идентификатор, ширина, высота, дата).
+        """
+        return [(rid, *data) for rid, data in
+                self.remnants.get(material, dict()).items()]
+
+    def add_remnant(self, material: str, width: int | float,
+                    height: int | float) -> int | None:
+        """
+        Метод добавления обрезка на склад.
+        :param material: Название материала;
+        :param width: Ширина обрезка;
+        :param height: Высота обрезка;
+        :return: Идентификатор обрезка или None, если обрезок меньше
+        минимального размера.
+        :raises SettingsFileError: Склад не сохранен.
+        """
+        if min(width, height) < self.min_side:
+            return None
+        return self.update(self._insert_remnant, material, width, height)
+
+    def add_remnants(self, material: str, remnants: list) -> list:
+        """
+        Метод добавления на склад обрезков, полученных после раскроя.
+        :param material: Название материала;
+        :param remnants: Список обрезков (x, y, ширина, высота);
+        :return: Список идентификаторов добавленных обрезков.
+        :raises SettingsFileError: Склад не сохранен.
+        """
+        def insert_all():
+            return [self._insert_remnant(material, x[2], x[3])
+                    for x in remnants if min(x[2], x[3]) >= self.min_side]
+
+        return self.update(insert_all)
+
+    def remove_remnant(self, material: str, rid: int) -> None:
+        """
+        Метод удаления (использования) обрезка со склада. Обрезок, уже
+        удаленный в другом окне или экземпляре программы, пропускается.
+        :param material: Название материала;
+        :param rid: Идентификатор обрезка.
+        :raises SettingsFileError: Склад не сохранен.
+        """
+        self.update(self._delete_remnant, material, rid)
+
+    def find_remnants(self, material: str, part_width: int | float,
+                      part_height: int | float, quantity: int,
+                      kerf: int | float = 0) -> list:
+        """
+        Метод поиска обрезков, на которых помещается партия изделий.
+        Кандидаты отбираются по индексу (меньшая и большая сторона, площадь),
+        количество изделий на обрезке рассчитывается раскроем (с кэшем).
+        :param material: Название материала;
+        :param part_width: Ширина изделия;
+        :param part_height: Высота изделия;
+        :param quantity: Количество изделий;
+        :param kerf: Ширина реза;
+        :return: Список подходящих обрезков (идентификатор, ширина, высота,
+        количество изделий) по возрастанию площади.
+        """
+        short = min(part_width, part_height)
+        long = max(part_width, part_height)
+        area = quantity * (short + kerf) * (long + kerf)
+        index = self.index.get(material, list())
+
+        result = list()
+        for remnant_short, remnant_long, rid in index[
+                bisect_left(index, (short,)):]:
+            if (remnant_long < long or
+                    (remnant_short + kerf) * (remnant_long + kerf) < area):
+                continue
+            width, height, _ = self.remnants[material][rid]
+            count = packing_cache.get_layout(width, height, part_width,
+                                             part_height, kerf).count
+            if count >= quantity:
+                result.append((rid, width, height, count))
+        result.sort(key=lambda x: x[1] * x[2])
+        return result
+
+    def update(self, change, *args):
+        """
+        Метод изменения склада: под блокировкой файла склада загружаются
+        изменения других окон и экземпляров программы, выполняется
+        изменение и склад сохраняется в файл.
+        :param change: Функция изменения склада
+        :param args: Аргументы функции изменения
+        :return: Результат функции изменения.
+        :raises SettingsConflictError: Файл склада записывает другой
+        экземпляр программы.
+        :raises SettingsFileError: Файл склада поврежден или не записан.
+        """
+        try:
+            with FileLock(self.path):
+                self.refresh()
+                if self.load_error is not None:
+                    raise SettingsFileError(
+                        f'Файл склада обрезков settings/remnants.json не '
+                        f'загружен ({self.load_error}), изменения не '
+                        f'сохранены. Восстановите или удалите файл.',
+                        location='RemnantInventory.update'
+                    )
+                result = change(*args)
+                self.save()
+        except TimeoutError as e:
+            raise SettingsConflictError(
+                f'{e} Изменения склада обрезков не сохранены, повторите '
+                f'изменения.',
+                location='RemnantInventory.update'
+            )
+        except OSError as e:
+            # Склад перечитывается из файла при следующем обращении
+            self.state = None
+            raise SettingsFileError(
+                f'Файл склада обрезков не сохранен: {e}',
+                location='RemnantInventory.update'
+            )
+        return result
+
+    def refresh(self) -> None:
+        """
+        Метод повторной загрузки склада, если файл склада изменен после
+        загрузки (другим окном или экземпляром программы).
+        """
+        if config_writer.get_state(self.path) != self.state:
+            self.load()
+
+    def load(self) -> None:
+        """
+        Метод загрузки склада из файла и построения индекса.
+        """
+        self.remnants, self.index = dict(), dict()
+        self.state = config_writer.get_state(self.path)
+        self.load_error = None
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') != self.version:
+                raise ValueError(f'версия файла {data.get("version")}')
+            for material, remnants in data['materials'].items():
+                for rid, width, height, added in remnants:
+                    self.remnants.setdefault(material, dict())[rid] = (
+                        width, height, added)
+                    self.index.setdefault(material, list()).append(
+                        (min(width, height), max(width, height), rid))
+                    self.next_id = max(self.next_id, rid + 1)
+            for index in self.index.values():
+                index.sort()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.remnants, self.index = dict(), dict()
+            self.load_error = e
+            AppLogger(
+                'RemnantInventory.load',
+                'error',
+                f'Файл склада обрезков settings/remnants.json не загружен: '
+                f'{e}',
+                info=True
+            )
+
+    def save(self) -> None:
+        """
+        Метод атомарной записи склада в файл (выполняется под блокировкой
+        файла склада, метод update).
+        :raises OSError: Файл склада не записан.
+        """
+        data = {
+            'version': self.version,
+            'materials': {
+                material: [[rid, *x] for rid, x in remnants.items()]
+                for material, remnants in self.remnants.items()
+            }
+        }
+        config_writer.atomic_write(
+            self.path, json.dumps(data, ensure_ascii=False, indent=1))
+        self.state = config_writer.get_state(self.path)
+
+    def _insert_remnant(self, material: str, width: int | float,
+                        height: int | float) -> int:
+        """
+        Метод добавления обрезка в склад и индекс (без записи в файл).
+        :param material: Название материала;
+        :param width: Ширина обрезка;
+        :param height: Высота обрезка;
+        :return: Идентификатор обрезка.
+        """
+        rid = self.next_id
+        self.next_id += 1
+        self.remnants.setdefault(material, dict())[rid] = (
+            width, height, date.today().isoformat())
+        insort(self.index.setdefault(material, list()),
+               (min(width, height), max(width, height), rid))
+        return rid
+
+    def _delete_remnant(self, material: str, rid: int) -> None:
+        """
+        Метод удаления обрезка из склада и индекса (без записи в файл).
+        :param material: Название материала;
+        :param rid: Идентификатор обрезка.
+        """
+        data = self.remnants.get(material, dict()).pop(rid, None)
+        if data is None:
+            return
+        width, height, _ = data
+        index = self.index[material]
+        index.pop(bisect_left(index, (min(width, height),
+                                      max(width, height), rid)))
@@ -7,13 +7,14 @@ _______________________________________________________________________________
 а также открывать выбранный ресурс в веб-браузере.
 """
 
-import os
-import shutil
 from webbrowser import open as web_open
 
 import configparser
 
 from app_logger import AppLogger
+from config_cache import config_cache
+from config_writer import config_writer
+from event_bus import event_bus, URLS_CHANGED
 from path_getting import PathName
 
 
@@ -22,7 +23,10 @@ class OpenUrl:
     Класс работы с файлом конфигурации URL-ссылок, а также открытием
     URL-ссылок в веб браузере.
 
-    Содержит методы: get_url_dict, open_url, add_new_data, get_default.
+    Содержит методы: url_config, get_url_dict, open_url, add_new_data,
+    get_default. Файл разбирается при первом обращении к url_config, а
+    словарь ресурсов берется из кэша config_cache, если файл не менялся.
+    После изменения файла публикуется событие URLS_CHANGED.
 
     Пример использования:
     OpenUrl().open_url(resource_name)
@@ -33,10 +37,21 @@ class OpenUrl:
         Инициализация переменной конфигурации и работы с файлом url_data.ini.
         """
 
-        # Создание/открытие файла конфигурации
-        self.url_config = configparser.ConfigParser()
-        self.url_config.read(PathName.resource_path(
-            'settings\\url_data.ini'), encoding='utf-8')
+        # Путь к файлу конфигурации (файл разбирается при первом
+        # обращении к url_config)
+        self.path = PathName.resource_path('settings\\url_data.ini')
+        self._url_config = None
+
+    @property
+    def url_config(self):
+        """
+        Переменная конфигурации файла url_data.ini.
+        :return: Конфигурация (configparser.ConfigParser).
+        """
+        if self._url_config is None:
+            self._url_config = configparser.ConfigParser()
+            config_writer.read(self._url_config, self.path)
+        return self._url_config
 
     def get_url_dict(self) -> dict:
         """
@@ -44,6 +59,12 @@ class OpenUrl:
         наименованиями ресурса.
         :return: Словарь {Название ресурса: ссылка}
         """
+        # Словарь из кэша (если файл не изменился и не разбирался)
+        state = config_cache.get_file_state(self.path)
+        url_dict = config_cache.get('url_data', state)
+        if url_dict is not None and self._url_config is None:
+            return dict(url_dict)
+
         # Создаем словарь
         url_dict = dict()
 
@@ -51,6 +72,7 @@ class OpenUrl:
             # Заполняем словарь данными из файла конфигурации
             for k, v in self.url_config['MAIN'].items():
                 url_dict[k] = v
+            config_cache.put('url_data', state, dict(url_dict))
 
         except Exception as e:
             AppLogger(
@@ -92,15 +114,10 @@ class OpenUrl:
         Метод добавления данных в файл конфигурации.
         :param some_new: Переменная конфигурации с новыми данными
         """
-        if some_new:
-            # Запись новых данных
-            with (open(PathName.resource_path('settings\\url_data.ini'),
-                       'w', encoding='utf-8') as configfile):
-                some_new.write(configfile)
-        else:
-            with (open(PathName.resource_path('settings\\url_data.ini'),
-                       'w', encoding='utf-8') as configfile):
-                self.url_config.write(configfile)
+        # Атомарная запись в фоне (config_writer)
+        config_writer.write(self.path,
+                            some_new if some_new else self.url_config)
+        event_bus.publish(URLS_CHANGED)
 
     @staticmethod
     def get_default() -> None:
@@ -112,6 +129,5 @@ class OpenUrl:
         source_path = PathName.resource_path('settings\\default\\url_data.ini')
 
         # Заменяем файл на файл с настройками "По-умолчанию"
-        if os.path.exists(destination_path):
-            os.remove(destination_path)
-        shutil.copy2(source_path, destination_path)
+        config_writer.copy(source_path, destination_path)
+        event_bus.publish(URLS_CHANGED)
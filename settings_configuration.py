@@ -8,7 +8,9 @@ _______________________________________________________________________________
 инициализирующие работу с определенными файлами конфигурации программы.
 
 Также модуль содержит класс-исключение SettingsFileError для обозначения
-ошибки при работе с файлом конфигурации в случае, когда нарушена его структура.
+ошибки при работе с файлом конфигурации в случае, когда нарушена его структура,
+и класс-исключение SettingsConflictError для обозначения изменения файла
+другим экземпляром программы.
 
 Классы модуля:
 - Configuration - класс родитель, функционал которого наследуют классы:
@@ -18,18 +20,28 @@ _______________________________________________________________________________
     работ.
     > DepthSet - реализует работу с файлом конфигурации расчетов глубокой
     гравировки.
+    > ProfileSet - реализует работу с файлом конфигурации именованных
+    профилей цен.
 
-- SettingsFileError - класс-исключение.
-"""
+- ConfigSnapshot - неизменяемый снимок настроек программы, преобразованных в
+числа, общий для всех вкладок и окон.
 
-import os
-import shutil
+- SettingsFileError, SettingsConflictError - классы-исключения.
+"""
 
-import configparser
+import _thread
+from types import MappingProxyType
 
 from app_logger import AppLogger
+from config_cache import config_cache
+from config_writer import config_writer
+from event_bus import event_bus
+from lazy_import import lazy_import
 from path_getting import PathName
 
+# Модуль загружается при первом чтении файла конфигурации
+configparser = lazy_import('configparser')
+
 
 class SettingsFileError(Exception):
     """
@@ -54,13 +66,29 @@ class SettingsFileError(Exception):
         )
 
 
+class SettingsConflictError(SettingsFileError):
+    """
+    Класс-исключение SettingsConflictError для обозначения конфликта при
+    сохранении файла конфигурации: файл изменен другим экземпляром
+    программы после чтения или записывается им в данный момент.
+    Пример использования:
+    raise SettingsConflictError(message=text; location:method_name)
+    """
+
+
 class Configuration:
     """
     Класс-родитель, реализующий работу с файлом конфигурации настроек
     программы .ini формата.
 
     Содержит методы добавления (обновления данных), а также сброса файла
-    конфигурации до базовых настроек: update_settings, default_settings.
+    конфигурации до базовых настроек: update_settings, default_settings,
+    reload. После записи файла публикуется событие шины event_bus, название
+    которого совпадает с именем файла (например, SETTINGS_CHANGED).
+
+    При чтении запоминается версия файла (file_state), update_settings
+    записывает файл только если версия не изменилась, иначе конфигурация
+    перечитывается и вызывается исключение SettingsConflictError.
 
     При инициализации класса в классе-наследнике, необходимо передать имя
     файла, с которым класс-наследник работает.
@@ -75,30 +103,50 @@ class Configuration:
         """
         # Определение переменной имени файла
         self.file_name = file_name
+        self.reload()
 
-        # Чтение файла конфигурации
+    def reload(self) -> None:
+        """
+        Метод чтения файла конфигурации (с учетом ожидающей записи) и
+        запоминания его версии.
+        """
+        self.path = PathName.resource_path(f'settings\\{self.file_name}.ini')
+        self.file_state = config_cache.get_file_state(self.path)
         self.config = configparser.ConfigParser()
-        self.config.read(
-            PathName.resource_path(f'settings\\{self.file_name}.ini'),
-            encoding='utf-8')
+        config_writer.read(self.config, self.path)
 
     def update_settings(self, some_new=None) -> None:
         """
         Обновления файла конфигурации и внесение в него изменений (при их
-        наличии)
+        наличии). Файл записывается атомарно под блокировкой с проверкой
+        версии файла (config_writer.save).
         :param some_new: Измененные данные для сохранения. При отсутствии
-        изменений, файл остается нетронутым.
-        """
-        if some_new:  # Запись новых данных
-            with (open(PathName.resource_path(
-                    f'settings\\{self.file_name}.ini'), 'w',
-                    encoding='utf-8') as configfile):
-                some_new.write(configfile)
-        else:
-            with (open(PathName.resource_path(
-                    f'settings\\{self.file_name}.ini'), 'w',
-                    encoding='utf-8') as configfile):
-                self.config.write(configfile)
+        изменений, записывается текущая конфигурация.
+        """
+        try:
+            state = config_writer.save(
+                self.path, some_new if some_new else self.config,
+                self.file_state)
+        except TimeoutError as e:
+            raise SettingsConflictError(
+                f'{e} Изменения не сохранены, повторите сохранение.',
+                location='Configuration.update_settings'
+            )
+        except OSError as e:
+            raise SettingsFileError(
+                f'Файл конфигурации {self.file_name}.ini не записан: {e}',
+                location='Configuration.update_settings'
+            )
+        if state is None:
+            self.reload()
+            raise SettingsConflictError(
+                f'Файл конфигурации {self.file_name}.ini изменен другим '
+                f'экземпляром программы. Изменения не сохранены, данные '
+                f'обновлены - повторите изменения.',
+                location='Configuration.update_settings'
+            )
+        self.file_state = state
+        event_bus.publish(self.file_name)
 
     def default_settings(self) -> None:
         """
@@ -109,9 +157,8 @@ class Configuration:
             f'settings\\{self.file_name}.ini')
         source_path = PathName.resource_path(
             f'settings\\default\\{self.file_name}.ini')
-        if os.path.exists(destination_path):
-            os.remove(destination_path)
-        shutil.copy2(source_path, destination_path)
+        config_writer.copy(source_path, destination_path)
+        event_bus.publish(self.file_name)
 
 
 class ConfigSet(Configuration):
@@ -217,3 +264,364 @@ class DepthSet(Configuration):
                 info=True
             )
         return materials_list
+
+
+class ProfileSet(Configuration):
+    """
+    Класс-наследник, реализующий работу с файлом конфигурации именованных
+    профилей цен profiles.ini (например, розница, опт, студии-партнеры).
+    Профиль задается разделами "<профиль>.MAIN", "<профиль>.RATIO_SETTINGS"
+    и "<профиль>.GRADATION" со структурой одноименных разделов
+    settings.ini; параметры, не указанные в профиле, берутся из
+    settings.ini. Файл необязателен: без него доступен только основной
+    профиль (settings.ini).
+
+    Наследует методы базового класса: update_settings, default_settings.
+    Содержит собственный метод: get_profiles.
+
+    Пример использования:
+    profiles = ProfileSet().get_profiles(ConfigSet().config)
+    wholesale_config = profiles['Опт']
+    """
+    # Разделы settings.ini, которые задает профиль
+    sections = ('MAIN', 'RATIO_SETTINGS', 'GRADATION')
+
+    def __init__(self) -> None:
+        """
+        Инициализация переменной конфигурации и работы с файлом
+        profiles.ini.
+        """
+        super().__init__(file_name='profiles')
+
+    def get_profiles(self, main_settings) -> dict:
+        """
+        Метод получения конфигураций профилей цен.
+        :param main_settings: Конфигурация программы (ConfigSet().config)
+        :return: Словарь "Название профиля - конфигурация со структурой
+        settings.ini" (в порядке разделов файла).
+        """
+        profiles = dict()
+        for section in self.config.sections():
+            name, _, part = section.rpartition('.')
+            if not name or part not in self.sections:
+                continue
+            if name not in profiles:
+                profiles[name] = configparser.ConfigParser()
+                profiles[name].read_dict(main_settings)
+            profiles[name].read_dict({part: self.config[section]})
+        return profiles
+
+
+class ConfigSnapshot:
+    """
+    Класс неизменяемого снимка настроек программы. Файлы settings.ini,
+    standard.ini и deep_engraving.ini читаются и проверяются один раз, все
+    значения преобразуются в числа, поэтому расчеты не разбирают строки
+    конфигурации. Снимок создается заново только при изменении файлов
+    (время изменения, размер), каждому новому снимку присваивается
+    следующий номер версии. Вкладки и дочерние окна получают общий снимок
+    методом get_snapshot и сравнивают версию с той, по которой подготовлены
+    их данные. Значения снимка сохраняются в кэше config_cache, поэтому
+    при запуске программы без изменений файлов .ini не разбираются.
+
+    Вместе со снимком создаются снимки всех профилей цен profiles.ini
+    (get_profiles): переключение профиля - выбор готового снимка без
+    чтения файлов. Снимки профилей имеют версию основного снимка.
+
+    Содержит методы: get_area_points, get_values, from_values,
+    get_profile, get_files_state, compile, get_snapshot, get_profiles.
+
+    Пример использования:
+    snapshot = ConfigSnapshot.get_snapshot()
+    min_cost = snapshot.min_cost
+    passes = snapshot.depth['сталь']
+    wholesale = ConfigSnapshot.get_profiles()['Опт']
+    """
+    __slots__ = (
+        'version', 'min_cost', 'additional_cost', 'one_hour_of_work',
+        'many_items', 'one_set', 'kerf', 'edge_margin', 'ratios',
+        'gradation_difficult', 'gradation_depth', 'gradation_area',
+        'area_points', 'standard_costs', 'depth'
+    )
+
+    # Файлы конфигурации, из которых строится снимок
+    file_names = ('settings', 'standard', 'deep_engraving', 'profiles')
+
+    # Название основного профиля цен (settings.ini)
+    default_profile = 'Основной'
+
+    # Ключи узловых точек коэффициента габаритов для типов лазера
+    area_keys = {'solid': 'area_solid', 'gas': 'area_gas'}
+
+    # Поля снимка со словарями (хранятся только для чтения)
+    mapping_fields = ('ratios', 'area_points', 'standard_costs', 'depth')
+
+    # Текущий снимок и состояние файлов, по которому он создан. Блокировка
+    # создается модулем _thread: модуль threading импортируется долго
+    _snapshot = None
+    _profiles = None
+    _files_state = None
+    _lock = _thread.allocate_lock()
+
+    def __init__(self, main_settings, standard_settings, depth_settings,
+                 version: int = 1) -> None:
+        """
+        Преобразование конфигурации в числовые значения.
+        :param main_settings: Конфигурация программы (ConfigSet().config)
+        :param standard_settings: Список стандартных работ
+        (StandardSet().config)
+        :param depth_settings: Режимы глубокой гравировки
+        (DepthSet().config)
+        :param version: Номер версии снимка
+        """
+        def to_floats(value: str) -> tuple:
+            return tuple(float(x) for x in value.split(','))
+
+        try:
+            main = main_settings['MAIN']
+            gradation = main_settings['GRADATION']
+            ratios = {k: float(v) for k, v in
+                      main_settings['RATIO_SETTINGS'].items()
+                      if k != 'ratio_taxation'}
+            ratios['ratio_taxation'] = to_floats(
+                main_settings['RATIO_SETTINGS']['ratio_taxation'])
+            values = {
+                'min_cost': int(main['min_cost']),
+                'additional_cost': int(main['additional_cost']),
+                'one_hour_of_work': int(main['one_hour_of_work']),
+                'many_items': float(main['many_items']),
+                'one_set': float(main['one_set']),
+                'ratios': MappingProxyType(ratios),
+                'gradation_difficult': to_floats(gradation['difficult']),
+                'gradation_depth': to_floats(gradation['depth']),
+                'gradation_area': to_floats(gradation['area']),
+                'standard_costs': MappingProxyType({
+                    k: int(v) for k, v in
+                    standard_settings['STANDARD'].items()}),
+            }
+        except (KeyError, ValueError) as e:
+            raise SettingsFileError(
+                f'Настройки файла settings.ini или standard.ini заданы '
+                f'неверно: {e}',
+                location='ConfigSnapshot.__init__'
+            ) from e
+
+        # Необязательные параметры раскроя: None - значение по умолчанию
+        for key in ('kerf', 'edge_margin'):
+            try:
+                values[key] = main.getfloat(key, fallback=None)
+            except ValueError as e:
+                values[key] = None
+                AppLogger(
+                    'ConfigSnapshot.__init__',
+                    'warning',
+                    f'Параметр раскроя {key} задан неверно ({e}), '
+                    f'используется значение по умолчанию.'
+                )
+
+        values['area_points'] = MappingProxyType({
+            laser_type: self.get_area_points(gradation, key)
+            for laser_type, key in self.area_keys.items()})
+
+        # Неверно заданные режимы глубокой гравировки пропускаются
+        depth = dict()
+        for material, value in depth_settings['MAIN'].items():
+            try:
+                depth[material] = tuple(float(x) for x in value.split(','))
+                if len(depth[material]) != 2 or depth[material][0] <= 0:
+                    raise ValueError('ожидается "глубина, проходы"')
+            except ValueError as e:
+                depth.pop(material, None)
+                AppLogger(
+                    'ConfigSnapshot.__init__',
+                    'warning',
+                    f'Режим глубокой гравировки "{material} = {value}" '
+                    f'задан неверно и пропущен: {e}'
+                )
+        values['depth'] = MappingProxyType(depth)
+        values['version'] = version
+
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def get_values(self) -> dict:
+        """
+        Метод получения значений снимка (без версии) в виде словаря
+        стандартных типов для сохранения в кэше.
+        :return: Словарь "Поле - значение".
+        """
+        return {name: dict(getattr(self, name))
+                if name in self.mapping_fields else getattr(self, name)
+                for name in self.__slots__ if name != 'version'}
+
+    @classmethod
+    def from_values(cls, values: dict,
+                    version: int = 1) -> 'ConfigSnapshot':
+        """
+        Метод создания снимка из сохраненных значений (без чтения файлов).
+        :param values: Словарь значений (метод get_values)
+        :param version: Номер версии снимка
+        :return: Снимок настроек.
+        """
+        if set(values) != set(cls.__slots__) - {'version'}:
+            raise ValueError('Состав сохраненных значений снимка изменился.')
+        snapshot = object.__new__(cls)
+        for name, value in values.items():
+            if name in cls.mapping_fields:
+                value = MappingProxyType(value)
+            object.__setattr__(snapshot, name, value)
+        object.__setattr__(snapshot, 'version', version)
+        return snapshot
+
+    @classmethod
+    def get_profile(cls, snapshot: 'ConfigSnapshot',
+                    main_settings) -> 'ConfigSnapshot':
+        """
+        Метод создания снимка профиля цен: значения settings.ini берутся
+        из конфигурации профиля, список стандартных работ и режимы глубокой
+        гравировки - из основного снимка.
+        :param snapshot: Основной снимок настроек
+        :param main_settings: Конфигурация профиля (структура settings.ini)
+        :return: Снимок профиля.
+        """
+        values = cls(main_settings, {'STANDARD': {}},
+                     {'MAIN': {}}).get_values()
+        values['standard_costs'] = dict(snapshot.standard_costs)
+        values['depth'] = dict(snapshot.depth)
+        return cls.from_values(values, snapshot.version)
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        Запрет изменения снимка.
+        """
+        raise AttributeError('Снимок настроек ConfigSnapshot не изменяется.')
+
+    def __delattr__(self, name: str) -> None:
+        """
+        Запрет изменения снимка.
+        """
+        raise AttributeError('Снимок настроек ConfigSnapshot не изменяется.')
+
+    @staticmethod
+    def get_area_points(gradation, key: str) -> tuple | None:
+        """
+        Метод получения узловых точек коэффициента габаритов гравировки
+        (формат "площадь: коэффициент, ...").
+        :param gradation: Раздел GRADATION конфигурации программы
+        :param key: Ключ узловых точек
+        :return: Кортеж точек (площадь, коэффициент) или None, если ключ не
+        задан или задан неверно.
+        """
+        value = gradation.get(key)
+        if not value:
+            return None
+        try:
+            points = tuple(
+                tuple(float(y) for y in x.split(':')) for x in value.split(',')
+            )
+            if any(len(x) != 2 for x in points):
+                raise ValueError('ожидается "площадь: коэффициент"')
+            if any(points[i + 1][0] <= points[i][0]
+                   for i in range(len(points) - 1)):
+                raise ValueError('площади узловых точек должны строго '
+                                 'возрастать')
+            return points
+        except ValueError as e:
+            AppLogger(
+                'ConfigSnapshot.get_area_points',
+                'error',
+                f'Узловые точки коэффициента габаритов гравировки '
+                f'"{key} = {value}" заданы неверно: {e}',
+                info=True
+            )
+            return None
+
+    @classmethod
+    def get_files_state(cls) -> tuple:
+        """
+        Метод получения состояния файлов конфигурации снимка.
+        :return: Кортеж состояний (время изменения, размер) файлов.
+        """
+        return tuple(
+            config_cache.get_file_state(
+                PathName.resource_path(f'settings\\{name}.ini'))
+            for name in cls.file_names)
+
+    @classmethod
+    def compile(cls, files_state: tuple, version: int) -> tuple:
+        """
+        Метод создания основного снимка и снимков профилей цен (из кэша
+        config_cache или разбором файлов конфигурации). Профиль с неверно
+        заданными значениями пропускается (запись в лог).
+        :param files_state: Состояние файлов конфигурации
+        :param version: Номер версии снимков
+        :return: Кортеж (основной снимок, словарь "Профиль - снимок").
+        """
+        values = config_cache.get('snapshot', files_state)
+        if values is not None:
+            try:
+                snapshot = cls.from_values(values['main'], version)
+                profiles = {name: cls.from_values(value, version)
+                            for name, value in values['profiles'].items()}
+                return snapshot, profiles
+            except (ValueError, TypeError, KeyError) as e:
+                AppLogger(
+                    'ConfigSnapshot.compile',
+                    'warning',
+                    f'Снимок настроек из кэша не загружен ({e}), '
+                    f'файлы конфигурации разбираются заново.'
+                )
+
+        main_settings = ConfigSet().config
+        snapshot = cls(main_settings, StandardSet().config, DepthSet().config,
+                       version)
+        profiles = dict()
+        for name, config in ProfileSet().get_profiles(main_settings).items():
+            if name == cls.default_profile:
+                continue
+            try:
+                profiles[name] = cls.get_profile(snapshot, config)
+            except SettingsFileError:
+                AppLogger(
+                    'ConfigSnapshot.compile',
+                    'warning',
+                    f'Профиль цен "{name}" файла profiles.ini задан неверно '
+                    f'и пропущен.'
+                )
+        config_cache.put('snapshot', files_state, {
+            'main': snapshot.get_values(),
+            'profiles': {name: value.get_values()
+                         for name, value in profiles.items()},
+        })
+        return snapshot, profiles
+
+    @classmethod
+    def get_snapshot(cls) -> 'ConfigSnapshot':
+        """
+        Метод получения актуального снимка настроек. Файлы читаются заново
+        только если изменились с момента создания текущего снимка (или
+        сохранения снимка в кэше config_cache); при ошибке чтения
+        измененных файлов исключение SettingsFileError передается
+        вызывающему, текущий снимок сохраняется.
+        :return: Снимок настроек.
+        """
+        files_state = cls.get_files_state()
+        with cls._lock:
+            if cls._snapshot is None or files_state != cls._files_state:
+                version = cls._snapshot.version + 1 if cls._snapshot else 1
+                snapshot, profiles = cls.compile(files_state, version)
+                cls._snapshot = snapshot
+                cls._profiles = MappingProxyType(
+                    {cls.default_profile: snapshot, **profiles})
+                cls._files_state = files_state
+            return cls._snapshot
+
+    @classmethod
+    def get_profiles(cls) -> MappingProxyType:
+        """
+        Метод получения актуальных снимков профилей цен (первым - основной
+        профиль default_profile).
+        :return: Словарь "Название профиля - снимок" (только для чтения).
+        """
+        cls.get_snapshot()
+        return cls._profiles
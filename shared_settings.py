@@ -0,0 +1,557 @@
+"""
+All files in this repository are licensed under the Apache License, Version
+2.0. See the LICENSE and NOTICE file for details.
+_______________________________________________________________________________
+Модуль реализует общую папку настроек для нескольких рабочих мест: единый
+источник цен (например, сетевая папка \\\\server\\razoom\\settings) и
+локальный кэш ее файлов. Общая папка подключается файлом shared.ini в
+папке программы:
+
+[SHARED]
+root = \\\\server\\razoom\\settings
+refresh_interval = 10
+startup_timeout = 5
+
+Программа читает и записывает файлы настроек (.ini в папке settings и
+settings/materials) в локальной копии (settings/shared_cache), а фоновый
+поток сверяет копию с общей папкой по времени изменения и размеру файлов:
+измененные в общей папке файлы загружаются в копию, измененные на рабочем
+месте - передаются в общую папку. Если общая папка недоступна или
+отвечает медленно, программа работает с локальной копией, поэтому
+действия в интерфейсе не ожидают сетевых операций с файлами.
+
+Сохранение из окон настроек (config_writer.save) записывает файл и в
+общую папку - под блокировкой файла общей папки и только если файл в ней
+не изменился с последней сверки. Иначе сохранение отклоняется (конфликт),
+а в локальную копию загружается версия общей папки. Если общая папка
+недоступна, файл сохраняется в локальной копии и передается при
+восстановлении связи; если к этому времени файл изменен и в общей папке,
+остается версия общей папки, а версия рабочего места сохраняется рядом
+(файл .conflict-<время>) и сообщается пользователю.
+
+При первом запуске на рабочем месте (пустой индекс кэша) локальная копия
+заполняется файлами настроек из папки программы: если общая папка пуста,
+первая сверка передает эти файлы в нее.
+
+Модуль содержит класс:
+- SharedSettings - общая папка настроек с локальным кэшем.
+
+Также модуль содержит общий экземпляр shared_settings.
+"""
+
+import _thread
+import json
+import os
+import time
+
+from app_logger import AppLogger
+from config_writer import FileLock, config_writer
+from lazy_import import lazy_import
+from path_getting import PathName
+
+# Модули загружаются при подключении общей папки
+configparser = lazy_import('configparser')
+filecmp = lazy_import('filecmp')
+shutil = lazy_import('shutil')
+threading = lazy_import('threading')
+
+
+class SharedSettings:
+    """
+    Класс общей папки настроек с локальным кэшем. Файлы настроек
+    сопоставляются по ключу - пути относительно папки settings
+    ('settings.ini', 'materials\\Фанера 4 мм.ini'). Индекс кэша хранит для
+    каждого ключа состояние файла (время изменения, размер) в общей папке
+    и в локальной копии на момент последней сверки.
+
+    Правила сверки файла:
+    - изменен только в общей папке - загружается в локальную копию;
+    - изменен только в локальной копии - передается в общую папку;
+    - изменен в обеих - остается версия общей папки, версия локальной
+    копии сохраняется в файле .conflict-<время> (сообщение в conflicts);
+    - удален с одной стороны - удаляется с другой (измененный в локальной
+    копии и удаленный в общей папке - передается в общую папку).
+
+    Вложенная папка общей папки, в которой уже были сверенные файлы,
+    считается недоступной, если ее нет (а не удалением всех ее файлов).
+
+    Содержит методы: setup, start, seed, get_key, get_cache_key,
+    get_path, remote_save, pull, replace, pop_conflicts, notify, run,
+    sync, check_folders, sync_file, scan, load_index, save_index.
+
+    Пример использования:
+    shared_settings.setup()  # Подключение общей папки из shared.ini
+    path = PathName.resource_path('settings\\settings.ini')  # Локальная копия
+    """
+    # Файл подключения общей папки (в папке программы)
+    config_file = 'shared.ini'
+    # Папка локальной копии файлов общей папки
+    cache_folder = 'settings\\shared_cache'
+    # Вложенные папки с файлами настроек ('' - корень общей папки)
+    folders = ('', 'materials')
+
+    def __init__(self) -> None:
+        """
+        Инициализация общей папки (по умолчанию не подключена).
+        """
+        self.root = None
+        self.cache_root = None
+        self.refresh_interval = 10.0
+        self.index = dict()
+        self.wake = None
+        self.ready = None
+        self.thread = None
+        self.available = None
+        # Файлы общей папки, записанные при сохранении (до записи
+        # локальной копии): ключ -> (состояние файла, время записи)
+        self.saved = dict()
+        # Сообщения о конфликтах сверки для пользователя
+        self.conflicts = list()
+        # Согласованность индекса при сохранении и фоновой сверке.
+        # Блокировка создается модулем _thread: модуль threading
+        # импортируется долго
+        self.lock = _thread.allocate_lock()
+
+    def setup(self, wait: float | None = None, sync: bool = True) -> bool:
+        """
+        Метод подключения общей папки по файлу shared.ini. Если файла нет
+        или в нем не указана общая папка, программа работает только с
+        локальными файлами.
+        :param wait: Ожидание первой сверки при пустом кэше, с (по
+        умолчанию - startup_timeout из shared.ini)
+        :param sync: Запуск фоновой сверки (False - только чтение локальной
+        копии, например, в процессах пакетного расчета)
+        :return: True, если общая папка подключена.
+        """
+        if self.root is not None:
+            return True
+        config = configparser.ConfigParser()
+        config.read(PathName.resource_path(self.config_file),
+                    encoding='utf-8')
+        if not config.get('SHARED', 'root', fallback=''):
+            return False
+        section = config['SHARED']
+        try:
+            refresh_interval = section.getfloat('refresh_interval',
+                                                fallback=10.0)
+            startup_timeout = section.getfloat('startup_timeout',
+                                               fallback=5.0)
+        except ValueError as e:
+            AppLogger(
+                'SharedSettings.setup',
+                'error',
+                f'Общая папка настроек не подключена, ошибка в файле '
+                f'{self.config_file}: {e}',
+                info=True
+            )
+            return False
+        self.start(section['root'], refresh_interval,
+                   startup_timeout if wait is None else wait, sync)
+        return True
+
+    def start(self, root: str, refresh_interval: float = 10.0,
+              wait: float = 5.0, sync: bool = True) -> None:
+        """
+        Метод запуска фоновой сверки с общей папкой. Первая сверка
+        ожидается только при пустом кэше (первый запуск на рабочем месте),
+        иначе программа сразу работает с локальной копией.
+        :param root: Путь к общей папке настроек
+        :param refresh_interval: Период сверки, с
+        :param wait: Наибольшее ожидание первой сверки, с
+        :param sync: Запуск фоновой сверки
+        """
+        self.root = root
+        self.refresh_interval = refresh_interval
+        self.cache_root = PathName.resource_path(self.cache_folder)
+        for folder in self.folders:
+            os.makedirs(os.path.join(self.cache_root, folder), exist_ok=True)
+        self.load_index()
+        if not self.index:
+            self.seed()
+        if not sync:
+            PathName.redirect = self.get_path
+            return
+        self.wake = threading.Event()
+        self.ready = threading.Event()
+        PathName.redirect = self.get_path
+        config_writer.listeners.append(self.notify)
+        config_writer.remote_save = self.remote_save
+        self.thread = threading.Thread(target=self.run,
+                                       name='SharedSettings', daemon=True)
+        self.thread.start()
+        if not self.index and not self.ready.wait(wait):
+            AppLogger(
+                'SharedSettings.start',
+                'warning',
+                f'Общая папка настроек {root} не ответила за {wait} с, '
+                f'используются локальные файлы настроек.',
+                info=True
+            )
+
+    def seed(self) -> None:
+        """
+        Метод заполнения локальной копии файлами настроек из папки
+        программы (первый запуск на рабочем месте). Файлы, уже имеющиеся
+        в копии, не заменяются.
+        """
+        settings_root = PathName.resource_path('settings')
+        for folder in self.folders:
+            try:
+                with os.scandir(os.path.join(settings_root,
+                                             folder)) as entries:
+                    names = [entry.name for entry in entries
+                             if entry.name.endswith('.ini') and
+                             entry.is_file()]
+            except FileNotFoundError:
+                continue
+            for name in names:
+                cache_path = os.path.join(self.cache_root, folder, name)
+                if not os.path.exists(cache_path):
+                    config_writer.copy(
+                        os.path.join(settings_root, folder, name),
+                        cache_path)
+
+    def get_key(self, relative_path: str) -> str | None:
+        """
+        Метод получения ключа файла общей папки.
+        :param relative_path: Относительный путь к файлу
+        ('settings\\materials\\Фанера 4 мм.ini')
+        :return: Ключ ('materials\\Фанера 4 мм.ini') или None, если файл
+        не относится к общей папке.
+        """
+        parts = relative_path.replace('/', '\\').split('\\')
+        if (parts[0] != 'settings' or not parts[-1].endswith('.ini') or
+                len(parts) > 3 or
+                (len(parts) == 3 and parts[1] not in self.folders)):
+            return None
+        return '\\'.join(parts[1:])
+
+    def get_cache_key(self, path: str) -> str | None:
+        """
+        Метод получения ключа файла локальной копии.
+        :param path: Путь к файлу
+        :return: Ключ или None, если файл не относится к локальной копии.
+        """
+        if not path.startswith(self.cache_root):
+            return None
+        relative_path = os.path.relpath(path, self.cache_root)
+        return self.get_key('\\'.join(['settings',
+                                         *relative_path.split(os.sep)]))
+
+    def get_path(self, relative_path: str, path: str) -> str:
+        """
+        Метод перенаправления пути к файлу настроек (или вложенной папке
+        с файлами настроек) в локальную копию общей папки (функция
+        PathName.redirect).
+        :param relative_path: Относительный путь к файлу
+        :param path: Абсолютный путь к файлу в папке программы
+        :return: Путь к файлу.
+        """
+        parts = [part for part in relative_path.replace('/', '\\').split(
+            '\\') if part]
+        if (len(parts) == 2 and parts[0] == 'settings' and
+                parts[1] in self.folders):
+            return os.path.join(self.cache_root, parts[1], '')
+        key = self.get_key(relative_path)
+        if key is None:
+            return path
+        return os.path.join(self.cache_root, *key.split('\\'))
+
+    def remote_save(self, path: str, text: str) -> bool:
+        """
+        Метод записи сохраняемого файла в общую папку (функция
+        config_writer.remote_save, вызывается перед записью локальной
+        копии). Файл общей папки записывается под его блокировкой, только
+        если он не изменился с последней сверки; иначе в локальную копию
+        загружается версия общей папки.
+        :param path: Путь к файлу локальной копии
+        :param text: Содержимое файла
+        :return: False - файл общей папки изменен (конфликт), True - файл
+        записан в общую папку (или общая папка недоступна, файл будет
+        передан при сверке).
+        :raises TimeoutError: Файл общей папки записывает другое рабочее
+        место.
+        """
+        key = self.get_cache_key(path)
+        if key is None:
+            return True
+        remote_path = os.path.join(self.root, *key.split('\\'))
+        with self.lock:
+            entry = self.index.get(key)
+            try:
+                with FileLock(remote_path):
+                    remote = config_writer.get_state(remote_path)
+                    if remote != (entry[0] if entry else None):
+                        self.pull(key, remote_path, path, remote)
+                        return False
+                    config_writer.atomic_write(remote_path, text)
+                    self.saved[key] = (config_writer.get_state(remote_path),
+                                       time.monotonic())
+            except TimeoutError:
+                raise
+            except OSError as e:
+                AppLogger(
+                    'SharedSettings.remote_save',
+                    'warning',
+                    f'Общая папка настроек недоступна ({e}): файл {key} '
+                    f'сохранен на рабочем месте и будет передан при '
+                    f'восстановлении связи.'
+                )
+        return True
+
+    def pull(self, key: str, remote_path: str, cache_path: str,
+             remote: tuple | None) -> None:
+        """
+        Метод загрузки версии общей папки в локальную копию при конфликте
+        сохранения (выполняется под блокировками файлов).
+        :param key: Ключ файла
+        :param remote_path: Путь к файлу общей папки
+        :param cache_path: Путь к файлу локальной копии
+        :param remote: Состояние файла общей папки (None - нет файла)
+        """
+        if remote is None:
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            self.index.pop(key, None)
+        else:
+            self.replace(remote_path, cache_path)
+            self.index[key] = (config_writer.get_state(remote_path),
+                               config_writer.get_state(cache_path))
+        self.save_index()
+
+    @staticmethod
+    def replace(source_path: str, destination_path: str) -> None:
+        """
+        Метод атомарной замены файла копией другого файла (блокировку
+        файла получает вызывающий).
+        :param source_path: Путь к копируемому файлу
+        :param destination_path: Путь к заменяемому файлу
+        """
+        temp_path = f'{destination_path}.{os.getpid()}.tmp'
+        try:
+            shutil.copy2(source_path, temp_path)
+            os.replace(temp_path, destination_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def pop_conflicts(self) -> list:
+        """
+        Метод получения сообщений о конфликтах сверки, еще не показанных
+        пользователю.
+        :return: Список сообщений.
+        """
+        with self.lock:
+            conflicts, self.conflicts = self.conflicts, list()
+        return conflicts
+
+    def notify(self, path: str) -> None:
+        """
+        Метод запуска внеочередной сверки после записи файла локальной
+        копии (слушатель config_writer). Для файла, записанного при
+        сохранении и в общую папку, обновляется индекс кэша.
+        :param path: Путь к записанному файлу
+        """
+        if not path.startswith(self.cache_root):
+            return
+        key = self.get_cache_key(path)
+        with self.lock:
+            if key in self.saved:
+                self.index[key] = (self.saved.pop(key)[0],
+                                   config_writer.get_state(path))
+                self.save_index()
+        self.wake.set()
+
+    def run(self) -> None:
+        """
+        Метод фоновой сверки с общей папкой (поток SharedSettings).
+        """
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                AppLogger('SharedSettings.run', 'error',
+                          f'Ошибка сверки с общей папкой настроек: {e}')
+            self.ready.set()
+            self.wake.wait(self.refresh_interval)
+            self.wake.clear()
+
+    def sync(self) -> None:
+        """
+        Метод сверки локальной копии с общей папкой.
+        """
+        config_writer.flush()
+        try:
+            self.check_folders()
+            remote = self.scan(self.root)
+        except OSError as e:
+            if self.available is not False:
+                AppLogger(
+                    'SharedSettings.sync',
+                    'warning',
+                    f'Общая папка настроек недоступна ({e}), используется '
+                    f'локальная копия.'
+                )
+            self.available = False
+            return
+        if self.available is False:
+            AppLogger('SharedSettings.sync', 'info',
+                      'Общая папка настроек снова доступна.')
+        self.available = True
+        local = self.scan(self.cache_root)
+        changed = False
+        for key in sorted(remote.keys() | local.keys() | self.index.keys()):
+            cache_path = os.path.join(self.cache_root, *key.split('\\'))
+            try:
+                # Порядок блокировок как при сохранении (config_writer.save):
+                # файл локальной копии, индекс, файл общей папки
+                with FileLock(cache_path), self.lock:
+                    # Файл сохраняется в данный момент (индекс обновится
+                    # после записи локальной копии). Запись, не завершенная
+                    # за период сверки (ошибка записи локальной копии),
+                    # сверяется как обычно
+                    if key in self.saved:
+                        if (time.monotonic() - self.saved[key][1] <
+                                self.refresh_interval):
+                            continue
+                        del self.saved[key]
+                    changed |= self.sync_file(key, remote.get(key),
+                                              local.get(key))
+            except OSError as e:
+                AppLogger('SharedSettings.sync', 'error',
+                          f'Файл {key} не сверен с общей папкой: {e}')
+        if changed:
+            with self.lock:
+                self.save_index()
+
+    def check_folders(self) -> None:
+        """
+        Метод проверки вложенных папок общей папки. Отсутствующая папка
+        создается, если в ней еще не было сверенных файлов (заполнение
+        пустой общей папки).
+        :raises OSError: Общая папка или вложенная папка с файлами
+        недоступна.
+        """
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f'Папка {self.root} не найдена')
+        for folder in self.folders:
+            path = os.path.join(self.root, folder)
+            if not folder or os.path.isdir(path):
+                continue
+            if any(key.startswith(f'{folder}\\') for key in self.index):
+                raise FileNotFoundError(f'Папка {path} не найдена')
+            os.makedirs(path, exist_ok=True)
+
+    def sync_file(self, key: str, remote: tuple | None,
+                  local: tuple | None) -> bool:
+        """
+        Метод сверки одного файла (под блокировками файла локальной копии
+        и индекса). Файл общей папки изменяется под его блокировкой и
+        только если он не изменился после получения его состояния.
+        :param key: Ключ файла
+        :param remote: Состояние файла в общей папке (None - нет файла)
+        :param local: Состояние файла в локальной копии (None - нет файла)
+        :return: True, если индекс кэша изменился.
+        """
+        remote_path = os.path.join(self.root, *key.split('\\'))
+        cache_path = os.path.join(self.cache_root, *key.split('\\'))
+        entry = self.index.get(key)
+        if entry is None:
+            remote_changed = remote is not None
+            local_changed = local is not None and remote is None
+        else:
+            remote_changed = remote != entry[0]
+            local_changed = local != entry[1]
+        if not remote_changed and not local_changed:
+            return False
+        if remote_changed and local_changed and remote is None:
+            AppLogger(
+                'SharedSettings.sync_file',
+                'warning',
+                f'Файл {key} удален в общей папке, но изменен на рабочем '
+                f'месте: файл восстановлен в общей папке.'
+            )
+            remote_changed = False
+        if (remote_changed and local_changed and local is not None and
+                not filecmp.cmp(remote_path, cache_path, shallow=False)):
+            conflict_path = (f'{cache_path}.conflict-'
+                             f'{time.strftime("%Y%m%d-%H%M%S")}')
+            shutil.copy2(cache_path, conflict_path)
+            message = (f'Файл настроек {key} изменен и в общей папке, и на '
+                       f'рабочем месте (без связи с общей папкой). '
+                       f'Сохранена версия общей папки, изменения рабочего '
+                       f'места - в файле {conflict_path}.')
+            AppLogger('SharedSettings.sync_file', 'warning', message)
+            self.conflicts.append(message)
+        if remote_changed:
+            if remote is None:
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+                self.index.pop(key, None)
+                return True
+            self.replace(remote_path, cache_path)
+        else:
+            with FileLock(remote_path):
+                if config_writer.get_state(remote_path) != remote:
+                    return False  # Изменен другим рабочим местом
+                if local is None:
+                    if os.path.exists(remote_path):
+                        os.remove(remote_path)
+                    self.index.pop(key, None)
+                    return True
+                self.replace(cache_path, remote_path)
+        self.index[key] = (config_writer.get_state(remote_path),
+                           config_writer.get_state(cache_path))
+        return True
+
+    def scan(self, root: str) -> dict:
+        """
+        Метод получения состояния файлов настроек папки. Отсутствующая
+        папка (или вложенная папка) - ошибка OSError, а не отсутствие
+        файлов.
+        :param root: Путь к папке (общей или локальной копии)
+        :return: Словарь "Ключ - (время изменения, размер)".
+        """
+        states = dict()
+        for folder in self.folders:
+            with os.scandir(os.path.join(root, folder)) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.ini') and entry.is_file():
+                        key = (f'{folder}\\{entry.name}' if folder else
+                               entry.name)
+                        stat = entry.stat()
+                        states[key] = (stat.st_mtime_ns, stat.st_size)
+        return states
+
+    def load_index(self) -> None:
+        """
+        Метод загрузки индекса локальной копии. Поврежденный индекс
+        игнорируется (файлы будут сверены заново, приоритет у общей папки).
+        """
+        path = os.path.join(self.cache_root, 'index.json')
+        try:
+            with open(path, encoding='utf-8') as file:
+                self.index = {
+                    key: (tuple(remote) if remote else None,
+                          tuple(local) if local else None)
+                    for key, (remote, local) in json.load(file).items()
+                }
+        except FileNotFoundError:
+            self.index = dict()
+        except (OSError, ValueError, TypeError) as e:
+            self.index = dict()
+            AppLogger('SharedSettings.load_index', 'warning',
+                      f'Индекс общей папки настроек не загружен: {e}')
+
+    def save_index(self) -> None:
+        """
+        Метод сохранения индекса локальной копии.
+        """
+        path = os.path.join(self.cache_root, 'index.json')
+        config_writer.atomic_write(
+            path, json.dumps(self.index, ensure_ascii=False, indent=1))
+
+
+# Общая папка настроек программы (подключается методом setup)
+shared_settings = SharedSettings()